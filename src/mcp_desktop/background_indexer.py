@@ -0,0 +1,228 @@
+"""
+백그라운드 사전 인덱서
+서버가 유휴 상태일 때 포그라운드 윈도우를 미리 인덱싱하여
+도구 호출 시 항상 최신 인덱스를 사용할 수 있도록 함
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from .ocr_scheduler import PRIORITY_BACKGROUND
+from .smart_indexer import SmartIndexer, get_smart_indexer
+from .state_library import same_detail
+from .utils import INPUT_DEVICE_LOCK
+from .window import WindowController, get_window_controller
+
+logger = logging.getLogger("mcp_desktop.background_indexer")
+
+# 포그라운드 윈도우 확인 주기 (초)
+DEFAULT_POLL_INTERVAL = 1.0
+
+# 마지막 도구 호출 이후 이 시간이 지나야 유휴 상태로 간주 (초)
+DEFAULT_IDLE_SECONDS = 2.0
+
+
+class BackgroundIndexer:
+    """백그라운드 사전 인덱서"""
+    
+    def __init__(
+        self,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        smart_indexer: Optional[SmartIndexer] = None,
+        window: Optional[WindowController] = None,
+    ):
+        """
+        Args:
+            poll_interval: 포그라운드 윈도우 확인 주기 (초)
+            idle_seconds: 유휴 상태로 간주하기까지의 시간 (초)
+            smart_indexer: 스마트 인덱서 (None이면 전역 인스턴스)
+            window: 윈도우 제어기 (None이면 전역 인스턴스)
+        """
+        self.poll_interval = poll_interval
+        self.idle_seconds = idle_seconds
+        self.smart_indexer = smart_indexer if smart_indexer is not None else get_smart_indexer()
+        self.window = window if window is not None else get_window_controller()
+        self.running = False
+        self._active_calls = 0
+        self._last_activity = time.monotonic()
+        self._scan: Optional[dict] = None  # 진행 중인 (중단 후 재개 가능한) 스캔
+        self._stats = {"completed": 0, "restored": 0, "interrupted": 0, "restarted": 0}
+    
+    @contextmanager
+    def interactive(self):
+        """
+        대화형 도구 호출 구간 표시
+        
+        이 구간 동안 백그라운드 인덱싱은 다음 타일로 진행하지 않고 즉시 양보합니다.
+        """
+        self._active_calls += 1
+        try:
+            yield
+        finally:
+            self._active_calls -= 1
+            self._last_activity = time.monotonic()
+    
+    def is_idle(self) -> bool:
+        """서버가 유휴 상태인지 확인"""
+        return (
+            self._active_calls == 0
+            and time.monotonic() - self._last_activity >= self.idle_seconds
+        )
+    
+    def get_stats(self) -> dict:
+        """백그라운드 인덱싱 통계"""
+        scan = self._scan
+        return {
+            "success": True,
+            "running": self.running,
+            **self._stats,
+            "in_progress": None if scan is None else {
+                "window_id": scan["window_id"],
+                "done": scan["done"],
+                "total": scan["total"],
+            },
+        }
+    
+    async def run(self):
+        """백그라운드 루프 (취소될 때까지 실행)"""
+        logger.info("백그라운드 사전 인덱서 시작")
+        self.running = True
+        try:
+            while True:
+                await asyncio.sleep(self.poll_interval)
+                if not self.is_idle():
+                    continue
+                try:
+                    await self._step()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"백그라운드 인덱싱 실패: {e}", exc_info=True)
+                    self._scan = None
+        finally:
+            self.running = False
+    
+    async def _step(self):
+        """포그라운드 윈도우를 확인하고 필요하면 인덱싱을 시작하거나 이어서 진행"""
+        foreground = await asyncio.to_thread(self.window.get_foreground_window)
+        window_id = foreground["hwnd"] if foreground.get("success") else None
+        
+        needs_indexing = await asyncio.to_thread(self.smart_indexer.is_indexing_needed, window_id)
+        if not needs_indexing:
+            self._discard_scan()
+            return
+        
+        state = await asyncio.to_thread(self.smart_indexer.capture_state, window_id)
+        
+        # 진행 중인 스캔이 같은 윈도우, 같은 화면이면 이어서 진행
+        scan = self._scan
+        if scan is not None and not self._same_screen(scan, window_id, state):
+            logger.info(f"백그라운드 인덱싱 재시작: 화면 변경 (window_id={scan['window_id']} -> {window_id})")
+            self._stats["restarted"] += 1
+            self._discard_scan()
+            scan = None
+        
+        if scan is None:
+            # 이전에 인덱싱한 화면이면 OCR 없이 복원
+            if state is not None:
+                restored = await asyncio.to_thread(self.smart_indexer.restore_from_library, window_id, state)
+                if restored is not None:
+                    self._stats["restored"] += 1
+                    return
+            scan = self._start_scan(window_id, state)
+        
+        await self._continue_scan(scan)
+    
+    def _same_screen(self, scan: dict, window_id: Optional[int], state: Optional[dict]) -> bool:
+        """
+        진행 중인 스캔의 대상 화면이 그대로인지 확인
+        
+        이미 스캔한 타일을 그대로 커밋하므로, 중단된 동안 입력 동작이 있었거나
+        축소 이미지 기준으로 내용(글자 등)이 바뀌었으면 다른 화면으로 봅니다.
+        """
+        if scan["window_id"] != window_id or scan["epoch"] != INPUT_DEVICE_LOCK.epoch:
+            return False
+        if scan["state"] is None or state is None:
+            return False
+        return scan["state"]["area"] == state["area"] and same_detail(scan["state"]["detail"], state["detail"])
+    
+    def _start_scan(self, window_id: Optional[int], state: Optional[dict]) -> dict:
+        """새 스캔 시작"""
+        logger.info(f"백그라운드 인덱싱 시작: window_id={window_id}")
+        self._scan = {
+            "window_id": window_id,
+            "state": state,
+            "batches": self.smart_indexer.indexer.iter_tile_batches(
+                window_id=window_id,
+                priority=PRIORITY_BACKGROUND,
+            ),
+            "regions": [],
+            "info": None,
+            "done": 0,
+            "total": 0,
+            # 스캔 시작 시점의 입력 세대 (이후 입력이 있으면 스캔한 타일은 버림)
+            "epoch": INPUT_DEVICE_LOCK.epoch,
+        }
+        return self._scan
+    
+    def _discard_scan(self):
+        """진행 중인 스캔 폐기"""
+        if self._scan is not None:
+            self._scan["batches"].close()
+            self._scan = None
+    
+    async def _continue_scan(self, scan: dict):
+        """
+        타일 단위로 스캔을 진행하고, 도구 호출이 들어오면 즉시 중단 (다음 유휴 시간에 재개)
+        """
+        while True:
+            if not self.is_idle():
+                self._stats["interrupted"] += 1
+                logger.debug(f"백그라운드 인덱싱 양보: {scan['done']}/{scan['total']}개 타일")
+                return
+            
+            batch = await asyncio.to_thread(next, scan["batches"], None)
+            if batch is None:
+                break
+            if not batch.get("success"):
+                logger.debug(f"백그라운드 인덱싱 중단: {batch.get('error')}")
+                self._discard_scan()
+                return
+            
+            scan["regions"].extend(batch["regions"])
+            scan["info"] = batch
+            scan["done"] = batch["done"]
+            scan["total"] = batch["total"]
+        
+        if scan["epoch"] != INPUT_DEVICE_LOCK.epoch:
+            # 마지막 타일을 스캔하는 동안 입력이 있었으면 커밋하지 않고 다음 유휴 시간에 다시 시작
+            self._stats["restarted"] += 1
+            self._discard_scan()
+            return
+        if scan["info"] is not None:
+            await asyncio.to_thread(
+                self.smart_indexer.commit_scan,
+                scan["window_id"],
+                scan["regions"],
+                scan["info"],
+                scan["state"],
+            )
+            self._stats["completed"] += 1
+            logger.info(f"백그라운드 인덱싱 완료: window_id={scan['window_id']}, {len(scan['regions'])}개 텍스트 영역")
+        self._scan = None
+
+
+# 전역 인스턴스
+_background_indexer = None
+
+
+def get_background_indexer() -> BackgroundIndexer:
+    """백그라운드 사전 인덱서 싱글톤 인스턴스 반환"""
+    global _background_indexer
+    if _background_indexer is None:
+        _background_indexer = BackgroundIndexer()
+    return _background_indexer
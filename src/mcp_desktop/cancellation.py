@@ -0,0 +1,113 @@
+"""
+협력적 취소 및 마감 시간 모듈
+오래 걸리는 인덱싱 작업이 타일/단계 사이마다 취소 여부를 확인하도록 하여,
+클라이언트가 취소하거나 마감 시간이 지나면 OCR을 즉시 멈출 수 있도록 함
+"""
+
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, List, Optional
+
+# 취소 확인 간격 (초) - Future를 기다리는 동안 이 간격으로 취소 여부를 확인
+POLL_INTERVAL = 0.1
+
+
+class OperationCancelled(Exception):
+    """작업이 취소되었거나 마감 시간이 지남"""
+    
+    def __init__(self, reason: str, partial: Optional[List[Any]] = None, done: int = 0):
+        """
+        Args:
+            reason: 취소 사유 ("cancelled" 또는 "deadline")
+            partial: 취소 전까지 얻은 부분 결과
+            done: 취소 전까지 처리한 단위(타일) 수
+        """
+        super().__init__(reason)
+        self.reason = reason
+        self.partial = partial if partial is not None else []
+        self.done = done
+
+
+class CancellationToken:
+    """취소 토큰 (스레드 안전)"""
+    
+    def __init__(
+        self,
+        deadline_seconds: Optional[float] = None,
+        parent: Optional["CancellationToken"] = None,
+    ):
+        """
+        Args:
+            deadline_seconds: 마감 시간 (지금부터 초, None이면 마감 없음)
+            parent: 상위 토큰 (상위 토큰이 취소되면 이 토큰도 취소된 것으로 간주)
+        """
+        self.deadline = time.monotonic() + deadline_seconds if deadline_seconds is not None else None
+        self.parent = parent
+        self._event = threading.Event()
+        self._reason: Optional[str] = None
+    
+    def cancel(self, reason: str = "cancelled"):
+        """토큰 취소"""
+        if not self._event.is_set():
+            self._reason = reason
+            self._event.set()
+    
+    @property
+    def reason(self) -> Optional[str]:
+        """취소 사유 (취소되지 않았으면 None)"""
+        if self._event.is_set():
+            return self._reason
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return "deadline"
+        if self.parent is not None:
+            return self.parent.reason
+        return None
+    
+    def is_cancelled(self) -> bool:
+        """취소되었거나 마감 시간이 지났는지 확인"""
+        return self.reason is not None
+    
+    def remaining(self) -> Optional[float]:
+        """마감까지 남은 시간 (초, 상위 토큰 포함, 마감이 없으면 None)"""
+        remaining = None
+        if self.deadline is not None:
+            remaining = max(0.0, self.deadline - time.monotonic())
+        if self.parent is not None:
+            parent_remaining = self.parent.remaining()
+            if parent_remaining is not None:
+                remaining = parent_remaining if remaining is None else min(remaining, parent_remaining)
+        return remaining
+    
+    def check(self):
+        """
+        취소 여부 확인
+        
+        Raises:
+            OperationCancelled: 취소되었거나 마감 시간이 지난 경우
+        """
+        reason = self.reason
+        if reason is not None:
+            raise OperationCancelled(reason)
+    
+    def wait_future(self, future: Future) -> Any:
+        """
+        취소 여부를 확인하면서 Future 결과 기다림
+        
+        Raises:
+            OperationCancelled: 기다리는 동안 취소되었거나 마감 시간이 지난 경우
+        """
+        while True:
+            self.check()
+            remaining = self.remaining()
+            timeout = POLL_INTERVAL if remaining is None else min(POLL_INTERVAL, remaining)
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeoutError:
+                continue
+
+
+def check_token(token: Optional[CancellationToken]):
+    """토큰이 있으면 취소 여부 확인 (단계 사이 확인용)"""
+    if token is not None:
+        token.check()
@@ -0,0 +1,226 @@
+"""
+화면 캡처 백엔드 모듈
+미리 할당한 NumPy 버퍼에 화면을 직접 채우는 캡처 백엔드 인터페이스와
+기본(pyautogui), 메모리 합성(헤드리스 테스트/벤치마크용) 백엔드
+"""
+
+import logging
+import os
+import sys
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("mcp_desktop.capture")
+
+# 캡처 백엔드 선택 환경 변수 (pyautogui, synthetic, x11shm, 비어 있으면 플랫폼 기본값)
+BACKEND_ENV = "MCP_DESKTOP_CAPTURE_BACKEND"
+
+# 캡처 영역 (x, y, width, height) - 화면 좌표 기준
+Region = Tuple[int, int, int, int]
+
+
+def to_gray(
+    rgb: np.ndarray,
+    out: Optional[np.ndarray] = None,
+    scratch: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+    """
+    RGB 배열을 OCR용 흑백(L) 배열로 변환 (PIL "L" 변환과 같은 ITU-R 601-2 가중치)
+    
+    Args:
+        rgb: (height, width, 3) uint8 배열
+        out: 결과를 채울 (height, width) uint8 배열 (None이면 새로 할당)
+        scratch: 중간 계산용 (height, width) uint32 배열 두 개 (None이면 새로 할당)
+    
+    Returns:
+        (height, width) uint8 배열
+    """
+    shape = rgb.shape[:2]
+    if out is None:
+        out = np.empty(shape, dtype=np.uint8)
+    if scratch is None:
+        scratch = (np.empty(shape, dtype=np.uint32), np.empty(shape, dtype=np.uint32))
+    total, term = scratch
+    # 정수 연산으로 변환 (R*299 + G*587 + B*114 + 500) // 1000, 중간 배열을 새로 만들지 않음
+    np.multiply(rgb[..., 0], np.uint32(299), out=total)
+    np.multiply(rgb[..., 1], np.uint32(587), out=term)
+    total += term
+    np.multiply(rgb[..., 2], np.uint32(114), out=term)
+    total += term
+    total += np.uint32(500)
+    np.floor_divide(total, np.uint32(1000), out=total)
+    np.copyto(out, total, casting="unsafe")
+    return out
+
+
+class CaptureBackend:
+    """
+    캡처 백엔드 인터페이스
+    
+    grab_into()는 호출자가 넘긴 (height, width, 3) uint8 버퍼를 채우며,
+    버퍼는 호출자가 재사용하므로 백엔드는 새 배열을 만들지 않는 것을 원칙으로 합니다.
+    """
+    
+    name = "base"
+    
+    def screen_size(self) -> Tuple[int, int]:
+        """화면 크기 (width, height)"""
+        raise NotImplementedError
+    
+    def grab_into(self, out: np.ndarray, region: Optional[Region] = None) -> np.ndarray:
+        """
+        화면 영역을 버퍼에 캡처
+        
+        Args:
+            out: (height, width, 3) uint8 버퍼 (영역 크기와 같아야 함)
+            region: 캡처 영역 (None이면 전체 화면)
+        
+        Returns:
+            채워진 out
+        """
+        raise NotImplementedError
+    
+    def close(self):
+        """백엔드 자원 해제"""
+
+
+class PyAutoGUIBackend(CaptureBackend):
+    """pyautogui.screenshot() 기반 기본 백엔드 (캡처마다 PIL 이미지를 만든 뒤 버퍼로 복사)"""
+    
+    name = "pyautogui"
+    
+    def __init__(self):
+        import pyautogui
+        
+        self._pyautogui = pyautogui
+    
+    def screen_size(self) -> Tuple[int, int]:
+        width, height = self._pyautogui.size()
+        return int(width), int(height)
+    
+    def grab_into(self, out: np.ndarray, region: Optional[Region] = None) -> np.ndarray:
+        image = self._pyautogui.screenshot(region=region) if region is not None else self._pyautogui.screenshot()
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        size = (out.shape[1], out.shape[0])
+        if image.size != size:
+            # HiDPI(Retina) 화면은 논리 좌표(pyautogui.size())보다 큰 실제 픽셀로 캡처되므로
+            # 클릭 좌표와 맞도록 버퍼 크기(논리 좌표)로 축소
+            from PIL import Image
+            
+            image = image.resize(size, Image.Resampling.BOX)
+        np.copyto(out, np.asarray(image))
+        return out
+
+
+class SyntheticBackend(CaptureBackend):
+    """
+    메모리 합성 백엔드 (헤드리스 테스트와 벤치마크용)
+    
+    실제 화면 대신 메모리의 프레임을 캡처합니다. set_frame()이나 fill()로 화면 내용을 바꿀 수 있습니다.
+    """
+    
+    name = "synthetic"
+    
+    def __init__(self, width: int = 1920, height: int = 1080, color: Tuple[int, int, int] = (255, 255, 255)):
+        """
+        Args:
+            width: 화면 너비
+            height: 화면 높이
+            color: 초기 배경색 (R, G, B)
+        """
+        self._lock = threading.Lock()
+        self._frame = np.empty((height, width, 3), dtype=np.uint8)
+        self._frame[...] = color
+        self.grabs = 0
+    
+    def screen_size(self) -> Tuple[int, int]:
+        height, width = self._frame.shape[:2]
+        return width, height
+    
+    def set_frame(self, frame: np.ndarray):
+        """화면 전체를 (height, width, 3) uint8 배열로 교체"""
+        with self._lock:
+            self._frame = np.ascontiguousarray(frame, dtype=np.uint8)
+    
+    def fill(self, region: Region, color: Tuple[int, int, int]):
+        """화면 영역을 단색으로 채움"""
+        x, y, width, height = region
+        with self._lock:
+            self._frame[y:y + height, x:x + width] = color
+    
+    def grab_into(self, out: np.ndarray, region: Optional[Region] = None) -> np.ndarray:
+        with self._lock:
+            self.grabs += 1
+            if region is None:
+                np.copyto(out, self._frame)
+            else:
+                x, y, width, height = region
+                np.copyto(out, self._frame[y:y + height, x:x + width])
+        return out
+
+
+# 백엔드 이름 -> 생성 함수 (플랫폼 전용 백엔드는 해당 모듈에서 등록)
+_BACKENDS: Dict[str, Callable[[], CaptureBackend]] = {
+    PyAutoGUIBackend.name: PyAutoGUIBackend,
+    SyntheticBackend.name: SyntheticBackend,
+}
+
+# 이름을 지정하지 않았을 때 순서대로 시도할 백엔드
+_DEFAULT_ORDER = [PyAutoGUIBackend.name]
+
+
+def register_backend(name: str, factory: Callable[[], CaptureBackend], preferred: bool = False):
+    """
+    캡처 백엔드 등록
+    
+    Args:
+        name: 백엔드 이름 (MCP_DESKTOP_CAPTURE_BACKEND 값)
+        factory: 백엔드를 만드는 함수 (사용할 수 없는 환경이면 예외를 발생)
+        preferred: True면 이름을 지정하지 않았을 때 기본 백엔드보다 먼저 시도
+    """
+    _BACKENDS[name] = factory
+    if preferred and name not in _DEFAULT_ORDER:
+        _DEFAULT_ORDER.insert(0, name)
+
+
+def _register_platform_backends():
+    """플랫폼 전용 백엔드 등록 (리눅스에서 X 디스플레이가 있으면 MIT-SHM 백엔드를 먼저 시도)"""
+    if not sys.platform.startswith("linux"):
+        return
+    if "x11shm" not in _BACKENDS:
+        from .capture_x11 import X11ShmBackend
+        
+        register_backend(X11ShmBackend.name, X11ShmBackend)
+    if os.environ.get("DISPLAY") and "x11shm" not in _DEFAULT_ORDER:
+        _DEFAULT_ORDER.insert(0, "x11shm")
+
+
+def create_backend(name: Optional[str] = None) -> CaptureBackend:
+    """
+    캡처 백엔드 생성
+    
+    Args:
+        name: 백엔드 이름 (None이면 환경 변수, 그것도 없으면 사용 가능한 첫 번째 기본 백엔드)
+    
+    Returns:
+        캡처 백엔드
+    
+    Raises:
+        ValueError: 알 수 없는 백엔드 이름인 경우
+    """
+    _register_platform_backends()
+    name = name or os.environ.get(BACKEND_ENV) or None
+    if name is not None:
+        if name not in _BACKENDS:
+            raise ValueError(f"알 수 없는 캡처 백엔드: {name} (사용 가능: {', '.join(_BACKENDS)})")
+        return _BACKENDS[name]()
+    
+    for candidate in _DEFAULT_ORDER:
+        try:
+            return _BACKENDS[candidate]()
+        except Exception as e:
+            logger.info(f"캡처 백엔드를 사용할 수 없습니다 ({candidate}): {e}")
+    return PyAutoGUIBackend()
@@ -0,0 +1,331 @@
+"""
+X11 MIT-SHM 캡처 백엔드
+리눅스(X11)에서 외부 프로세스(scrot 등)와 임시 PNG 없이 공유 메모리로 화면 영역을 직접 캡처
+(libX11, libXext를 ctypes로 호출, Xvfb에서도 동작)
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .capture import CaptureBackend, Region
+
+logger = logging.getLogger("mcp_desktop.capture_x11")
+
+# 크기별로 만들어 두는 공유 메모리 이미지 최대 개수 (전체 화면 + 타일 크기 몇 가지)
+MAX_SHM_IMAGES = 8
+
+_ZPIXMAP = 2
+_ALL_PLANES = (1 << (8 * ctypes.sizeof(ctypes.c_ulong))) - 1
+_IPC_PRIVATE = 0
+_IPC_CREAT = 0o1000
+_IPC_RMID = 0
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+class _XImage(ctypes.Structure):
+    # 앞부분 필드만 선언 (이후 필드는 사용하지 않음)
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong),
+        ("green_mask", ctypes.c_ulong),
+        ("blue_mask", ctypes.c_ulong),
+    ]
+
+
+class _XErrorEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("display", ctypes.c_void_p),
+        ("resourceid", ctypes.c_ulong),
+        ("serial", ctypes.c_ulong),
+        ("error_code", ctypes.c_ubyte),
+        ("request_code", ctypes.c_ubyte),
+        ("minor_code", ctypes.c_ubyte),
+    ]
+
+
+_ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(_XErrorEvent))
+
+
+def _load(name: str) -> ctypes.CDLL:
+    """공유 라이브러리 로드 (없으면 OSError)"""
+    path = ctypes.util.find_library(name)
+    if path is None:
+        raise OSError(f"lib{name}를 찾을 수 없습니다.")
+    return ctypes.CDLL(path)
+
+
+class _ShmImage:
+    """한 크기의 공유 메모리 XImage와 그 위의 NumPy 뷰"""
+    
+    def __init__(self, backend: "X11ShmBackend", width: int, height: int):
+        self._backend = backend
+        self.info = _XShmSegmentInfo()
+        x11, xext, libc = backend._x11, backend._xext, backend._libc
+        
+        self.image = xext.XShmCreateImage(
+            backend._display, backend._visual, backend._depth, _ZPIXMAP, None,
+            ctypes.byref(self.info), width, height,
+        )
+        if not self.image:
+            raise OSError("XShmCreateImage 실패")
+        image = self.image.contents
+        if image.bits_per_pixel != 32 or (image.red_mask, image.green_mask, image.blue_mask) != (0xFF0000, 0xFF00, 0xFF):
+            x11.XDestroyImage(self.image)
+            raise OSError(f"지원하지 않는 픽셀 형식입니다: {image.bits_per_pixel}bpp")
+        
+        size = image.bytes_per_line * height
+        self.info.shmid = libc.shmget(_IPC_PRIVATE, size, _IPC_CREAT | 0o600)
+        if self.info.shmid < 0:
+            x11.XDestroyImage(self.image)
+            raise OSError(f"shmget 실패 ({size} bytes)")
+        address = libc.shmat(self.info.shmid, None, 0)
+        if address in (None, ctypes.c_void_p(-1).value):
+            libc.shmctl(self.info.shmid, _IPC_RMID, None)
+            x11.XDestroyImage(self.image)
+            raise OSError("shmat 실패")
+        self.info.shmaddr = address
+        self.info.readOnly = 0
+        image.data = address
+        
+        attached = xext.XShmAttach(backend._display, ctypes.byref(self.info))
+        x11.XSync(backend._display, 0)
+        # 양쪽이 붙은 뒤 삭제 표시 (프로세스가 비정상 종료되어도 세그먼트가 남지 않음)
+        libc.shmctl(self.info.shmid, _IPC_RMID, None)
+        if not attached or backend._take_error():
+            libc.shmdt(ctypes.c_void_p(address))
+            x11.XDestroyImage(self.image)
+            raise OSError("XShmAttach 실패")
+        
+        # BGRX 공유 메모리 위의 (height, width, 3) RGB 뷰 (복사 없음)
+        raw = np.ctypeslib.as_array(ctypes.cast(address, ctypes.POINTER(ctypes.c_uint8)), shape=(height, image.bytes_per_line))
+        self.rgb = raw[:, :width * 4].reshape(height, width, 4)[..., 2::-1]
+    
+    def close(self):
+        """공유 메모리 분리 및 이미지 해제"""
+        backend = self._backend
+        backend._xext.XShmDetach(backend._display, ctypes.byref(self.info))
+        backend._x11.XSync(backend._display, 0)
+        backend._x11.XDestroyImage(self.image)
+        backend._libc.shmdt(ctypes.c_void_p(self.info.shmaddr))
+
+
+class X11ShmBackend(CaptureBackend):
+    """
+    X11 MIT-SHM 캡처 백엔드
+    
+    영역 크기별로 공유 메모리 이미지를 만들어 두고 XShmGetImage로 서버가 픽셀을 직접 쓰게 합니다.
+    타일 OCR처럼 같은 크기의 영역을 반복 캡처할 때 캡처마다 할당이 없습니다.
+    """
+    
+    name = "x11shm"
+    
+    def __init__(self, display: Optional[str] = None):
+        """
+        Args:
+            display: X 디스플레이 이름 (None이면 DISPLAY 환경 변수)
+        
+        Raises:
+            OSError: X 서버에 연결할 수 없거나 MIT-SHM을 사용할 수 없는 경우
+        """
+        display = display or os.environ.get("DISPLAY")
+        if not display:
+            raise OSError("DISPLAY가 설정되지 않았습니다.")
+        
+        self._x11 = _load("X11")
+        self._xext = _load("Xext")
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._declare()
+        
+        self._display = self._x11.XOpenDisplay(display.encode())
+        if not self._display:
+            raise OSError(f"X 디스플레이에 연결할 수 없습니다: {display}")
+        if not self._xext.XShmQueryExtension(self._display):
+            self._x11.XCloseDisplay(self._display)
+            raise OSError("X 서버가 MIT-SHM 확장을 지원하지 않습니다.")
+        
+        # 기본 오류 처리기는 프로세스를 종료하므로 이 연결의 호출 동안만 오류를 기록하는 처리기로 바꿔 끼움
+        self._error: Optional[int] = None
+        self._error_handler = _ERROR_HANDLER(self._on_error)
+        self._previous_handler = None
+        
+        screen = self._x11.XDefaultScreen(self._display)
+        self._root = self._x11.XRootWindow(self._display, screen)
+        self._visual = self._x11.XDefaultVisual(self._display, screen)
+        self._depth = self._x11.XDefaultDepth(self._display, screen)
+        self._size = (
+            int(self._x11.XDisplayWidth(self._display, screen)),
+            int(self._x11.XDisplayHeight(self._display, screen)),
+        )
+        
+        # Xlib 호출은 스레드 안전하지 않으므로 연결 단위로 직렬화
+        self._lock = threading.Lock()
+        self._images: "OrderedDict[Tuple[int, int], _ShmImage]" = OrderedDict()
+        with self._lock, self._trap_errors():
+            self._size = self._query_size()
+            # 전체 화면 이미지를 미리 만들어 픽셀 형식을 확인
+            self._image_for(*self._size)
+        logger.info(f"X11 MIT-SHM 캡처 백엔드: {display} {self._size[0]}x{self._size[1]}")
+    
+    def _declare(self):
+        """사용하는 Xlib/XShm/libc 함수 시그니처 선언"""
+        x11, xext, libc = self._x11, self._xext, self._libc
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        x11.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        x11.XRootWindow.restype = ctypes.c_ulong
+        x11.XRootWindow.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultVisual.restype = ctypes.c_void_p
+        x11.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XGetGeometry.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint),
+            ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint),
+        ]
+        x11.XDestroyImage.argtypes = [ctypes.POINTER(_XImage)]
+        x11.XSetErrorHandler.restype = ctypes.c_void_p
+        x11.XSetErrorHandler.argtypes = [_ERROR_HANDLER]
+        xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+        xext.XShmCreateImage.restype = ctypes.POINTER(_XImage)
+        xext.XShmCreateImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_char_p,
+            ctypes.POINTER(_XShmSegmentInfo), ctypes.c_uint, ctypes.c_uint,
+        ]
+        xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmDetach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmGetImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XImage), ctypes.c_int, ctypes.c_int, ctypes.c_ulong,
+        ]
+        libc.shmget.restype = ctypes.c_int
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmdt.argtypes = [ctypes.c_void_p]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+    
+    @contextmanager
+    def _trap_errors(self):
+        """
+        이 블록 동안만 오류 처리기를 바꿔 끼우고 끝나면 이전 처리기로 되돌림
+        
+        Xlib 오류 처리기는 프로세스 전역이므로 계속 바꿔 두면 같은 프로세스의 다른 Xlib 사용자
+        (pyautogui, tkinter 등)의 오류 처리를 가로채게 됩니다. 호출자가 self._lock을 잡고 있어야 합니다.
+        """
+        self._error = None
+        self._previous_handler = self._x11.XSetErrorHandler(self._error_handler)
+        try:
+            yield
+        finally:
+            previous, self._previous_handler = self._previous_handler, None
+            self._x11.XSetErrorHandler(ctypes.cast(previous, _ERROR_HANDLER) if previous else None)
+    
+    def _on_error(self, display, event) -> int:
+        """이 연결의 X 오류 기록 (프로세스를 종료하지 않음, 다른 연결의 오류는 이전 처리기로 넘김)"""
+        if display != self._display and self._previous_handler:
+            return ctypes.cast(self._previous_handler, _ERROR_HANDLER)(display, event)
+        self._error = int(event.contents.error_code)
+        return 0
+    
+    def _take_error(self) -> Optional[int]:
+        """마지막 X 오류 코드를 꺼내고 지움"""
+        error, self._error = self._error, None
+        return error
+    
+    def _image_for(self, width: int, height: int) -> _ShmImage:
+        """크기에 맞는 공유 메모리 이미지 (없으면 만들고, 많으면 가장 오래 안 쓴 것부터 해제)"""
+        key = (width, height)
+        image = self._images.get(key)
+        if image is None:
+            image = _ShmImage(self, width, height)
+            self._images[key] = image
+            while len(self._images) > MAX_SHM_IMAGES:
+                _, evicted = self._images.popitem(last=False)
+                evicted.close()
+        else:
+            self._images.move_to_end(key)
+        return image
+    
+    def _query_size(self) -> Tuple[int, int]:
+        """루트 윈도우의 현재 크기 (조회 실패 시 마지막 크기, 호출자가 self._lock을 잡고 있어야 함)"""
+        root = ctypes.c_ulong()
+        x, y = ctypes.c_int(), ctypes.c_int()
+        width, height, border, depth = ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint()
+        ok = self._x11.XGetGeometry(
+            self._display, self._root, ctypes.byref(root), ctypes.byref(x), ctypes.byref(y),
+            ctypes.byref(width), ctypes.byref(height), ctypes.byref(border), ctypes.byref(depth),
+        )
+        if not ok or self._take_error() is not None or not width.value or not height.value:
+            return self._size
+        return int(width.value), int(height.value)
+    
+    def screen_size(self) -> Tuple[int, int]:
+        # Display 구조체의 화면 크기는 xrandr로 해상도가 바뀌어도 갱신되지 않으므로
+        # 전체 화면 캡처 전마다 루트 윈도우 크기를 다시 조회 (서버 왕복 한 번)
+        with self._lock, self._trap_errors():
+            size = self._query_size()
+            if size != self._size:
+                logger.info(f"X11 화면 크기 변경: {self._size[0]}x{self._size[1]} -> {size[0]}x{size[1]}")
+                self._size = size
+        return size
+    
+    def grab_into(self, out: np.ndarray, region: Optional[Region] = None) -> np.ndarray:
+        x, y, width, height = region if region is not None else (0, 0, *self._size)
+        # 루트 윈도우 밖은 XShmGetImage가 BadMatch를 내므로 화면 안쪽만 캡처하고 나머지는 검은색
+        left, top = max(0, x), max(0, y)
+        right, bottom = min(self._size[0], x + width), min(self._size[1], y + height)
+        if right <= left or bottom <= top:
+            out[...] = 0
+            return out
+        if (left, top, right, bottom) != (x, y, x + width, y + height):
+            out[...] = 0
+        
+        with self._lock, self._trap_errors():
+            image = self._image_for(right - left, bottom - top)
+            ok = self._xext.XShmGetImage(self._display, self._root, image.image, left, top, _ALL_PLANES)
+            error = self._take_error()
+            if not ok or error is not None:
+                raise OSError(f"XShmGetImage 실패 (X 오류 {error})")
+            np.copyto(out[top - y:bottom - y, left - x:right - x], image.rgb)
+        return out
+    
+    def close(self):
+        with self._lock, self._trap_errors():
+            for image in self._images.values():
+                image.close()
+            self._images.clear()
+            if self._display:
+                self._x11.XCloseDisplay(self._display)
+                self._display = None
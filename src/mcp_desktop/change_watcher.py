@@ -0,0 +1,248 @@
+"""
+화면 변경 감시 모듈
+축소된 화면을 주기적으로 샘플링하여 블록 단위 변화를 추적하고,
+도구 호출 시 다시 OCR해야 할 인덱스 타일을 바로 알 수 있도록 함
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Optional, Tuple
+
+from .screenshot import get_screenshot_controller
+
+logger = logging.getLogger("mcp_desktop.change_watcher")
+
+try:
+    import numpy as np
+    
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.warning("numpy가 설치되지 않았습니다. 화면 변경 감시 기능을 사용할 수 없습니다.")
+
+# 기본 샘플링 주기 (Hz)
+DEFAULT_SAMPLE_RATE = 2.0
+
+# 샘플링 시 화면 축소 배율 (가로/세로 각각 1/SCALE)
+DEFAULT_SCALE = 8
+
+# 변화 판단 블록 크기 (축소된 화면 기준 픽셀)
+DEFAULT_BLOCK_SIZE = 4
+
+# 블록 안 축소 픽셀 중 하나라도 밝기 차이가 이 값을 넘으면 변경으로 간주 (0~255)
+# 블록 평균으로 비교하면 단어 하나 정도의 변화는 묻혀 버리므로 블록 최대값으로 비교
+DEFAULT_THRESHOLD = 6.0
+
+# 감시에 사용할 최대 CPU 비율 (샘플링 시간 / 전체 시간)
+DEFAULT_CPU_BUDGET = 0.03
+
+
+class ScreenChangeWatcher:
+    """화면 변경 감시기"""
+    
+    def __init__(
+        self,
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+        scale: int = DEFAULT_SCALE,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        threshold: float = DEFAULT_THRESHOLD,
+        cpu_budget: float = DEFAULT_CPU_BUDGET,
+    ):
+        """
+        Args:
+            sample_rate: 샘플링 주기 (Hz). CPU 예산을 넘으면 자동으로 낮아집니다.
+            scale: 화면 축소 배율
+            block_size: 변화 판단 블록 크기 (축소된 화면 기준 픽셀)
+            threshold: 변경으로 간주할 축소 픽셀의 밝기 차이 (블록 최대값 기준)
+            cpu_budget: 감시에 사용할 최대 CPU 비율 (0~1)
+        """
+        self.sample_rate = sample_rate
+        self.scale = scale
+        self.block_size = block_size
+        self.threshold = threshold
+        self.cpu_budget = cpu_budget
+        self.screenshot = get_screenshot_controller()
+        
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at: Optional[float] = None
+        self._previous = None  # 이전 축소 프레임 (float32)
+        self._changed_at = None  # 블록별 마지막 변경 시각 (time.monotonic())
+        self._screen_size: Optional[Tuple[int, int]] = None
+        
+        self._samples = 0
+        self._sample_seconds = 0.0
+        self._last_sample_ms = 0.0
+        self._changed_blocks = 0
+    
+    @property
+    def block_pixels(self) -> int:
+        """블록 한 변의 실제 화면 픽셀 수"""
+        return self.scale * self.block_size
+    
+    def start(self) -> bool:
+        """
+        감시 스레드 시작
+        
+        Returns:
+            시작 여부 (numpy가 없으면 False)
+        """
+        if not NUMPY_AVAILABLE:
+            logger.warning("numpy가 없어 화면 변경 감시를 시작할 수 없습니다.")
+            return False
+        if self.is_running():
+            return True
+        
+        self._stop_event.clear()
+        self._previous = None
+        self._changed_at = None
+        self._started_at = None
+        self._thread = threading.Thread(target=self._run, name="mcp-change-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"화면 변경 감시 시작: {self.sample_rate}Hz, 1/{self.scale} 축소, 블록 {self.block_pixels}px")
+        return True
+    
+    def stop(self):
+        """감시 스레드 중지"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        with self._lock:
+            self._started_at = None
+        logger.info("화면 변경 감시 중지")
+    
+    def is_running(self) -> bool:
+        """감시 스레드 실행 여부"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def covers(self, since: float) -> bool:
+        """
+        since 이후의 모든 변화를 감시했는지 확인
+        
+        Args:
+            since: time.monotonic() 기준 시각
+        
+        Returns:
+            감시기가 since 이전부터 계속 실행 중이면 True
+        """
+        with self._lock:
+            return self.is_running() and self._started_at is not None and self._started_at <= since
+    
+    def changed_since(self, rect: Tuple[int, int, int, int], since: float) -> bool:
+        """
+        화면 영역이 since 이후 변경되었는지 확인
+        
+        Args:
+            rect: 화면 좌표 영역 (x, y, width, height)
+            since: time.monotonic() 기준 시각
+        
+        Returns:
+            영역에 걸친 블록 중 하나라도 since 이후 변경되었으면 True
+        """
+        with self._lock:
+            if self._changed_at is None:
+                return False
+            x, y, width, height = rect
+            block = self.block_pixels
+            x0 = max(0, x // block)
+            y0 = max(0, y // block)
+            x1 = math.ceil((x + width) / block)
+            y1 = math.ceil((y + height) / block)
+            cells = self._changed_at[y0:y1, x0:x1]
+            return cells.size > 0 and float(cells.max()) > since
+    
+    def get_stats(self) -> dict:
+        """
+        감시 통계 (CPU 사용 비율 포함)
+        
+        Returns:
+            샘플 수, 평균 샘플링 시간, CPU 사용 비율 등을 포함한 딕셔너리
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._started_at if self._started_at is not None else 0.0
+            return {
+                "success": True,
+                "running": self.is_running(),
+                "samples": self._samples,
+                "avg_sample_ms": round(self._sample_seconds / self._samples * 1000, 2) if self._samples else 0.0,
+                "last_sample_ms": round(self._last_sample_ms, 2),
+                "cpu_ratio": round(self._sample_seconds / elapsed, 4) if elapsed > 0 else 0.0,
+                "cpu_budget": self.cpu_budget,
+                "changed_blocks": self._changed_blocks,
+                "block_pixels": self.block_pixels,
+            }
+    
+    def _run(self):
+        """감시 루프"""
+        interval = 1.0 / self.sample_rate
+        while not self._stop_event.is_set():
+            started = time.perf_counter()
+            try:
+                self._sample()
+            except Exception as e:
+                logger.debug(f"화면 샘플링 실패: {e}")
+            elapsed = time.perf_counter() - started
+            
+            # CPU 예산을 넘지 않도록 샘플링 시간에 비례해 대기 시간을 늘림
+            wait = max(interval - elapsed, elapsed * (1.0 / self.cpu_budget - 1.0))
+            self._stop_event.wait(wait)
+    
+    def _sample(self):
+        """축소 프레임을 캡처하여 이전 프레임과 블록 단위로 비교"""
+        sample_started = time.perf_counter()
+        captured_at = time.monotonic()
+        
+        # 항상 새로 캡처 (새 프레임은 다른 캡처 요청이 재사용할 수 있도록 프레임 캐시에 저장됨)
+        gray = self.screenshot.grab_array(gray=True, fresh=True)
+        screen_size = (gray.shape[1], gray.shape[0])
+        # scale x scale 상자 평균으로 축소 (나누어떨어지지 않는 가장자리는 제외)
+        height = gray.shape[0] - gray.shape[0] % self.scale
+        width = gray.shape[1] - gray.shape[1] % self.scale
+        frame = gray[:height, :width].reshape(
+            height // self.scale, self.scale, width // self.scale, self.scale
+        ).mean(axis=(1, 3), dtype=np.float32)
+        
+        # 블록 크기의 배수가 되도록 가장자리를 복제하여 패딩
+        pad_y = (-frame.shape[0]) % self.block_size
+        pad_x = (-frame.shape[1]) % self.block_size
+        if pad_y or pad_x:
+            frame = np.pad(frame, ((0, pad_y), (0, pad_x)), mode="edge")
+        blocks_y = frame.shape[0] // self.block_size
+        blocks_x = frame.shape[1] // self.block_size
+        
+        with self._lock:
+            if self._started_at is None or self._screen_size != screen_size or self._previous is None:
+                # 첫 샘플 또는 해상도 변경: 기준 프레임만 저장 (이전 변화는 알 수 없으므로 감시 시작 시각을 갱신)
+                self._previous = frame
+                self._changed_at = np.zeros((blocks_y, blocks_x), dtype=np.float64)
+                self._screen_size = screen_size
+                self._started_at = captured_at
+            else:
+                delta = np.abs(frame - self._previous)
+                block_delta = delta.reshape(blocks_y, self.block_size, blocks_x, self.block_size).max(axis=(1, 3))
+                changed = block_delta > self.threshold
+                count = int(changed.sum())
+                if count:
+                    self._changed_at[changed] = captured_at
+                    self._changed_blocks += count
+                self._previous = frame
+            
+            self._samples += 1
+            self._last_sample_ms = (time.perf_counter() - sample_started) * 1000
+            self._sample_seconds += self._last_sample_ms / 1000
+
+
+# 전역 인스턴스
+_change_watcher = None
+
+
+def get_change_watcher() -> ScreenChangeWatcher:
+    """화면 변경 감시기 싱글톤 인스턴스 반환"""
+    global _change_watcher
+    if _change_watcher is None:
+        _change_watcher = ScreenChangeWatcher()
+    return _change_watcher
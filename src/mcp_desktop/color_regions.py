@@ -0,0 +1,185 @@
+"""
+색상 영역 찾기 모듈
+프레임에서 지정한 색과 비슷한 픽셀을 한 번에 골라내고, 연결된 픽셀 덩어리(4-이웃)를
+행 구간(run) 단위로 묶어 경계 사각형과 면적을 구함 (강조된 셀, 상태 배지 등)
+"""
+
+import logging
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger("mcp_desktop.color_regions")
+
+# 색상 지정 ("#rrggbb" 또는 [R, G, B])
+Color = Union[str, Sequence[int]]
+
+
+def parse_color(color: Color) -> Tuple[int, int, int]:
+    """
+    색상 값을 (R, G, B)로 변환
+    
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    if isinstance(color, str):
+        value = color.strip().lstrip("#")
+        if len(value) == 3:
+            value = "".join(ch * 2 for ch in value)
+        if len(value) != 6:
+            raise ValueError(f"색상 형식이 잘못되었습니다: {color} (#rrggbb 또는 [R, G, B])")
+        return int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)
+    if len(color) != 3:
+        raise ValueError(f"색상 형식이 잘못되었습니다: {color} (#rrggbb 또는 [R, G, B])")
+    red, green, blue = (int(channel) for channel in color)
+    if not all(0 <= channel <= 255 for channel in (red, green, blue)):
+        raise ValueError(f"색상 값은 0-255 범위여야 합니다: {color}")
+    return red, green, blue
+
+
+def color_mask(pixels: np.ndarray, color: Tuple[int, int, int], tolerance: int) -> np.ndarray:
+    """
+    채널별 차이가 모두 tolerance 이하인 픽셀 (채널마다 비교, 채널 축 축소는 매우 느리므로 피함)
+    
+    Args:
+        pixels: (height, width, 3) uint8 배열
+        color: (R, G, B)
+        tolerance: 채널별 허용 차이 (0-255)
+    
+    Returns:
+        (height, width) bool 배열
+    """
+    mask = None
+    for channel, value in enumerate(color):
+        low = max(0, value - tolerance)
+        span = min(255, value + tolerance) - low
+        if span == 255:
+            continue
+        # uint8 뺄셈은 순환하므로 low보다 작은 값은 큰 값이 되어 비교 한 번으로 범위 검사
+        inside = np.subtract(pixels[..., channel], np.uint8(low)) <= span
+        mask = inside if mask is None else np.logical_and(mask, inside, out=mask)
+    if mask is None:
+        mask = np.ones(pixels.shape[:2], dtype=bool)
+    return mask
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """행마다 연속된 True 구간 (행, 시작 열, 끝 열(미포함)), 행 우선 순서"""
+    height, width = mask.shape
+    # 양 끝에 False 열을 붙이면 바뀌는 위치가 행마다 시작, 끝 순서로 번갈아 나옴
+    padded = np.zeros((height, width + 2), dtype=bool)
+    padded[:, 1:-1] = mask
+    rows, columns = np.divmod(np.flatnonzero(padded[:, 1:] != padded[:, :-1]), width + 1)
+    return rows[0::2], columns[0::2], columns[1::2]
+
+
+def _label_runs(rows: np.ndarray, starts: np.ndarray, ends: np.ndarray, width: int) -> np.ndarray:
+    """
+    위아래로 겹치는 구간을 같은 덩어리로 묶음 (벡터화한 유니온 파인드)
+    
+    Returns:
+        구간별 덩어리 번호 (덩어리에서 가장 작은 구간 번호)
+    """
+    count = rows.size
+    labels = np.arange(count)
+    if count == 0:
+        return labels
+    
+    # 행과 열을 한 키로 합쳐 정렬된 상태로 검색 (구간은 행 우선 순서라 시작/끝 키 모두 정렬됨)
+    stride = width + 1
+    start_keys = rows * stride + starts
+    end_keys = rows * stride + ends
+    next_row = (rows + 1) * stride
+    # 다음 행에서 [시작, 끝)이 겹치는 구간: 끝 > 내 시작, 시작 < 내 끝
+    low = np.searchsorted(end_keys, next_row + starts, side="right")
+    high = np.searchsorted(start_keys, next_row + ends, side="left")
+    pairs = np.maximum(high - low, 0)
+    if not pairs.any():
+        return labels
+    upper = np.repeat(np.arange(count), pairs)
+    offsets = np.arange(pairs.sum()) - np.repeat(np.cumsum(pairs) - pairs, pairs)
+    lower = np.repeat(low, pairs) + offsets
+    
+    # 연결된 구간끼리 더 작은 번호를 전파하고 포인터 점프로 대표 번호까지 줄임
+    while True:
+        linked = np.minimum(labels[upper], labels[lower])
+        updated = labels.copy()
+        np.minimum.at(updated, upper, linked)
+        np.minimum.at(updated, lower, linked)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def find_regions(mask: np.ndarray, min_area: int = 1) -> List[dict]:
+    """
+    마스크의 연결된 덩어리(4-이웃) 경계 사각형과 면적
+    
+    Args:
+        mask: (height, width) bool 배열
+        min_area: 최소 면적 (픽셀, 더 작은 덩어리는 제외)
+    
+    Returns:
+        {x, y, width, height, area, center_x, center_y} 목록 (mask 기준 좌표, 면적 내림차순)
+    """
+    rows, starts, ends = _runs(mask)
+    if rows.size == 0:
+        return []
+    labels = _label_runs(rows, starts, ends, mask.shape[1])
+    
+    # 덩어리별 경계와 면적 (구간 단위로 한 번에 집계)
+    components, index = np.unique(labels, return_inverse=True)
+    size = components.size
+    left = np.full(size, mask.shape[1])
+    right = np.zeros(size, dtype=np.int64)
+    top = np.full(size, mask.shape[0])
+    bottom = np.zeros(size, dtype=np.int64)
+    np.minimum.at(left, index, starts)
+    np.maximum.at(right, index, ends)
+    np.minimum.at(top, index, rows)
+    np.maximum.at(bottom, index, rows + 1)
+    area = np.bincount(index, weights=ends - starts, minlength=size).astype(np.int64)
+    
+    order = np.argsort(-area, kind="stable")
+    order = order[area[order] >= min_area]
+    return [
+        {
+            "x": int(left[i]),
+            "y": int(top[i]),
+            "width": int(right[i] - left[i]),
+            "height": int(bottom[i] - top[i]),
+            "area": int(area[i]),
+            "center_x": int((left[i] + right[i]) // 2),
+            "center_y": int((top[i] + bottom[i]) // 2),
+        }
+        for i in order.tolist()
+    ]
+
+
+def find_color_regions(
+    pixels: np.ndarray,
+    color: Color,
+    tolerance: int = 0,
+    min_area: int = 1,
+    max_results: Optional[int] = None,
+) -> Tuple[List[dict], int]:
+    """
+    프레임에서 지정한 색의 연결된 영역 찾기
+    
+    Args:
+        pixels: (height, width, 3) uint8 배열
+        color: "#rrggbb" 또는 [R, G, B]
+        tolerance: 채널별 허용 차이 (0-255)
+        min_area: 최소 면적 (픽셀)
+        max_results: 최대 결과 수 (None이면 전체)
+    
+    Returns:
+        (면적 내림차순 영역 목록, 잘리기 전 영역 수)
+    """
+    mask = color_mask(pixels, parse_color(color), max(0, min(255, int(tolerance))))
+    regions = find_regions(mask, max(1, int(min_area)))
+    total = len(regions)
+    if max_results is not None:
+        regions = regions[:max(0, int(max_results))]
+    return regions, total
@@ -0,0 +1,221 @@
+"""
+델타 스크린샷 모듈
+같은 영역을 반복 캡처할 때 키별 마지막 프레임을 기억해 두고, 블록 단위로 비교하여
+바뀐 사각형만 잘라 보내거나 변화가 없으면 "unchanged"만 반환
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("mcp_desktop.delta")
+
+# 키별로 보관할 마지막 프레임 최대 개수 환경 변수
+MAX_ENTRIES_ENV = "MCP_DESKTOP_DELTA_ENTRIES"
+
+# 기본 마지막 프레임 최대 개수
+DEFAULT_MAX_ENTRIES = 16
+
+# 비교 블록 크기 (픽셀)
+BLOCK_SIZE = 16
+
+# 최대 패치 수 (넘으면 바뀐 블록 전체를 감싸는 사각형 하나로 합침)
+MAX_PATCHES = 32
+
+# 바뀐 면적이 이 비율을 넘으면 패치 대신 전체 프레임(keyframe)을 보냄
+KEYFRAME_RATIO = 0.5
+
+# 사각형 (x, y, width, height) - 영역 기준 좌표
+Rect = Tuple[int, int, int, int]
+
+
+def changed_blocks(previous: np.ndarray, current: np.ndarray, block_size: int = BLOCK_SIZE) -> np.ndarray:
+    """
+    두 프레임을 블록 단위로 비교 (한 번의 벡터 연산)
+    
+    Args:
+        previous: 이전 프레임 ((height, width, 3) 또는 (height, width) uint8 배열)
+        current: 현재 프레임 (previous와 같은 모양)
+        block_size: 블록 크기 (픽셀)
+    
+    Returns:
+        (블록 행 수, 블록 열 수) bool 배열 (픽셀이 하나라도 바뀐 블록이면 True)
+    """
+    height, width = current.shape[:2]
+    channels = current.shape[2] if current.ndim == 3 else 1
+    # 픽셀 행을 바이트 행으로 보고 비교 (채널 축에 대한 축소는 매우 느리므로 피함)
+    diff = previous.reshape(height, width * channels) != current.reshape(height, width * channels)
+    blocks_y = -(-height // block_size)
+    blocks_x = -(-width // block_size)
+    pad_y = blocks_y * block_size - height
+    pad_x = (blocks_x * block_size - width) * channels
+    if pad_y or pad_x:
+        diff = np.pad(diff, ((0, pad_y), (0, pad_x)))
+    # 블록 높이만큼의 행 묶음을 먼저 줄인 뒤 (연속된 안쪽 축 방향 연산) 블록 너비 x 채널 바이트를 줄임
+    bands = diff.reshape(blocks_y, block_size, -1).any(axis=1)
+    return bands.reshape(blocks_y, blocks_x, block_size * channels).any(axis=2)
+
+
+def merge_blocks(blocks: np.ndarray, block_size: int, width: int, height: int) -> List[Rect]:
+    """
+    바뀐 블록을 사각형으로 합침 (행별 연속 구간을 찾고, 같은 구간이 이어지는 행은 세로로 합침)
+    
+    Args:
+        blocks: changed_blocks() 결과
+        block_size: 블록 크기 (픽셀)
+        width: 영역 너비 (마지막 블록을 영역 안으로 자름)
+        height: 영역 높이
+    
+    Returns:
+        사각형 목록 (MAX_PATCHES를 넘으면 전체를 감싸는 사각형 하나)
+    """
+    rects: List[List[int]] = []  # [열 시작, 열 끝, 행 시작, 행 끝] (블록 단위, 끝은 미포함)
+    open_runs = {}
+    for row in range(blocks.shape[0]):
+        line = blocks[row]
+        if not line.any():
+            open_runs = {}
+            continue
+        # 연속 구간의 시작/끝 열 (양 끝에 False를 붙여 경계를 찾음)
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], line, [False])).astype(np.int8)))
+        runs = {}
+        for start, end in zip(edges[::2].tolist(), edges[1::2].tolist()):
+            rect = open_runs.get((start, end))
+            if rect is not None:
+                rect[3] = row + 1
+            else:
+                rect = [start, end, row, row + 1]
+                rects.append(rect)
+            runs[(start, end)] = rect
+        open_runs = runs
+    
+    if len(rects) > MAX_PATCHES:
+        rects = [[
+            min(rect[0] for rect in rects),
+            max(rect[1] for rect in rects),
+            min(rect[2] for rect in rects),
+            max(rect[3] for rect in rects),
+        ]]
+    result = []
+    for col_start, col_end, row_start, row_end in rects:
+        x = col_start * block_size
+        y = row_start * block_size
+        result.append((x, y, min(width, col_end * block_size) - x, min(height, row_end * block_size) - y))
+    return result
+
+
+@dataclass
+class Delta:
+    """델타 비교 결과"""
+    kind: str  # "keyframe", "patches", "unchanged"
+    frame_id: int  # 이번 프레임 번호
+    base_frame: Optional[int]  # 패치를 적용할 이전 프레임 번호 (keyframe이면 None)
+    patches: List[Rect]  # 바뀐 사각형 (kind가 "patches"일 때만)
+    changed_ratio: float  # 바뀐 블록 비율
+
+
+class DeltaTracker:
+    """키별 마지막 프레임 보관 및 비교 (LRU, 스레드 안전)"""
+    
+    def __init__(self, max_entries: Optional[int] = None, block_size: int = BLOCK_SIZE):
+        """
+        Args:
+            max_entries: 보관할 마지막 프레임 최대 개수 (None이면 환경 변수 또는 DEFAULT_MAX_ENTRIES)
+            block_size: 비교 블록 크기 (픽셀)
+        """
+        if max_entries is None:
+            max_entries = int(os.environ.get(MAX_ENTRIES_ENV) or DEFAULT_MAX_ENTRIES)
+        self.max_entries = max(1, max_entries)
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        # 키 -> (프레임 번호, 마지막 프레임 복사본)
+        self._frames: "OrderedDict[str, Tuple[int, np.ndarray]]" = OrderedDict()
+        self._next_id = 1
+        self._counts = {"keyframe": 0, "patches": 0, "unchanged": 0}
+    
+    def compare(self, key: str, pixels: np.ndarray, since: Optional[int] = None) -> Delta:
+        """
+        현재 프레임을 키의 마지막 프레임과 비교하고 마지막 프레임으로 저장
+        
+        Args:
+            key: 클라이언트/영역 키
+            pixels: 현재 프레임 (복사해서 보관하므로 프레임 버퍼의 뷰여도 됨)
+            since: 클라이언트가 가진 마지막 프레임 번호 (None이거나 서버의 마지막 프레임과 다르면 keyframe)
+        
+        Returns:
+            비교 결과
+        """
+        with self._lock:
+            entry = self._frames.get(key)
+        
+        previous = None
+        if entry is not None and entry[1].shape == pixels.shape and since == entry[0]:
+            previous = entry
+        
+        if previous is not None:
+            blocks = changed_blocks(previous[1], pixels, self.block_size)
+            ratio = float(blocks.mean()) if blocks.size else 0.0
+            if ratio == 0.0:
+                # 변화가 없으면 프레임 번호를 유지 (클라이언트는 이미 가진 프레임을 그대로 사용)
+                with self._lock:
+                    if key in self._frames:
+                        self._frames.move_to_end(key)
+                    self._counts["unchanged"] += 1
+                return Delta("unchanged", previous[0], previous[0], [], 0.0)
+            if ratio <= KEYFRAME_RATIO:
+                height, width = pixels.shape[:2]
+                rects = merge_blocks(blocks, self.block_size, width, height)
+                frame_id = self._store(key, pixels, "patches", base=previous[0])
+                if frame_id is not None:
+                    return Delta("patches", frame_id, previous[0], rects, ratio)
+                # 비교하는 동안 같은 키의 다른 호출이 마지막 프레임을 바꿨으면 패치 대신 keyframe
+        
+        frame_id = self._store(key, pixels, "keyframe")
+        return Delta("keyframe", frame_id, None, [], 1.0)
+    
+    def _store(self, key: str, pixels: np.ndarray, kind: str, base: Optional[int] = None) -> Optional[int]:
+        """
+        마지막 프레임 저장 (오래 쓰이지 않은 키부터 제거)
+        
+        Args:
+            base: 패치의 기준 프레임 번호 (지정하면 키의 마지막 프레임이 아직 이 번호일 때만 저장)
+        
+        Returns:
+            새 프레임 번호 (base가 마지막 프레임과 달라 저장하지 않았으면 None)
+        """
+        frame = pixels.copy()
+        with self._lock:
+            if base is not None:
+                entry = self._frames.get(key)
+                if entry is None or entry[0] != base:
+                    return None
+            frame_id = self._next_id
+            self._next_id += 1
+            self._frames[key] = (frame_id, frame)
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_entries:
+                self._frames.popitem(last=False)
+            self._counts[kind] += 1
+        return frame_id
+    
+    def forget(self, key: Optional[str] = None):
+        """키의 마지막 프레임 버리기 (None이면 전부)"""
+        with self._lock:
+            if key is None:
+                self._frames.clear()
+            else:
+                self._frames.pop(key, None)
+    
+    def get_stats(self) -> dict:
+        """보관 중인 키 수와 결과 종류별 횟수"""
+        with self._lock:
+            return {
+                "entries": len(self._frames),
+                "max_entries": self.max_entries,
+                **self._counts,
+            }
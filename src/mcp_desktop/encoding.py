@@ -0,0 +1,203 @@
+"""
+스크린샷 인코딩 모듈
+캡처한 NumPy 배열을 PNG/JPEG/WebP로 인코딩하며, 흑백 변환, 최대 크기 축소,
+바이트 예산에 맞춘 품질/크기 조정으로 LLM에 보낼 이미지 크기를 줄임
+"""
+
+import base64
+import logging
+import math
+import time
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Optional
+
+import numpy as np
+from PIL import Image, features
+
+logger = logging.getLogger("mcp_desktop.encoding")
+
+# 지원하는 이미지 형식 (별칭 -> PIL 형식 이름)
+FORMATS = {"PNG": "PNG", "JPEG": "JPEG", "JPG": "JPEG", "WEBP": "WEBP"}
+
+# 손실 압축 형식 (quality 적용, 바이트 예산을 넘으면 품질부터 낮춤)
+LOSSY_FORMATS = frozenset({"JPEG", "WEBP"})
+
+# 기본 손실 압축 품질
+DEFAULT_QUALITY = 80
+
+# 바이트 예산을 맞출 때 내려갈 수 있는 최저 품질
+MIN_QUALITY = 30
+
+# 바이트 예산을 맞출 때 한 번에 낮추는 품질
+QUALITY_STEP = 20
+
+# 기본 PNG 압축 수준 (0-9, PIL 기본값). PNG 인코딩 시간은 대부분 필터링이 차지하므로
+# 수준을 낮춰도 빨라지는 폭은 작고, 빠른 인코딩이 필요하면 JPEG나 max_dimension을 사용
+DEFAULT_PNG_COMPRESS_LEVEL = 6
+
+# 바이트 예산을 맞추기 위한 최대 인코딩 횟수
+MAX_ENCODE_ATTEMPTS = 6
+
+# 축소할 수 있는 최소 변 길이 (픽셀)
+MIN_DIMENSION = 16
+
+
+@dataclass(frozen=True)
+class EncodeOptions:
+    """이미지 인코딩 옵션"""
+    format: str = "PNG"  # PNG, JPEG(JPG), WEBP
+    quality: int = DEFAULT_QUALITY  # JPEG/WebP 품질 (1-100)
+    compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL  # PNG 압축 수준 (0-9)
+    grayscale: bool = False  # 흑백(L)으로 인코딩
+    max_dimension: Optional[int] = None  # 긴 변의 최대 길이 (픽셀, 넘으면 비율을 유지하며 축소)
+    max_bytes: Optional[int] = None  # base64 인코딩 후 최대 크기 (바이트, 넘으면 품질을 낮추고 축소)
+    
+    def normalized(self) -> "EncodeOptions":
+        """
+        형식 이름과 값 범위를 정리한 옵션
+        
+        Raises:
+            ValueError: 지원하지 않는 형식인 경우
+        """
+        name = FORMATS.get(self.format.upper())
+        if name is None:
+            raise ValueError(f"지원하지 않는 이미지 형식: {self.format} (사용 가능: PNG, JPEG, WEBP)")
+        if name == "WEBP" and not features.check("webp"):
+            raise ValueError("이 Pillow 빌드는 WebP 인코딩을 지원하지 않습니다.")
+        return EncodeOptions(
+            format=name,
+            quality=min(100, max(1, int(self.quality))),
+            compress_level=min(9, max(0, int(self.compress_level))),
+            grayscale=self.grayscale,
+            max_dimension=max(MIN_DIMENSION, int(self.max_dimension)) if self.max_dimension else None,
+            max_bytes=max(1, int(self.max_bytes)) if self.max_bytes else None,
+        )
+    
+    @property
+    def lossless(self) -> bool:
+        """디코딩하면 원본 픽셀과 크기가 그대로 나오는지 (PNG이고 축소 옵션 없음)"""
+        return FORMATS.get(self.format.upper()) == "PNG" and not self.max_dimension and not self.max_bytes
+
+
+@dataclass
+class EncodedImage:
+    """인코딩 결과"""
+    data: bytes
+    format: str
+    width: int  # 인코딩된 이미지 너비
+    height: int  # 인코딩된 이미지 높이
+    scale: float  # 원본 대비 배율 (1.0이면 축소하지 않음)
+    quality: Optional[int]  # 사용한 손실 압축 품질 (PNG면 None)
+    within_budget: bool  # max_bytes 안에 들어왔는지 여부
+    attempts: int  # 인코딩 횟수
+    encode_ms: float
+    
+    @property
+    def base64_size(self) -> int:
+        """base64로 인코딩했을 때 크기 (바이트)"""
+        return base64_size(len(self.data))
+    
+    def to_base64(self) -> str:
+        """base64 문자열"""
+        return base64.b64encode(self.data).decode("ascii")
+    
+    def metadata(self) -> dict:
+        """도구 결과에 넣을 인코딩 정보"""
+        info = {
+            "format": self.format.lower(),
+            "image_width": self.width,
+            "image_height": self.height,
+            "scale": round(self.scale, 4),
+            "bytes": len(self.data),
+            "encode_ms": round(self.encode_ms, 2),
+        }
+        if self.quality is not None:
+            info["quality"] = self.quality
+        if not self.within_budget:
+            info["over_budget"] = True
+        return info
+
+
+def base64_size(size: int) -> int:
+    """size 바이트를 base64로 인코딩했을 때 크기"""
+    return 4 * math.ceil(size / 3)
+
+
+def _resize(image: Image.Image, scale: float) -> Image.Image:
+    """비율을 유지하며 축소 (정수 배 축소를 먼저 적용하여 큰 화면도 빠르게 처리)"""
+    if scale >= 1.0:
+        return image
+    width, height = image.size
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return image.resize(size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+
+
+def _save(image: Image.Image, options: EncodeOptions, quality: int) -> bytes:
+    """한 번 인코딩"""
+    buffer = BytesIO()
+    if options.format == "PNG":
+        image.save(buffer, format="PNG", compress_level=options.compress_level)
+    elif options.format == "JPEG":
+        image.save(buffer, format="JPEG", quality=quality)
+    else:
+        # method 0: 가장 빠른 WebP 인코딩 (기본값 4는 화면 크기에서 수백 ms가 걸림)
+        image.save(buffer, format="WEBP", quality=quality, method=0)
+    return buffer.getvalue()
+
+
+def encode_image(pixels: np.ndarray, options: Optional[EncodeOptions] = None) -> EncodedImage:
+    """
+    캡처 배열 인코딩
+    
+    max_bytes를 넘으면 손실 형식은 품질을 MIN_QUALITY까지 낮춘 뒤, 그래도 크면
+    크기 비율에 맞춰 축소하며 MAX_ENCODE_ATTEMPTS번까지 다시 인코딩합니다.
+    
+    Args:
+        pixels: (height, width, 3) RGB 또는 (height, width) 흑백 uint8 배열
+        options: 인코딩 옵션 (None이면 기본값)
+    
+    Returns:
+        인코딩 결과
+    """
+    started = time.perf_counter()
+    options = (options or EncodeOptions()).normalized()
+    image = Image.fromarray(pixels)
+    if options.grayscale and image.mode != "L":
+        image = image.convert("L")
+    
+    scale = 1.0
+    if options.max_dimension and max(image.size) > options.max_dimension:
+        scale = options.max_dimension / max(image.size)
+    lossy = options.format in LOSSY_FORMATS
+    quality = options.quality
+    attempts = 0
+    while True:
+        scaled = _resize(image, scale)
+        data = _save(scaled, options, quality)
+        attempts += 1
+        size = base64_size(len(data))
+        if options.max_bytes is None or size <= options.max_bytes or attempts >= MAX_ENCODE_ATTEMPTS:
+            break
+        ratio = options.max_bytes / size
+        if lossy and quality > MIN_QUALITY and ratio > 0.5:
+            # 예산과 크게 차이 나지 않으면 해상도를 유지하고 품질만 낮춤
+            quality = max(MIN_QUALITY, quality - QUALITY_STEP)
+            continue
+        if min(scaled.size) <= MIN_DIMENSION:
+            break
+        # 인코딩 크기는 대략 픽셀 수에 비례하므로 변 길이는 제곱근 비율로 축소
+        scale *= min(0.9, max(0.25, math.sqrt(ratio) * 0.95))
+    
+    within_budget = options.max_bytes is None or base64_size(len(data)) <= options.max_bytes
+    return EncodedImage(
+        data=data,
+        format=options.format,
+        width=scaled.size[0],
+        height=scaled.size[1],
+        scale=scaled.size[0] / image.size[0],
+        quality=quality if lossy else None,
+        within_budget=within_budget,
+        attempts=attempts,
+        encode_ms=(time.perf_counter() - started) * 1000,
+    )
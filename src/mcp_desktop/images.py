@@ -0,0 +1,268 @@
+"""
+이미지 결과 전달 모듈
+도구 결과의 base64 이미지를 JSON 텍스트에서 떼어내 MCP 이미지 콘텐츠로 보내거나,
+임시 파일/공유 메모리에 써 두고 핸들만 반환하여 stdio 응답 크기를 줄임
+"""
+
+import atexit
+import base64
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("mcp_desktop.images")
+
+# 보관할 이미지 핸들 최대 개수 환경 변수
+MAX_HANDLES_ENV = "MCP_DESKTOP_IMAGE_HANDLES"
+
+# 기본 이미지 핸들 최대 개수 (넘으면 오래된 파일/공유 메모리부터 삭제)
+DEFAULT_MAX_HANDLES = 16
+
+# 이미지 전달 방식
+# content: MCP 이미지 콘텐츠 (텍스트에는 메타데이터만), base64: 이전 방식 (JSON 안의 base64 문자열),
+# file: 임시 파일 경로, shm: 공유 메모리 이름
+IMAGE_OUTPUTS = ("content", "base64", "file", "shm")
+
+# 형식 -> MIME 타입
+MIME_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+# 결과에서 이미지를 담는 키
+IMAGE_KEY = "image_base64"
+
+# 공유 메모리 이름 접두사 (서버가 쓰는 핸들과 클라이언트가 OCR용으로 넘기는 공유 메모리 모두)
+# 다른 프로그램의 공유 메모리를 읽지 않도록 이 접두사로 시작하는 이름만 읽습니다.
+SHM_PREFIX = "mcp_desktop_"
+
+# 읽을 수 있는 공유 메모리 이름
+_SHM_NAME = re.compile(re.escape(SHM_PREFIX) + r"[A-Za-z0-9_-]+")
+
+# 이미지 콘텐츠 (base64 데이터, MIME 타입)
+ImagePart = Tuple[str, str]
+
+
+class ImageHandleStore:
+    """임시 파일/공유 메모리에 쓴 이미지 핸들 보관 (최근 것만 유지, 스레드 안전)"""
+    
+    def __init__(self, max_handles: Optional[int] = None):
+        """
+        Args:
+            max_handles: 최대 핸들 수 (None이면 환경 변수 또는 DEFAULT_MAX_HANDLES)
+        """
+        if max_handles is None:
+            max_handles = int(os.environ.get(MAX_HANDLES_ENV) or DEFAULT_MAX_HANDLES)
+        self.max_handles = max(1, max_handles)
+        self._lock = threading.Lock()
+        self._directory: Optional[str] = None
+        # 핸들 이름(파일 경로 또는 공유 메모리 이름) -> 공유 메모리 객체 (파일이면 None)
+        self._handles: "OrderedDict[str, Optional[shared_memory.SharedMemory]]" = OrderedDict()
+        self._written = 0
+        self._bytes = 0
+    
+    def write_file(self, data: bytes, format: str) -> dict:
+        """
+        이미지를 임시 파일로 저장
+        
+        Returns:
+            {"path", "size"} 핸들
+        """
+        with self._lock:
+            if self._directory is None:
+                self._directory = tempfile.mkdtemp(prefix="mcp_desktop_images_")
+            directory = self._directory
+        path = os.path.join(directory, f"{uuid.uuid4().hex}.{format}")
+        with open(path, "wb") as f:
+            f.write(data)
+        self._add(path, None, len(data))
+        return {"path": path, "size": len(data)}
+    
+    def write_shm(self, data: bytes) -> dict:
+        """
+        이미지를 공유 메모리에 저장
+        
+        공유 메모리 크기는 페이지 단위로 올림될 수 있으므로 size 바이트만 읽어야 합니다.
+        
+        Returns:
+            {"shm_name", "size"} 핸들
+        """
+        name = f"{SHM_PREFIX}{uuid.uuid4().hex[:16]}"
+        segment = shared_memory.SharedMemory(name=name, create=True, size=max(1, len(data)))
+        segment.buf[:len(data)] = data
+        self._add(name, segment, len(data))
+        return {"shm_name": name, "size": len(data)}
+    
+    def read(self, handle: str, size: Optional[int] = None) -> Optional[bytes]:
+        """
+        이 프로세스가 쓴 핸들의 이미지 바이트 읽기
+        
+        Args:
+            handle: 파일 경로 또는 공유 메모리 이름
+            size: 읽을 바이트 수 (공유 메모리, None이면 전체)
+        
+        Returns:
+            이미지 바이트 (이미 삭제되었거나 이 저장소의 핸들이 아니면 None)
+        """
+        with self._lock:
+            if handle not in self._handles:
+                return None
+            segment = self._handles[handle]
+            self._handles.move_to_end(handle)
+            if segment is not None:
+                return bytes(segment.buf[:size] if size is not None else segment.buf)
+        with open(handle, "rb") as f:
+            return f.read()
+    
+    def _add(self, handle: str, segment: Optional[shared_memory.SharedMemory], size: int):
+        """핸들 등록 (최대 개수를 넘으면 가장 오래된 핸들부터 삭제)"""
+        with self._lock:
+            self._handles[handle] = segment
+            self._written += 1
+            self._bytes += size
+            evicted = []
+            while len(self._handles) > self.max_handles:
+                evicted.append(self._handles.popitem(last=False))
+        for name, old in evicted:
+            self._release(name, old)
+    
+    @staticmethod
+    def _release(handle: str, segment: Optional[shared_memory.SharedMemory]):
+        """파일 삭제 또는 공유 메모리 해제"""
+        try:
+            if segment is None:
+                os.remove(handle)
+            else:
+                segment.close()
+                segment.unlink()
+        except (OSError, BufferError) as e:
+            logger.debug(f"이미지 핸들 삭제 실패 ({handle}): {e}")
+    
+    def close(self):
+        """모든 핸들 삭제 (서버 종료 시)"""
+        with self._lock:
+            handles = list(self._handles.items())
+            self._handles.clear()
+            directory, self._directory = self._directory, None
+        for name, segment in handles:
+            self._release(name, segment)
+        if directory is not None:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+    
+    def get_stats(self) -> dict:
+        """보관 중인 핸들 수와 누적 기록량"""
+        with self._lock:
+            return {
+                "handles": len(self._handles),
+                "max_handles": self.max_handles,
+                "written": self._written,
+                "bytes": self._bytes,
+            }
+
+
+def read_shared_memory(name: str, size: Optional[int] = None) -> bytes:
+    """
+    공유 메모리 내용 읽기 (이 프로세스가 쓴 핸들이면 저장소에서 바로 읽음)
+    
+    다른 프로세스가 만든 공유 메모리는 SHM_PREFIX로 시작하는 이름만 읽으며, 읽기만 하고 지우지 않습니다.
+    
+    Args:
+        name: 공유 메모리 이름
+        size: 읽을 바이트 수 (None이면 전체)
+    
+    Returns:
+        바이트
+    
+    Raises:
+        FileNotFoundError: 공유 메모리가 없는 경우
+        ValueError: 이름이 SHM_PREFIX로 시작하지 않거나 size가 공유 메모리 크기보다 큰 경우
+    """
+    if not _SHM_NAME.fullmatch(name):
+        raise ValueError(f"공유 메모리 이름은 {SHM_PREFIX}로 시작해야 합니다 (영문, 숫자, _, -만 사용): {name}")
+    data = get_image_store().read(name, size)
+    if data is not None:
+        return data
+    if sys.version_info >= (3, 13):
+        # 다른 프로세스가 만든 공유 메모리를 이 프로세스 종료 시 지우지 않도록 추적하지 않음
+        segment = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        segment = shared_memory.SharedMemory(name=name)
+        if os.name == "posix":
+            # track 인자가 없는 버전에서는 등록된 추적을 바로 해제
+            resource_tracker.unregister(segment._name, "shared_memory")
+    try:
+        if size is not None and size > segment.size:
+            raise ValueError(f"공유 메모리 크기({segment.size})보다 많이 읽을 수 없습니다: {size}")
+        return bytes(segment.buf[:size] if size is not None else segment.buf)
+    finally:
+        segment.close()
+
+
+def _deliver(item: Dict[str, Any], format: str, output: str, images: List[ImagePart], store: ImageHandleStore):
+    """항목의 base64 이미지를 전달 방식에 맞게 바꿈 (item을 직접 수정)"""
+    data = item.pop(IMAGE_KEY)
+    if output == "content":
+        images.append((data, MIME_TYPES.get(format, "image/png")))
+        # 텍스트 다음부터 1번 (0번은 메타데이터 텍스트)
+        item["image_content"] = len(images)
+    elif output == "file":
+        item["image_file"] = store.write_file(base64.b64decode(data), format)
+    else:
+        item["image_shm"] = store.write_shm(base64.b64decode(data))
+
+
+def extract_images(result: Any, output: str = "content") -> Tuple[Any, List[ImagePart]]:
+    """
+    도구 결과에서 base64 이미지(image_base64, patches[*].image_base64)를 떼어냄
+    
+    Args:
+        result: 도구 결과
+        output: 전달 방식 (IMAGE_OUTPUTS)
+    
+    Returns:
+        (이미지 대신 image_content/image_file/image_shm 참조를 넣은 결과, MCP 이미지 콘텐츠 목록)
+    
+    Raises:
+        ValueError: 알 수 없는 전달 방식인 경우
+    """
+    if output not in IMAGE_OUTPUTS:
+        raise ValueError(f"알 수 없는 이미지 전달 방식: {output} (사용 가능: {', '.join(IMAGE_OUTPUTS)})")
+    if output == "base64" or not isinstance(result, dict):
+        return result, []
+    patches = result.get("patches")
+    has_patches = isinstance(patches, list) and any(isinstance(p, dict) and IMAGE_KEY in p for p in patches)
+    if IMAGE_KEY not in result and not has_patches:
+        return result, []
+    
+    store = get_image_store()
+    format = str(result.get("format", "png"))
+    images: List[ImagePart] = []
+    result = dict(result)
+    if IMAGE_KEY in result:
+        _deliver(result, format, output, images, store)
+    if has_patches:
+        result["patches"] = [dict(patch) for patch in patches]
+        for patch in result["patches"]:
+            if IMAGE_KEY in patch:
+                _deliver(patch, format, output, images, store)
+    return result, images
+
+
+# 전역 인스턴스
+_image_store = None
+
+
+def get_image_store() -> ImageHandleStore:
+    """이미지 핸들 저장소 싱글톤 인스턴스 반환"""
+    global _image_store
+    if _image_store is None:
+        _image_store = ImageHandleStore()
+        atexit.register(_image_store.close)
+    return _image_store
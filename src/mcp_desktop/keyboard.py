@@ -6,6 +6,8 @@ import pyautogui
 from typing import Optional, List
 import logging
 
+from .utils import INPUT_DEVICE_LOCK
+
 logger = logging.getLogger("mcp_desktop.keyboard")
 
 
@@ -29,7 +31,8 @@ class KeyboardController:
             작업 결과 딕셔너리
         """
         try:
-            pyautogui.write(text, interval=interval)
+            with INPUT_DEVICE_LOCK:
+                pyautogui.write(text, interval=interval)
             logger.info(f"텍스트 입력: {text[:50]}...")  # 처음 50자만 로그
             return {"success": True, "text_length": len(text)}
         except Exception as e:
@@ -49,7 +52,8 @@ class KeyboardController:
             작업 결과 딕셔너리
         """
         try:
-            pyautogui.press(key, presses=presses, interval=interval)
+            with INPUT_DEVICE_LOCK:
+                pyautogui.press(key, presses=presses, interval=interval)
             logger.info(f"키 누르기: {key}, 횟수={presses}")
             return {"success": True, "key": key, "presses": presses}
         except Exception as e:
@@ -67,7 +71,8 @@ class KeyboardController:
             작업 결과 딕셔너리
         """
         try:
-            pyautogui.hotkey(*keys)
+            with INPUT_DEVICE_LOCK:
+                pyautogui.hotkey(*keys)
             logger.info(f"단축키 입력: {'+'.join(keys)}")
             return {"success": True, "keys": list(keys)}
         except Exception as e:
@@ -85,7 +90,8 @@ class KeyboardController:
             작업 결과 딕셔너리
         """
         try:
-            pyautogui.keyDown(key)
+            with INPUT_DEVICE_LOCK:
+                pyautogui.keyDown(key)
             logger.info(f"키 누르기 (유지): {key}")
             return {"success": True, "key": key}
         except Exception as e:
@@ -103,7 +109,8 @@ class KeyboardController:
             작업 결과 딕셔너리
         """
         try:
-            pyautogui.keyUp(key)
+            with INPUT_DEVICE_LOCK:
+                pyautogui.keyUp(key)
             logger.info(f"키 떼기: {key}")
             return {"success": True, "key": key}
         except Exception as e:
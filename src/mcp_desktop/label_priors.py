@@ -0,0 +1,314 @@
+"""
+레이블 위치 사전정보(prior) 저장소
+애플리케이션 윈도우 클래스별로 레이블이 발견된 위치를 기억하고,
+다음 검색 시 작은 영역만 확인하여 전체 OCR을 건너뜀
+"""
+
+import hashlib
+import logging
+from typing import Optional
+from datetime import datetime
+from pathlib import Path
+import sqlite3
+
+from .ocr_scheduler import get_ocr_scheduler, PRIORITY_INTERACTIVE
+from .screen_indexer import text_matches
+from .screenshot import get_screenshot_controller
+from .window import get_window_controller
+
+logger = logging.getLogger("mcp_desktop.label_priors")
+
+# 윈도우 크기 버킷 단위 (픽셀) - 이 단위 안의 크기 차이는 같은 레이아웃으로 간주
+SIZE_BUCKET_PIXELS = 50
+
+# 전체 화면에 사용하는 윈도우 클래스 이름
+SCREEN_WINDOW_CLASS = "__screen__"
+
+# 연속 검증 실패가 이 횟수에 도달하면 사전정보를 폐기
+MAX_MISSES = 3
+
+# 픽셀 해시 계산 시 축소 크기
+PIXEL_HASH_SIZE = (16, 16)
+
+
+class LabelPriorStore:
+    """레이블 위치 사전정보 저장소"""
+    
+    def __init__(self):
+        """저장소 초기화"""
+        self.screenshot = get_screenshot_controller()
+        self.window = get_window_controller()
+        self.scheduler = get_ocr_scheduler()
+        self._db_path = Path.home() / ".mcp_desktop" / "screen_index.db"
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_table()
+    
+    def _init_table(self):
+        """사전정보 테이블 초기화"""
+        try:
+            conn = sqlite3.connect(str(self._db_path))
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS label_priors (
+                    window_class TEXT NOT NULL,
+                    size_bucket TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    rel_x INTEGER NOT NULL,
+                    rel_y INTEGER NOT NULL,
+                    width INTEGER NOT NULL,
+                    height INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    pixel_hash TEXT,
+                    hits INTEGER DEFAULT 0,
+                    misses INTEGER DEFAULT 0,
+                    last_seen TEXT NOT NULL,
+                    PRIMARY KEY (window_class, size_bucket, label)
+                )
+            """)
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"사전정보 테이블 초기화 실패: {e}")
+    
+    @staticmethod
+    def size_bucket(width: int, height: int) -> str:
+        """
+        윈도우 크기를 버킷 문자열로 변환
+        
+        Args:
+            width: 너비
+            height: 높이
+        
+        Returns:
+            "가로x세로" 형식의 버킷 (SIZE_BUCKET_PIXELS 단위로 반올림)
+        """
+        bucket_w = round(width / SIZE_BUCKET_PIXELS) * SIZE_BUCKET_PIXELS
+        bucket_h = round(height / SIZE_BUCKET_PIXELS) * SIZE_BUCKET_PIXELS
+        return f"{bucket_w}x{bucket_h}"
+    
+    def get_context(self, window_id: Optional[int] = None) -> Optional[dict]:
+        """
+        사전정보 키를 만들기 위한 윈도우 컨텍스트 조회
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+        
+        Returns:
+            window_class, size_bucket, left, top을 포함한 딕셔너리 (조회 실패 시 None)
+        """
+        if window_id is None:
+            screen_info = self.screenshot.get_screen_size()
+            if not screen_info.get("success"):
+                return None
+            return {
+                "window_class": SCREEN_WINDOW_CLASS,
+                "size_bucket": self.size_bucket(screen_info["width"], screen_info["height"]),
+                "left": 0,
+                "top": 0,
+            }
+        
+        info = self.window.get_window_info(window_id)
+        if not info.get("success"):
+            return None
+        window = info["window"]
+        position = window["position"]
+        return {
+            "window_class": window["class"],
+            "size_bucket": self.size_bucket(position["width"], position["height"]),
+            "left": position["left"],
+            "top": position["top"],
+        }
+    
+    def _pixel_hash(self, x: int, y: int, width: int, height: int) -> Optional[str]:
+        """
+        영역의 축소 그레이스케일 픽셀 해시 계산
+        
+        Returns:
+            해시 문자열 (캡처 실패 시 None)
+        """
+        try:
+            image = self.screenshot.grab_region(x, y, width, height)
+            thumbnail = image.convert("L").resize(PIXEL_HASH_SIZE)
+            return hashlib.blake2b(thumbnail.tobytes(), digest_size=16).hexdigest()
+        except Exception as e:
+            logger.debug(f"픽셀 해시 계산 실패: {e}")
+            return None
+    
+    def lookup(self, context: dict, label: str) -> Optional[dict]:
+        """
+        저장된 사전정보 조회
+        
+        Args:
+            context: get_context() 결과
+            label: 레이블 (검색 텍스트)
+        
+        Returns:
+            사전정보 딕셔너리 (없으면 None)
+        """
+        conn = sqlite3.connect(str(self._db_path))
+        cursor = conn.execute("""
+            SELECT rel_x, rel_y, width, height, text, pixel_hash, hits, misses
+            FROM label_priors
+            WHERE window_class = ? AND size_bucket = ? AND label = ?
+        """, (context["window_class"], context["size_bucket"], label))
+        row = cursor.fetchone()
+        conn.close()
+        
+        if row is None:
+            return None
+        return {
+            "rel_x": row[0],
+            "rel_y": row[1],
+            "width": row[2],
+            "height": row[3],
+            "text": row[4],
+            "pixel_hash": row[5],
+            "hits": row[6],
+            "misses": row[7],
+        }
+    
+    def record(self, context: dict, label: str, region: dict):
+        """
+        레이블이 발견된 위치 기록
+        
+        Args:
+            context: get_context() 결과
+            label: 레이블 (검색 텍스트)
+            region: 발견된 텍스트 영역 (화면 좌표)
+        """
+        try:
+            pixel_hash = self._pixel_hash(region["x"], region["y"], region["width"], region["height"])
+            conn = sqlite3.connect(str(self._db_path))
+            conn.execute("""
+                INSERT INTO label_priors
+                (window_class, size_bucket, label, rel_x, rel_y, width, height, text, pixel_hash, hits, misses, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 0, ?)
+                ON CONFLICT (window_class, size_bucket, label) DO UPDATE SET
+                    rel_x = excluded.rel_x,
+                    rel_y = excluded.rel_y,
+                    width = excluded.width,
+                    height = excluded.height,
+                    text = excluded.text,
+                    pixel_hash = excluded.pixel_hash,
+                    misses = 0,
+                    last_seen = excluded.last_seen
+            """, (
+                context["window_class"],
+                context["size_bucket"],
+                label,
+                region["x"] - context["left"],
+                region["y"] - context["top"],
+                region["width"],
+                region["height"],
+                region["text"],
+                pixel_hash,
+                datetime.now().isoformat(),
+            ))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"사전정보 기록 실패: {e}", exc_info=True)
+    
+    def _update_stats(self, context: dict, label: str, hit: bool, pixel_hash: Optional[str] = None):
+        """검증 결과를 반영 (성공 시 hits 증가, 실패가 누적되면 삭제)"""
+        key = (context["window_class"], context["size_bucket"], label)
+        conn = sqlite3.connect(str(self._db_path))
+        if hit:
+            conn.execute("""
+                UPDATE label_priors
+                SET hits = hits + 1, misses = 0, last_seen = ?, pixel_hash = COALESCE(?, pixel_hash)
+                WHERE window_class = ? AND size_bucket = ? AND label = ?
+            """, (datetime.now().isoformat(), pixel_hash, *key))
+        else:
+            conn.execute("""
+                UPDATE label_priors SET misses = misses + 1
+                WHERE window_class = ? AND size_bucket = ? AND label = ?
+            """, key)
+            conn.execute("""
+                DELETE FROM label_priors
+                WHERE window_class = ? AND size_bucket = ? AND label = ? AND misses >= ?
+            """, (*key, MAX_MISSES))
+        conn.commit()
+        conn.close()
+    
+    def verify(
+        self,
+        label: str,
+        window_id: Optional[int] = None,
+        exact_match: bool = False,
+        context: Optional[dict] = None,
+    ) -> Optional[dict]:
+        """
+        기억된 위치에 레이블이 아직 있는지 확인
+        
+        먼저 픽셀 해시를 비교하고, 다르면 해당 작은 영역만 OCR하여 확인합니다.
+        
+        Args:
+            label: 레이블 (검색 텍스트)
+            window_id: 윈도우 ID (None이면 전체 화면)
+            exact_match: 정확히 일치하는지 여부 (OCR 확인 시 사용)
+            context: get_context() 결과 (None이면 새로 조회)
+        
+        Returns:
+            확인된 텍스트 영역 딕셔너리 (화면 좌표, verified_by 포함), 확인 실패 시 None
+        """
+        try:
+            context = context or self.get_context(window_id)
+            if context is None:
+                return None
+            
+            prior = self.lookup(context, label)
+            if prior is None:
+                return None
+            
+            x = context["left"] + prior["rel_x"]
+            y = context["top"] + prior["rel_y"]
+            width = prior["width"]
+            height = prior["height"]
+            region = {
+                "text": prior["text"],
+                "x": x,
+                "y": y,
+                "width": width,
+                "height": height,
+                "center_x": x + width // 2,
+                "center_y": y + height // 2,
+                "confidence": 0.0,
+                "window_id": window_id,
+            }
+            
+            # 1) 픽셀 해시 비교 (OCR 없이 확인)
+            pixel_hash = self._pixel_hash(x, y, width, height)
+            if pixel_hash is not None and pixel_hash == prior["pixel_hash"]:
+                self._update_stats(context, label, hit=True)
+                logger.info(f"사전정보 적중 (픽셀 해시): '{label}' at ({x}, {y})")
+                return {**region, "verified_by": "pixel_hash"}
+            
+            # 2) 작은 영역 OCR로 확인
+            ocr_result = self.scheduler.ocr_region(
+                x, y, width, height, priority=PRIORITY_INTERACTIVE, window_id=window_id
+            )
+            text = (ocr_result.get("text") or "").strip() if ocr_result.get("success") else ""
+            if text and text_matches(text, label, exact_match):
+                self._update_stats(context, label, hit=True, pixel_hash=pixel_hash)
+                logger.info(f"사전정보 적중 (영역 OCR): '{label}' at ({x}, {y})")
+                return {**region, "text": text, "verified_by": "region_ocr"}
+            
+            self._update_stats(context, label, hit=False)
+            logger.info(f"사전정보 불일치: '{label}' at ({x}, {y})")
+            return None
+        
+        except Exception as e:
+            logger.error(f"사전정보 확인 실패: {e}", exc_info=True)
+            return None
+
+
+# 전역 인스턴스
+_label_prior_store = None
+
+
+def get_label_prior_store() -> LabelPriorStore:
+    """레이블 사전정보 저장소 싱글톤 인스턴스 반환"""
+    global _label_prior_store
+    if _label_prior_store is None:
+        _label_prior_store = LabelPriorStore()
+    return _label_prior_store
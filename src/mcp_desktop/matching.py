@@ -0,0 +1,325 @@
+"""
+이미지 템플릿 매칭 모듈
+아이콘, 레이블 없는 툴바 버튼처럼 텍스트로 찾을 수 없는 대상을 화면에서 찾기 위해
+축소 피라미드에서 FFT 기반 정규화 상호상관(NCC)으로 후보를 고른 뒤 원본 해상도에서 위치를 다듬음
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Dict, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+from .capture import to_gray
+
+logger = logging.getLogger("mcp_desktop.matching")
+
+# 캐시할 템플릿 최대 개수
+MAX_TEMPLATES = 32
+
+# 템플릿별로 캐시할 FFT 크기 조합 최대 개수
+MAX_SPECTRA = 8
+
+# 축소 단계에서 템플릿의 짧은 변이 이보다 작아지지 않도록 함 (픽셀)
+MIN_TEMPLATE_SIDE = 8
+
+# 최대 축소 단계 (2^단계 배 축소)
+MAX_LEVELS = 3
+
+# 축소 단계의 후보 임계값 여유 (축소하면 점수가 낮아지므로 원래 임계값보다 낮춰서 후보를 고름)
+COARSE_SLACK = 0.2
+
+# 축소 단계에서 고를 최소 후보 수 (작은 템플릿은 축소 점수가 부정확하므로 넉넉하게 다듬음)
+COARSE_CANDIDATES = 64
+
+# 원본 해상도에서 위치를 다듬을 때 후보 주변 여유 (축소 배율 단위)
+REFINE_MARGIN = 2
+
+# 분산이 이보다 작은 화면 영역은 단색으로 보고 점수 0
+MIN_VARIANCE = 1e-6
+
+
+def _fast_length(n: int) -> int:
+    """n 이상이면서 FFT가 빠른 길이 (2, 3, 5의 곱)"""
+    best = 1 << max(0, (n - 1).bit_length())
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            length = power35
+            while length < n:
+                length *= 2
+            best = min(best, length)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def _reduce(gray: np.ndarray, factor: int) -> np.ndarray:
+    """흑백 배열을 factor배 축소 (블록 평균, PIL C 구현)"""
+    if factor == 1:
+        return gray
+    return np.asarray(Image.fromarray(gray).reduce(factor))
+
+
+class _TemplateLevel:
+    """한 축소 단계의 템플릿 (평균을 뺀 값과 FFT 크기별 스펙트럼 캐시)"""
+    
+    def __init__(self, gray: np.ndarray):
+        values = gray.astype(np.float64)
+        self.shape = values.shape
+        self.zero_mean = values - values.mean()
+        self.norm2 = float((self.zero_mean ** 2).sum())
+        self._spectra: "OrderedDict[Tuple[int, int], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def spectrum(self, size: Tuple[int, int]) -> np.ndarray:
+        """FFT 크기에 맞춘 템플릿 스펙트럼의 켤레 (같은 화면 크기에서는 다시 계산하지 않음)"""
+        with self._lock:
+            cached = self._spectra.get(size)
+            if cached is not None:
+                self._spectra.move_to_end(size)
+                return cached
+        spectrum = np.conj(np.fft.rfft2(self.zero_mean, s=size))
+        with self._lock:
+            self._spectra[size] = spectrum
+            while len(self._spectra) > MAX_SPECTRA:
+                self._spectra.popitem(last=False)
+        return spectrum
+
+
+class Template:
+    """매칭 템플릿 (흑백 원본과 축소 피라미드)"""
+    
+    def __init__(self, gray: np.ndarray):
+        """
+        Args:
+            gray: (height, width) uint8 흑백 템플릿
+        
+        Raises:
+            ValueError: 템플릿이 단색이라 매칭할 수 없는 경우
+        """
+        self.height, self.width = gray.shape
+        self.levels: List[_TemplateLevel] = []
+        factor = 1
+        while True:
+            level = _TemplateLevel(_reduce(gray, factor))
+            if level.norm2 <= MIN_VARIANCE:
+                if factor == 1:
+                    raise ValueError("템플릿이 단색이라 매칭할 수 없습니다.")
+                break
+            self.levels.append(level)
+            if len(self.levels) > MAX_LEVELS or min(self.height, self.width) // (factor * 2) < MIN_TEMPLATE_SIDE:
+                break
+            factor *= 2
+    
+    def level_for(self, max_level: int) -> int:
+        """사용할 축소 단계 (템플릿 피라미드 깊이와 화면 크기에 따른 최대 단계 중 작은 값)"""
+        return min(len(self.levels) - 1, max_level)
+
+
+def _ncc(image: np.ndarray, template: _TemplateLevel) -> np.ndarray:
+    """
+    정규화 상호상관 점수 지도 (FFT 상관 + 누적합으로 구한 영역별 분산)
+    
+    Args:
+        image: (H, W) 흑백 배열
+        template: 템플릿 단계
+    
+    Returns:
+        (H - h + 1, W - w + 1) 점수 (-1 ~ 1, 템플릿의 왼쪽 위 위치 기준)
+    """
+    height, width = image.shape
+    t_height, t_width = template.shape
+    out_height, out_width = height - t_height + 1, width - t_width + 1
+    values = image.astype(np.float64)
+    
+    # 순환 상관에서 유효 영역은 FFT 크기가 화면 크기 이상이면 겹치지 않음
+    size = (_fast_length(height), _fast_length(width))
+    correlation = np.fft.irfft2(np.fft.rfft2(values, s=size) * template.spectrum(size), s=size)
+    correlation = correlation[:out_height, :out_width]
+    
+    # 템플릿 크기 창의 합과 제곱합 (누적합 네 모서리)
+    def window_sums(array: np.ndarray) -> np.ndarray:
+        integral = np.zeros((height + 1, width + 1))
+        np.cumsum(np.cumsum(array, axis=0), axis=1, out=integral[1:, 1:])
+        return (
+            integral[t_height:, t_width:]
+            - integral[:-t_height, t_width:]
+            - integral[t_height:, :-t_width]
+            + integral[:-t_height, :-t_width]
+        )
+    
+    count = t_height * t_width
+    sums = window_sums(values)
+    variance = window_sums(values * values) - sums * sums / count
+    denominator = np.sqrt(np.maximum(variance, 0.0) * template.norm2)
+    scores = np.zeros_like(correlation)
+    valid = variance > MIN_VARIANCE * count
+    np.divide(correlation, denominator, out=scores, where=valid)
+    return scores
+
+
+def _peaks(
+    scores: np.ndarray,
+    threshold: float,
+    limit: int,
+    spacing: Tuple[int, int],
+) -> List[Tuple[int, int, float]]:
+    """
+    점수 지도에서 임계값 이상인 극대점 (서로 spacing 안에 있는 후보는 높은 것만)
+    
+    Returns:
+        (x, y, score) 목록 (점수 내림차순)
+    """
+    flat = scores.ravel()
+    candidates = np.flatnonzero(flat >= threshold)
+    if candidates.size == 0:
+        return []
+    # 상위 후보만 정렬 (큰 화면에서 임계값을 넘는 점이 많아도 전체를 정렬하지 않음)
+    keep = min(candidates.size, max(limit * 64, 256))
+    if candidates.size > keep:
+        candidates = candidates[np.argpartition(flat[candidates], -keep)[-keep:]]
+    candidates = candidates[np.argsort(flat[candidates])[::-1]]
+    
+    space_y, space_x = spacing
+    peaks: List[Tuple[int, int, float]] = []
+    width = scores.shape[1]
+    for index in candidates.tolist():
+        y, x = divmod(index, width)
+        if any(abs(x - px) < space_x and abs(y - py) < space_y for px, py, _ in peaks):
+            continue
+        peaks.append((x, y, float(flat[index])))
+        if len(peaks) >= limit:
+            break
+    return peaks
+
+
+def match_template(
+    gray: np.ndarray,
+    template: Template,
+    threshold: float = 0.8,
+    max_results: int = 5,
+) -> List[dict]:
+    """
+    흑백 화면에서 템플릿 위치 찾기 (축소 단계에서 후보를 고르고 원본 해상도에서 다듬음)
+    
+    Args:
+        gray: (H, W) uint8 흑백 화면 (또는 검색 영역)
+        template: 매칭 템플릿
+        threshold: 최소 NCC 점수 (0 ~ 1)
+        max_results: 최대 결과 수
+    
+    Returns:
+        {x, y, width, height, center_x, center_y, score} 목록 (gray 기준 좌표, 점수 내림차순)
+    """
+    height, width = gray.shape
+    if template.height > height or template.width > width:
+        return []
+    
+    # 검색 영역이 작으면 축소하지 않고 원본 해상도에서 바로 계산
+    max_level = 0
+    while max_level < MAX_LEVELS and (height * width) >> (2 * max_level) > 256 * 256:
+        max_level += 1
+    level = template.level_for(max_level)
+    factor = 1 << level
+    spacing = (max(1, template.height // 2), max(1, template.width // 2))
+    
+    if level == 0:
+        peaks = _peaks(_ncc(gray, template.levels[0]), threshold, max_results, spacing)
+    else:
+        coarse = _ncc(_reduce(gray, factor), template.levels[level])
+        candidates = _peaks(
+            coarse,
+            threshold - COARSE_SLACK,
+            max(COARSE_CANDIDATES, max_results * 4),
+            (max(1, spacing[0] // factor), max(1, spacing[1] // factor)),
+        )
+        
+        # 후보 주변만 원본 해상도로 다시 계산
+        margin = REFINE_MARGIN * factor
+        refined = []
+        for cx, cy, _ in candidates:
+            left = max(0, cx * factor - margin)
+            top = max(0, cy * factor - margin)
+            right = min(width, cx * factor + template.width + margin)
+            bottom = min(height, cy * factor + template.height + margin)
+            if right - left < template.width or bottom - top < template.height:
+                continue
+            scores = _ncc(gray[top:bottom, left:right], template.levels[0])
+            y, x = np.unravel_index(int(np.argmax(scores)), scores.shape)
+            if scores[y, x] >= threshold:
+                refined.append((left + int(x), top + int(y), float(scores[y, x])))
+        
+        refined.sort(key=lambda peak: peak[2], reverse=True)
+        peaks = []
+        for x, y, score in refined:
+            if any(abs(x - px) < spacing[1] and abs(y - py) < spacing[0] for px, py, _ in peaks):
+                continue
+            peaks.append((x, y, score))
+            if len(peaks) >= max_results:
+                break
+    
+    return [
+        {
+            "x": x,
+            "y": y,
+            "width": template.width,
+            "height": template.height,
+            "center_x": x + template.width // 2,
+            "center_y": y + template.height // 2,
+            "score": round(score, 4),
+        }
+        for x, y, score in peaks
+    ]
+
+
+class TemplateCache:
+    """템플릿 피라미드 캐시 (같은 이미지 내용이면 다시 만들지 않음, LRU, 스레드 안전)"""
+    
+    def __init__(self, max_templates: int = MAX_TEMPLATES):
+        self.max_templates = max_templates
+        self._lock = threading.Lock()
+        self._templates: "OrderedDict[str, Template]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+    
+    def get(self, data: bytes) -> Template:
+        """
+        인코딩된 템플릿 이미지로 템플릿 조회 (없으면 디코딩하여 피라미드 생성)
+        
+        Args:
+            data: PNG/JPEG 등 인코딩된 템플릿 이미지
+        
+        Returns:
+            템플릿
+        """
+        key = hashlib.sha1(data).hexdigest()
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self._hits += 1
+                return template
+            self._misses += 1
+        
+        with Image.open(BytesIO(data)) as image:
+            if image.mode == "L":
+                gray = np.array(image)
+            else:
+                gray = to_gray(np.asarray(image.convert("RGB")))
+        template = Template(gray)
+        with self._lock:
+            self._templates[key] = template
+            while len(self._templates) > self.max_templates:
+                self._templates.popitem(last=False)
+        return template
+    
+    def get_stats(self) -> Dict[str, int]:
+        """캐시 항목 수와 적중 수"""
+        with self._lock:
+            return {"templates": len(self._templates), "hits": self._hits, "misses": self._misses}
@@ -0,0 +1,236 @@
+"""
+조회 도구 결과 메모이제이션 모듈
+같은 인자와 같은 인덱스 세대로 반복 호출되는 읽기 전용 도구(find_element, screen_find_text 등)의
+결과를 재사용하여 SQLite 조회를 건너뜀
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .responses import RESPONSE_PROPERTIES
+
+logger = logging.getLogger("mcp_desktop.memo")
+
+# 메모 최대 항목 수 환경 변수 (0이면 메모이제이션 끔)
+MAX_ENTRIES_ENV = "MCP_DESKTOP_MEMO_ENTRIES"
+
+# 기본 메모 최대 항목 수
+DEFAULT_MAX_ENTRIES = 256
+
+# 결과에 영향을 주지 않아 키에서 제외하는 인자 (응답 형태, 마감 시간, 진행 알림, 이미지 전달 방식)
+IGNORED_ARGUMENTS = frozenset({*RESPONSE_PROPERTIES, "deadline_seconds", "stream_regions", "image_output"})
+
+# 인자로 인덱스 세대를 구하는 함수 (세대를 알 수 없으면 None)
+VersionOf = Callable[[Dict[str, Any]], Optional[str]]
+
+
+def normalize_arguments(arguments: Dict[str, Any], schema: Dict[str, Any]) -> str:
+    """
+    메모 키용 인자 정규화 (스키마 기본값을 채우고 결과와 무관한 인자는 제외)
+    
+    Args:
+        arguments: 도구 인자
+        schema: 도구 입력 스키마
+    
+    Returns:
+        키 순서와 무관한 JSON 문자열
+    """
+    normalized = {
+        key: prop["default"]
+        for key, prop in schema.get("properties", {}).items()
+        if "default" in prop
+    }
+    normalized.update(arguments)
+    for key in IGNORED_ARGUMENTS:
+        normalized.pop(key, None)
+    return json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class QueryMemo:
+    """조회 도구 결과 메모 (LRU, 스레드 안전)"""
+    
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Args:
+            max_entries: 최대 항목 수 (None이면 환경 변수 또는 DEFAULT_MAX_ENTRIES, 0이면 끔)
+        """
+        if max_entries is None:
+            max_entries = int(os.environ.get(MAX_ENTRIES_ENV) or DEFAULT_MAX_ENTRIES)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # (도구 이름, 정규화된 인자) -> (인덱스 세대, 만료 시각, 결과)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, Optional[float], dict]]" = OrderedDict()
+        # 도구 이름 -> 메모 항목 수 (항목을 훑지 않고 도구의 항목 유무 확인)
+        self._counts: Dict[str, int] = {}
+        
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._tools: Dict[str, Dict[str, int]] = {}
+    
+    def lookup(self, tool: str, key: str, version: Optional[str]) -> Optional[dict]:
+        """
+        메모된 결과 조회
+        
+        Args:
+            tool: 도구 이름
+            key: 정규화된 인자
+            version: 현재 인덱스 세대 (None이면 항상 실패)
+        
+        Returns:
+            같은 세대에서 메모된 결과 (없거나 세대가 바뀌었거나 만료되었으면 None)
+        """
+        with self._lock:
+            stats = self._tools.setdefault(tool, {"hits": 0, "misses": 0})
+            entry = self._entries.get((tool, key))
+            if entry is not None and (entry[0] != version or (entry[1] is not None and time.monotonic() > entry[1])):
+                # 새 세대가 저장되었거나 만료된 항목은 바로 제거
+                self._remove((tool, key))
+                self._invalidations += 1
+                entry = None
+            if entry is None or version is None:
+                self._misses += 1
+                stats["misses"] += 1
+                return None
+            self._entries.move_to_end((tool, key))
+            self._hits += 1
+            stats["hits"] += 1
+            return entry[2]
+    
+    def store(self, tool: str, key: str, version: str, result: dict, ttl: Optional[float] = None):
+        """
+        결과 메모 (최대 항목 수를 넘으면 가장 오래 쓰이지 않은 항목부터 제거)
+        
+        Args:
+            tool: 도구 이름
+            key: 정규화된 인자
+            version: 결과를 계산한 인덱스 세대
+            result: 도구 결과
+            ttl: 유효 시간 (초, None이면 세대가 바뀔 때까지)
+        """
+        if self.max_entries <= 0:
+            return
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if (tool, key) not in self._entries:
+                self._counts[tool] = self._counts.get(tool, 0) + 1
+            self._entries[(tool, key)] = (version, expires, result)
+            self._entries.move_to_end((tool, key))
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+    
+    def _remove(self, entry_key: Tuple[str, str]):
+        """항목 제거 (호출자가 lock을 잡고 있어야 함)"""
+        del self._entries[entry_key]
+        tool = entry_key[0]
+        self._counts[tool] -= 1
+        if not self._counts[tool]:
+            del self._counts[tool]
+    
+    def clear(self):
+        """모든 항목 제거 (화면을 바꿀 수 있는 입력 도구가 실행된 경우)"""
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+            self._counts.clear()
+    
+    def middleware(self, version_of: VersionOf, ttl: Optional[float] = None):
+        """
+        도구 결과를 (도구, 정규화된 인자, 인덱스 세대) 키로 메모하는 미들웨어 생성
+        
+        결과에 version이 있으면 그 세대로, 없으면 호출 전후 세대가 같을 때만 메모합니다.
+        실패, 부분(partial), 취소된 결과는 메모하지 않습니다.
+        
+        Args:
+            version_of: 인자로 현재 인덱스 세대를 구하는 함수 (세대를 알 수 없으면 None)
+            ttl: 항목 유효 시간 (초, None이면 세대가 바뀔 때까지)
+        
+        Returns:
+            ToolSpec.middleware에 넣을 미들웨어
+        """
+        loaded = False
+        
+        async def current_version(arguments: Dict[str, Any]) -> Optional[str]:
+            # 첫 세대 조회는 인덱서 생성(SQLite 스키마 준비)을 포함할 수 있으므로 워커 스레드에서 실행하고,
+            # 그 뒤로는 잠금 없는 조회라 이벤트 루프에서 바로 실행
+            nonlocal loaded
+            if loaded:
+                return version_of(arguments)
+            version = await asyncio.to_thread(version_of, arguments)
+            loaded = True
+            return version
+        
+        async def memoize(spec, arguments: Dict[str, Any], call_next) -> dict:
+            if self.max_entries <= 0:
+                return await call_next()
+            key = normalize_arguments(arguments, spec.input_schema)
+            # 이 도구의 항목이 있을 때만 세대를 확인
+            before = await current_version(arguments) if self._has_entries(spec.name) else None
+            cached = self.lookup(spec.name, key, before)
+            if cached is not None:
+                return {**cached, "memoized": True}
+            
+            result = await call_next()
+            if not result.get("success") or result.get("partial") or result.get("cancelled"):
+                return result
+            version = result.get("version")
+            if version is None:
+                after = await current_version(arguments)
+                if before is not None and before != after:
+                    return result
+                version = after
+            if version is not None:
+                self.store(spec.name, key, version, result, ttl)
+            return result
+        
+        return memoize
+    
+    async def invalidate_after(self, spec, arguments: Dict[str, Any], call_next) -> dict:
+        """입력 도구 실행 후 모든 메모를 버리는 미들웨어 (클릭/입력으로 화면이 바뀔 수 있음)"""
+        try:
+            return await call_next()
+        finally:
+            self.clear()
+    
+    def _has_entries(self, tool: str) -> bool:
+        """도구의 메모 항목이 하나라도 있는지 확인"""
+        with self._lock:
+            return tool in self._counts
+    
+    def get_stats(self) -> dict:
+        """
+        메모 적중 통계
+        
+        Returns:
+            항목 수, 적중/실패 수, 적중률, 무효화 수, 도구별 적중 수를 포함한 딕셔너리
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "success": True,
+                "max_entries": self.max_entries,
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self._invalidations,
+                "tools": {name: dict(stats) for name, stats in self._tools.items()},
+            }
+
+
+# 전역 인스턴스
+_query_memo = None
+
+
+def get_query_memo() -> QueryMemo:
+    """조회 메모 싱글톤 인스턴스 반환"""
+    global _query_memo
+    if _query_memo is None:
+        _query_memo = QueryMemo()
+    return _query_memo
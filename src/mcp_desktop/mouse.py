@@ -6,6 +6,8 @@ import pyautogui
 from typing import Optional, Tuple
 import logging
 
+from .utils import INPUT_DEVICE_LOCK
+
 logger = logging.getLogger("mcp_desktop.mouse")
 
 
@@ -41,12 +43,13 @@ class MouseController:
             작업 결과 딕셔너리
         """
         try:
-            if x is not None and y is not None:
-                pyautogui.click(x, y, button=button, clicks=clicks, interval=interval)
-                position = (x, y)
-            else:
-                pyautogui.click(button=button, clicks=clicks, interval=interval)
-                position = pyautogui.position()
+            with INPUT_DEVICE_LOCK:
+                if x is not None and y is not None:
+                    pyautogui.click(x, y, button=button, clicks=clicks, interval=interval)
+                    position = (x, y)
+                else:
+                    pyautogui.click(button=button, clicks=clicks, interval=interval)
+                    position = pyautogui.position()
             
             logger.info(f"마우스 클릭: {position}, 버튼={button}, 횟수={clicks}")
             return {
@@ -72,7 +75,8 @@ class MouseController:
             작업 결과 딕셔너리
         """
         try:
-            pyautogui.moveTo(x, y, duration=duration)
+            with INPUT_DEVICE_LOCK:
+                pyautogui.moveTo(x, y, duration=duration)
             logger.info(f"마우스 이동: ({x}, {y}), duration={duration}")
             return {"success": True, "position": (x, y)}
         except Exception as e:
@@ -103,7 +107,8 @@ class MouseController:
             작업 결과 딕셔너리
         """
         try:
-            pyautogui.drag(start_x, start_y, end_x - start_x, end_y - start_y, duration=duration, button=button)
+            with INPUT_DEVICE_LOCK:
+                pyautogui.drag(start_x, start_y, end_x - start_x, end_y - start_y, duration=duration, button=button)
             logger.info(f"마우스 드래그: ({start_x}, {start_y}) -> ({end_x}, {end_y})")
             return {
                 "success": True,
@@ -127,12 +132,13 @@ class MouseController:
             작업 결과 딕셔너리
         """
         try:
-            if x is not None and y is not None:
-                pyautogui.scroll(clicks, x=x, y=y)
-                position = (x, y)
-            else:
-                pyautogui.scroll(clicks)
-                position = pyautogui.position()
+            with INPUT_DEVICE_LOCK:
+                if x is not None and y is not None:
+                    pyautogui.scroll(clicks, x=x, y=y)
+                    position = (x, y)
+                else:
+                    pyautogui.scroll(clicks)
+                    position = pyautogui.position()
             
             logger.info(f"마우스 스크롤: {position}, clicks={clicks}")
             return {"success": True, "position": position, "clicks": clicks}
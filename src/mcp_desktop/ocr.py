@@ -3,11 +3,14 @@ OCR (Optical Character Recognition) 모듈
 """
 
 import logging
-from typing import Optional
+import os
+from typing import Dict, Optional, Sequence, Union
 import base64
 from io import BytesIO
 from PIL import Image
 
+import numpy as np
+
 logger = logging.getLogger("mcp_desktop.ocr")
 
 try:
@@ -18,6 +21,42 @@ except ImportError:
     TESSERACT_AVAILABLE = False
     logger.warning("pytesseract가 설치되지 않았습니다. OCR 기능을 사용할 수 없습니다.")
 
+# Tesseract 하위 프로세스에만 넘길 환경 변수 (현재 프로세스의 os.environ은 건드리지 않음)
+_tesseract_env: Dict[str, str] = {}
+
+
+def tesseract_env() -> Dict[str, str]:
+    """Tesseract 하위 프로세스 환경 (사용자가 직접 설정한 값이 우선)"""
+    env = dict(os.environ)
+    for name, value in _tesseract_env.items():
+        env.setdefault(name, value)
+    return env
+
+
+if TESSERACT_AVAILABLE:
+    _subprocess_args = pytesseract.pytesseract.subprocess_args
+
+    def _tesseract_subprocess_args(*args, **kwargs):
+        """pytesseract의 Popen 인자에 Tesseract 전용 환경 변수를 더함"""
+        options = _subprocess_args(*args, **kwargs)
+        if _tesseract_env:
+            options["env"] = tesseract_env()
+        return options
+
+    pytesseract.pytesseract.subprocess_args = _tesseract_subprocess_args
+
+# OCR 입력 이미지 (NumPy 배열, PIL 이미지, 인코딩된 이미지 바이트)
+ImageSource = Union[np.ndarray, Image.Image, bytes]
+
+
+def _to_image(image: ImageSource) -> Image.Image:
+    """OCR 입력을 PIL 이미지로 변환 (배열은 인코딩 없이 그대로 감쌈)"""
+    if isinstance(image, Image.Image):
+        return image
+    if isinstance(image, np.ndarray):
+        return Image.fromarray(image)
+    return Image.open(BytesIO(image))
+
 
 class OCRController:
     """OCR 제어 클래스"""
@@ -27,16 +66,23 @@ class OCRController:
         if not TESSERACT_AVAILABLE:
             logger.warning("Tesseract OCR이 설치되지 않았습니다.")
 
-    def extract_text_from_image(
-        self,
-        image_base64: str,
-        lang: str = "kor+eng",
-    ) -> dict:
+    def set_thread_limit(self, limit: Optional[int]) -> None:
+        """
+        Tesseract 프로세스당 OpenMP 스레드 수 제한 (OMP_THREAD_LIMIT, None이면 해제)
+
+        여러 Tesseract 프로세스를 동시에 실행할 때 각자 모든 코어에 스레드를 띄워 서로 느려지지 않도록 함
+        """
+        if limit is None:
+            _tesseract_env.pop("OMP_THREAD_LIMIT", None)
+        else:
+            _tesseract_env["OMP_THREAD_LIMIT"] = str(limit)
+
+    def extract_text(self, image: ImageSource, lang: str = "kor+eng") -> dict:
         """
-        이미지에서 텍스트 추출
+        이미지에서 텍스트 추출 (프로세스 안 호출용, PNG 인코딩/base64 없이 바로 OCR)
 
         Args:
-            image_base64: Base64 인코딩된 이미지
+            image: (height, width[, 3]) uint8 배열, PIL 이미지 또는 인코딩된 이미지 바이트
             lang: OCR 언어 (기본값: "kor+eng" - 한국어+영어)
 
         Returns:
@@ -46,12 +92,8 @@ class OCRController:
             return {"success": False, "error": "Tesseract OCR이 설치되지 않았습니다."}
 
         try:
-            # Base64 디코딩
-            image_bytes = base64.b64decode(image_base64)
-            image = Image.open(BytesIO(image_bytes))
-
             # OCR 수행
-            text = pytesseract.image_to_string(image, lang=lang)
+            text = pytesseract.image_to_string(_to_image(image), lang=lang)
             text = text.strip()
 
             logger.info(f"OCR 텍스트 추출: {len(text)} 문자")
@@ -66,6 +108,115 @@ class OCRController:
             logger.error(f"OCR 텍스트 추출 실패: {e}")
             return {"success": False, "error": str(e)}
 
+    def extract_text_from_image(
+        self,
+        image_base64: Optional[str] = None,
+        lang: str = "kor+eng",
+        image: Optional[ImageSource] = None,
+        path: Optional[str] = None,
+        shm_name: Optional[str] = None,
+        shm_size: Optional[int] = None,
+        shm_shape: Optional[Sequence[int]] = None,
+    ) -> dict:
+        """
+        이미지에서 텍스트 추출 (입력은 하나만 지정)
+
+        Args:
+            image_base64: Base64 인코딩된 이미지
+            lang: OCR 언어 (기본값: "kor+eng" - 한국어+영어)
+            image: NumPy 배열, PIL 이미지 또는 이미지 바이트 (프로세스 안 호출용)
+            path: 이미지 파일 경로 (큰 이미지를 도구 인자로 보내지 않고 OCR)
+            shm_name: 공유 메모리 이름 (screenshot_region의 image_shm 핸들 등)
+            shm_size: 공유 메모리에서 읽을 바이트 수 (None이면 전체)
+            shm_shape: 공유 메모리가 인코딩되지 않은 uint8 픽셀이면 [height, width] 또는 [height, width, 3]
+
+        Returns:
+            추출된 텍스트 딕셔너리
+        """
+        sources = [value for value in (image_base64, image, path, shm_name) if value is not None]
+        if len(sources) != 1:
+            return {"success": False, "error": "image_base64, image, path, shm_name 중 하나만 지정하세요."}
+        if path is not None:
+            return self.extract_text_from_file(path, lang=lang)
+        if shm_name is not None:
+            return self.extract_text_from_shared_memory(shm_name, size=shm_size, shape=shm_shape, lang=lang)
+        if image is not None:
+            return self.extract_text(image, lang=lang)
+
+        try:
+            # Base64 디코딩
+            image_bytes = base64.b64decode(image_base64)
+        except Exception as e:
+            logger.error(f"OCR 텍스트 추출 실패: {e}")
+            return {"success": False, "error": str(e)}
+        return self.extract_text(image_bytes, lang=lang)
+
+    def extract_text_from_file(self, path: str, lang: str = "kor+eng") -> dict:
+        """
+        이미지 파일에서 텍스트 추출
+
+        Args:
+            path: 이미지 파일 경로
+            lang: OCR 언어
+
+        Returns:
+            추출된 텍스트 딕셔너리 (path 포함)
+        """
+        try:
+            from .utils import safe_file_path, validate_file_access, log_security_event
+
+            # 파일 접근 검증
+            is_allowed, error_msg = validate_file_access(path, "read")
+            if not is_allowed:
+                return {"success": False, "error": error_msg}
+
+            file_path = safe_file_path(path)
+            log_security_event("file_access", f"ocr {path}", {"path": str(file_path)}, "low")
+            if not file_path.is_file():
+                return {"success": False, "error": f"파일이 존재하지 않습니다: {path}"}
+
+            with Image.open(file_path) as image:
+                image.load()
+                result = self.extract_text(image, lang=lang)
+        except Exception as e:
+            logger.error(f"이미지 파일 OCR 실패: {e}")
+            return {"success": False, "error": str(e)}
+        if result.get("success"):
+            result["path"] = str(file_path)
+        return result
+
+    def extract_text_from_shared_memory(
+        self,
+        name: str,
+        size: Optional[int] = None,
+        shape: Optional[Sequence[int]] = None,
+        lang: str = "kor+eng",
+    ) -> dict:
+        """
+        공유 메모리의 이미지에서 텍스트 추출
+
+        Args:
+            name: 공유 메모리 이름
+            size: 읽을 바이트 수 (None이면 전체, shape를 주면 무시)
+            shape: 인코딩되지 않은 uint8 픽셀이면 [height, width] 또는 [height, width, 3] (None이면 인코딩된 이미지)
+            lang: OCR 언어
+
+        Returns:
+            추출된 텍스트 딕셔너리
+        """
+        try:
+            from .images import read_shared_memory
+
+            if shape is not None:
+                shape = tuple(int(value) for value in shape)
+                size = int(np.prod(shape))
+            data = read_shared_memory(name, size)
+            image = np.frombuffer(data, dtype=np.uint8).reshape(shape) if shape is not None else data
+        except Exception as e:
+            logger.error(f"공유 메모리 OCR 실패: {e}")
+            return {"success": False, "error": str(e)}
+        return self.extract_text(image, lang=lang)
+
     def extract_text_from_screenshot(
         self,
         x: Optional[int] = None,
@@ -91,21 +242,22 @@ class OCRController:
             return {"success": False, "error": "Tesseract OCR이 설치되지 않았습니다."}
 
         try:
-            import pyautogui
+            from .screenshot import get_screenshot_controller
 
-            # 스크린샷 캡처
+            # 스크린샷 캡처 (최근 프레임의 흑백 버퍼를 복사 없이 잘라 사용)
+            capture = get_screenshot_controller()
             if (
                 x is not None
                 and y is not None
                 and width is not None
                 and height is not None
             ):
-                screenshot = pyautogui.screenshot(region=(x, y, width, height))
+                pixels = capture.grab_array((x, y, width, height), gray=True)
             else:
-                screenshot = pyautogui.screenshot()
+                pixels = capture.grab_array(gray=True)
 
             # OCR 수행
-            text = pytesseract.image_to_string(screenshot, lang=lang)
+            text = pytesseract.image_to_string(_to_image(pixels), lang=lang)
             text = text.strip()
 
             logger.info(f"스크린샷 OCR: {len(text)} 문자")
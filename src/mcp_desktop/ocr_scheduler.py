@@ -0,0 +1,306 @@
+"""
+OCR 작업 스케줄러
+모든 화면 OCR을 타일 단위 작업으로 받아 우선순위에 따라 처리
+(대화형 조회 > 타겟 검색 > 백그라운드 갱신)
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from .ocr import get_ocr_controller
+
+logger = logging.getLogger("mcp_desktop.ocr_scheduler")
+
+# 우선순위 (값이 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0  # 대기 중인 도구 호출을 위한 조회/인덱싱
+PRIORITY_TARGETED = 1  # 조기 종료 타겟 검색
+PRIORITY_BACKGROUND = 2  # 백그라운드 사전 인덱싱/갱신
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_TARGETED: "targeted",
+    PRIORITY_BACKGROUND: "background",
+}
+
+# 워커 스레드 수 환경 변수
+WORKERS_ENV = "MCP_DESKTOP_OCR_WORKERS"
+
+# 기본 워커 스레드 수 상한 (Tesseract는 별도 프로세스로 실행되므로 CPU 코어 수에 맞춰 늘림)
+MAX_DEFAULT_WORKERS = 8
+
+# 큐에 남은 무효 항목(취소되었거나 우선순위가 올라가 다시 등록된 작업)이 이 수를 넘고
+# 유효 항목보다 많으면 큐를 다시 만듦
+COMPACT_MIN_STALE = 64
+
+# OCR 작업 키: (window_id, (x, y, width, height), lang)
+JobKey = Tuple[Optional[int], Tuple[int, int, int, int], str]
+
+
+class _Job:
+    """대기 중인 OCR 작업"""
+    
+    __slots__ = ("key", "priority", "future", "submitted_at", "waiters", "cancelled")
+    
+    def __init__(self, key: JobKey, priority: int):
+        self.key = key
+        self.priority = priority
+        self.future: Future = Future()
+        self.submitted_at = time.monotonic()
+        self.waiters = 1  # 이 작업을 기다리는 호출자 수 (중복 제거로 공유될 때 증가)
+        self.cancelled = False
+
+
+class OCRScheduler:
+    """OCR 작업 우선순위 스케줄러"""
+    
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Args:
+            workers: OCR을 수행할 워커 스레드 수 (None이면 환경 변수 또는 CPU 코어 수,
+                대화형 작업이 실행 중인 타일 하나 뒤에서 기다리지 않도록 최소 2)
+        """
+        if workers is None:
+            workers = int(os.environ.get(WORKERS_ENV) or min(MAX_DEFAULT_WORKERS, max(2, os.cpu_count() or 1)))
+        self.workers = max(1, workers)
+        self.ocr = get_ocr_controller()
+        if self.workers > 1:
+            # 여러 Tesseract 프로세스가 각자 모든 코어에 OpenMP 스레드를 띄우면 서로 느려지므로 1로 제한
+            self.ocr.set_thread_limit(1)
+        self._condition = threading.Condition()
+        self._heap: List[tuple] = []
+        self._pending: Dict[JobKey, _Job] = {}
+        # Future -> 대기 중인 작업 (cancel()에서 바로 찾기 위함)
+        self._by_future: Dict[Future, _Job] = {}
+        self._stale = 0  # 큐에 남은 무효 항목 수
+        self._sequence = itertools.count()
+        # 같은 우선순위 안에서는 윈도우별로 번갈아 처리 (가상 시간 기반 공정 큐)
+        self._window_rounds: Dict[Tuple[int, Optional[int]], int] = {}
+        self._served_round: Dict[int, int] = {}
+        self._threads: List[threading.Thread] = []
+        
+        self._submitted = {priority: 0 for priority in PRIORITY_NAMES}
+        self._completed = {priority: 0 for priority in PRIORITY_NAMES}
+        self._wait_seconds = {priority: 0.0 for priority in PRIORITY_NAMES}
+        self._deduplicated = 0
+        self._cancelled = 0
+        self._max_depth = 0
+    
+    def _ensure_workers(self):
+        """워커 스레드를 필요할 때 시작"""
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"mcp-ocr-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def submit(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        priority: int = PRIORITY_INTERACTIVE,
+        window_id: Optional[int] = None,
+        lang: str = "kor+eng",
+    ) -> Future:
+        """
+        화면 영역 OCR 작업 등록
+        
+        같은 윈도우의 같은 타일이 이미 대기 중이면 새 작업을 만들지 않고 기존 작업을 공유하며,
+        더 높은 우선순위로 요청되면 기존 작업의 우선순위를 올립니다.
+        
+        Args:
+            x: 시작 X 좌표
+            y: 시작 Y 좌표
+            width: 너비
+            height: 높이
+            priority: 우선순위 (PRIORITY_*)
+            window_id: 작업을 요청한 윈도우 ID (None이면 전체 화면)
+            lang: OCR 언어
+        
+        Returns:
+            extract_text_from_screenshot() 결과 딕셔너리를 돌려주는 Future
+        """
+        key = (window_id, (x, y, width, height), lang)
+        with self._condition:
+            self._ensure_workers()
+            job = self._pending.get(key)
+            if job is not None:
+                self._deduplicated += 1
+                job.waiters += 1
+                if priority < job.priority:
+                    self._submitted[job.priority] -= 1
+                    self._submitted[priority] += 1
+                    job.priority = priority
+                    self._stale += 1  # 이전 우선순위의 항목
+                    self._push(job)
+                    self._compact()
+                return job.future
+            
+            job = _Job(key, priority)
+            self._pending[key] = job
+            self._by_future[job.future] = job
+            self._submitted[priority] += 1
+            self._push(job)
+            self._max_depth = max(self._max_depth, len(self._pending))
+            self._condition.notify()
+            return job.future
+    
+    def cancel(self, future: Future) -> bool:
+        """
+        대기 중인 작업 취소 요청
+        
+        같은 작업을 기다리는 다른 호출자가 있으면 작업은 그대로 두고 대기자 수만 줄입니다.
+        
+        Args:
+            future: submit()이 반환한 Future
+        
+        Returns:
+            작업이 실제로 큐에서 제거되었는지 여부
+        """
+        with self._condition:
+            job = self._by_future.get(future)
+            if job is None:
+                return False
+            job.waiters -= 1
+            if job.waiters > 0:
+                return False
+            # 큐의 항목은 _pop()에서 건너뛰도록 표시만 하고 남은 무효 항목이 많아지면 한 번에 정리
+            job.cancelled = True
+            del self._pending[job.key]
+            del self._by_future[future]
+            self._stale += 1
+            self._cancelled += 1
+            future.cancel()
+            self._compact()
+            return True
+    
+    def _push(self, job: _Job):
+        """작업을 큐에 추가 (같은 우선순위 안에서는 윈도우별 라운드 순서)"""
+        window_key = (job.priority, job.key[0])
+        served = self._served_round.get(job.priority, 0)
+        job_round = max(self._window_rounds.get(window_key, 0), served) + 1
+        self._window_rounds[window_key] = job_round
+        heapq.heappush(self._heap, (job.priority, job_round, next(self._sequence), job))
+    
+    @staticmethod
+    def _is_live(priority: int, job: _Job) -> bool:
+        """큐 항목이 아직 처리할 작업인지 (취소되었거나 이전 우선순위 항목이면 False)"""
+        return not job.cancelled and job.priority == priority
+    
+    def _compact(self):
+        """무효 항목이 유효 항목보다 많아지면 큐를 다시 만듦 (호출자가 condition을 잡고 있어야 함)"""
+        if self._stale < COMPACT_MIN_STALE or self._stale * 2 < len(self._heap):
+            return
+        live = [entry for entry in self._heap if self._is_live(entry[0], entry[3])]
+        heapq.heapify(live)
+        self._heap = live
+        self._stale = 0
+    
+    def _pop(self) -> Optional[_Job]:
+        """가장 우선순위가 높은 유효한 작업 꺼내기 (호출자가 condition을 잡고 있어야 함)"""
+        while self._heap:
+            priority, job_round, _, job = heapq.heappop(self._heap)
+            # 우선순위가 올라가 다시 등록된 작업의 이전 항목, 취소된 작업은 건너뜀
+            if not self._is_live(priority, job):
+                self._stale = max(0, self._stale - 1)
+                continue
+            self._served_round[priority] = max(self._served_round.get(priority, 0), job_round)
+            del self._pending[job.key]
+            del self._by_future[job.future]
+            return job
+        return None
+    
+    def _worker(self):
+        """워커 루프"""
+        while True:
+            with self._condition:
+                job = self._pop()
+                while job is None:
+                    self._condition.wait()
+                    job = self._pop()
+            
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            
+            waited = time.monotonic() - job.submitted_at
+            window_id, (x, y, width, height), lang = job.key
+            try:
+                result = self.ocr.extract_text_from_screenshot(
+                    x=x,
+                    y=y,
+                    width=width,
+                    height=height,
+                    lang=lang,
+                )
+                job.future.set_result(result)
+            except Exception as e:
+                logger.error(f"OCR 작업 실패: {e}", exc_info=True)
+                job.future.set_exception(e)
+            
+            with self._condition:
+                self._completed[job.priority] += 1
+                self._wait_seconds[job.priority] += waited
+    
+    def ocr_region(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        priority: int = PRIORITY_INTERACTIVE,
+        window_id: Optional[int] = None,
+        lang: str = "kor+eng",
+    ) -> dict:
+        """
+        화면 영역 OCR 작업을 등록하고 결과를 기다림
+        
+        Returns:
+            extract_text_from_screenshot() 결과 딕셔너리
+        """
+        return self.submit(x, y, width, height, priority, window_id, lang).result()
+    
+    def get_stats(self) -> dict:
+        """
+        큐 깊이와 처리 통계
+        
+        Returns:
+            우선순위별 대기/완료 작업 수, 평균 대기 시간, 중복 제거 횟수를 포함한 딕셔너리
+        """
+        with self._condition:
+            depth = {name: 0 for name in PRIORITY_NAMES.values()}
+            for job in self._pending.values():
+                depth[PRIORITY_NAMES[job.priority]] += 1
+            return {
+                "success": True,
+                "workers": self.workers,
+                "queue_depth": depth,
+                "max_queue_depth": self._max_depth,
+                "submitted": {PRIORITY_NAMES[p]: n for p, n in self._submitted.items()},
+                "completed": {PRIORITY_NAMES[p]: n for p, n in self._completed.items()},
+                "avg_wait_ms": {
+                    PRIORITY_NAMES[p]: round(self._wait_seconds[p] / n * 1000, 2) if n else 0.0
+                    for p, n in self._completed.items()
+                },
+                "deduplicated": self._deduplicated,
+                "cancelled": self._cancelled,
+            }
+
+
+# 전역 인스턴스
+_ocr_scheduler = None
+
+
+def get_ocr_scheduler() -> OCRScheduler:
+    """OCR 스케줄러 싱글톤 인스턴스 반환"""
+    global _ocr_scheduler
+    if _ocr_scheduler is None:
+        _ocr_scheduler = OCRScheduler()
+    return _ocr_scheduler
@@ -0,0 +1,139 @@
+"""
+MCP 진행 상황 알림 모듈
+인덱싱 중 처리한 타일 수와 찾은 텍스트 영역 수를 MCP progress 알림으로 전송하여,
+클라이언트가 긴 OCR 작업을 멈춘 것으로 오인하지 않고 부분 결과를 활용할 수 있도록 함
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("mcp_desktop.progress")
+
+# 알림 최소 간격 (초) - 마지막 타일 알림은 항상 전송
+MIN_INTERVAL = 0.1
+
+# 알림 하나에 포함할 최대 텍스트 영역 수 (stream_regions 사용 시)
+MAX_REGIONS_PER_NOTIFICATION = 20
+
+# 진행 콜백: 타일 하나를 처리할 때마다 {"done", "total", "regions": 새로 찾은 TextRegion 목록}으로 호출
+ProgressCallback = Callable[[dict], None]
+
+
+class ProgressReporter:
+    """
+    MCP 진행 상황 알림 전송기
+    
+    워커 스레드에서 호출되는 진행 콜백을 이벤트 루프의 progress 알림으로 전달합니다.
+    ScreenIndexer의 progress 인자로 그대로 넘길 수 있습니다.
+    """
+    
+    def __init__(
+        self,
+        session: Any,
+        progress_token: Any,
+        loop: asyncio.AbstractEventLoop,
+        stream_regions: bool = False,
+        min_interval: float = MIN_INTERVAL,
+        request_id: Any = None,
+    ):
+        """
+        Args:
+            session: MCP 서버 세션 (send_progress_notification 제공)
+            progress_token: 요청의 progressToken
+            loop: 알림을 보낼 이벤트 루프
+            stream_regions: 새로 찾은 텍스트 영역을 알림 메시지에 포함할지 여부
+            min_interval: 알림 최소 간격 (초)
+            request_id: 알림과 연결할 요청 ID
+        """
+        self.session = session
+        self.progress_token = progress_token
+        self.loop = loop
+        self.stream_regions = stream_regions
+        self.min_interval = min_interval
+        self.request_id = request_id
+        self._lock = threading.Lock()
+        self._regions_found = 0
+        self._pending_regions: list = []
+        self._last_sent = 0.0
+    
+    @classmethod
+    def from_request_context(cls, server: Any, stream_regions: bool = False) -> Optional["ProgressReporter"]:
+        """
+        현재 MCP 요청 컨텍스트에서 진행 알림 전송기 생성
+        
+        Args:
+            server: mcp.server.Server 인스턴스
+            stream_regions: 새로 찾은 텍스트 영역을 알림 메시지에 포함할지 여부
+        
+        Returns:
+            ProgressReporter (클라이언트가 progressToken을 보내지 않았으면 None)
+        """
+        try:
+            ctx = server.request_context
+        except LookupError:
+            return None
+        meta = getattr(ctx, "meta", None)
+        progress_token = getattr(meta, "progressToken", None) if meta is not None else None
+        if progress_token is None:
+            return None
+        return cls(
+            ctx.session,
+            progress_token,
+            asyncio.get_running_loop(),
+            stream_regions,
+            request_id=getattr(ctx, "request_id", None),
+        )
+    
+    def __call__(self, event: dict):
+        """
+        진행 이벤트 처리 (스레드 안전)
+        
+        Args:
+            event: done, total, regions(이번 타일에서 새로 찾은 TextRegion 목록)를 포함한 딕셔너리
+        """
+        done = event["done"]
+        total = event["total"]
+        new_regions = event.get("regions") or []
+        with self._lock:
+            self._regions_found += len(new_regions)
+            if self.stream_regions:
+                self._pending_regions.extend(new_regions)
+            now = time.monotonic()
+            if done < total and now - self._last_sent < self.min_interval:
+                return
+            self._last_sent = now
+            message = self._build_message(done, total)
+        
+        coroutine = self.session.send_progress_notification(
+            self.progress_token,
+            done,
+            total=total,
+            message=message,
+            related_request_id=self.request_id,
+        )
+        try:
+            asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        except RuntimeError as e:
+            # 이벤트 루프가 이미 종료된 경우 (요청이 끝난 뒤 늦게 도착한 이벤트)
+            coroutine.close()
+            logger.debug(f"진행 알림 전송 실패: {e}")
+    
+    def _build_message(self, done: int, total: int) -> str:
+        """알림 메시지 생성 (호출자가 lock을 잡고 있어야 함)"""
+        summary = f"{done}/{total}개 타일, 텍스트 영역 {self._regions_found}개"
+        if not self.stream_regions or not self._pending_regions:
+            return summary
+        regions = [
+            {
+                "text": region.text,
+                "center_x": region.center_x,
+                "center_y": region.center_y,
+            }
+            for region in self._pending_regions[:MAX_REGIONS_PER_NOTIFICATION]
+        ]
+        self._pending_regions = self._pending_regions[MAX_REGIONS_PER_NOTIFICATION:]
+        return json.dumps({"summary": summary, "regions": regions}, ensure_ascii=False)
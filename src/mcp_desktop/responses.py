@@ -0,0 +1,268 @@
+"""
+도구 응답 형태 조정 모듈
+도구 결과를 압축된 JSON으로 직렬화하고, 필드 선택, 열 기반(columnar) 목록 인코딩,
+바이트 예산 초과 시 서버 측 절단과 나머지를 이어받는 커서를 제공하여 LLM 컨텍스트 소모를 줄임
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("mcp_desktop.responses")
+
+# 응답 최대 크기 환경 변수 (바이트, UTF-8 기준)
+MAX_BYTES_ENV = "MCP_DESKTOP_MAX_RESPONSE_BYTES"
+
+# 기본 응답 최대 크기 (바이트, 대략 토큰 수 x 4)
+DEFAULT_MAX_BYTES = 16000
+
+# 목록을 열 기반으로 인코딩할 최소 행 수
+COLUMNAR_MIN_ROWS = 2
+
+# 이어받기 커서 보관 시간 (초) 및 최대 개수
+CURSOR_TTL = 300.0
+MAX_CURSORS = 64
+
+# 도구 공통 응답 형태 인자
+RESPONSE_PROPERTIES = {
+    "fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "목록 항목(regions 등)에 포함할 필드 (선택적, 예: ['text', 'center_x', 'center_y'])",
+    },
+    "columnar": {
+        "type": "boolean",
+        "default": False,
+        "description": "목록을 {columns, rows} 형태로 인코딩할지 여부 (큰 regions 목록의 크기를 줄일 때 사용)",
+    },
+    "max_bytes": {
+        "type": "integer",
+        "description": "응답 최대 크기 (바이트, 선택적). 넘으면 목록을 자르고 next_cursor로 나머지를 제공합니다.",
+    },
+}
+
+
+def encode(value: Any) -> str:
+    """압축된 JSON 문자열로 직렬화 (공백 없음, 한글 그대로)"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _is_record_list(value: Any) -> bool:
+    """딕셔너리로만 이루어진 목록인지 확인"""
+    return isinstance(value, list) and bool(value) and all(isinstance(item, dict) for item in value)
+
+
+def project(value: Any, fields: Optional[Sequence[str]]) -> Any:
+    """
+    목록 항목의 필드 선택 (중첩된 목록까지 적용, 최상위 키는 유지)
+    
+    Args:
+        value: 도구 결과
+        fields: 남길 필드 이름 (None이면 그대로)
+    
+    Returns:
+        필드가 선택된 결과
+    """
+    if not fields:
+        return value
+    if _is_record_list(value):
+        return [{key: item[key] for key in fields if key in item} for item in value]
+    if isinstance(value, dict):
+        return {key: project(item, fields) for key, item in value.items()}
+    if isinstance(value, list):
+        return [project(item, fields) for item in value]
+    return value
+
+
+def to_columnar(value: Any) -> Any:
+    """
+    딕셔너리 목록을 {"columns": [...], "rows": [[...], ...]} 형태로 변환 (중첩된 목록까지 적용)
+    
+    항목마다 반복되던 키 이름이 한 번만 나타나므로 영역 목록이 크게 줄어듭니다.
+    """
+    if _is_record_list(value) and len(value) >= COLUMNAR_MIN_ROWS:
+        columns: List[str] = []
+        for item in value:
+            for key in item:
+                if key not in columns:
+                    columns.append(key)
+        return {
+            "columns": columns,
+            "rows": [[to_columnar(item.get(key)) for key in columns] for item in value],
+        }
+    if isinstance(value, dict):
+        return {key: to_columnar(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_columnar(item) for item in value]
+    return value
+
+
+def _size(value: Any) -> int:
+    """압축 JSON의 UTF-8 바이트 수"""
+    return len(encode(value).encode("utf-8"))
+
+
+class ResponseShaper:
+    """도구 응답 형태 조정기 (스레드 안전)"""
+    
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        Args:
+            max_bytes: 기본 응답 최대 크기 (None이면 환경 변수 또는 DEFAULT_MAX_BYTES)
+        """
+        self.max_bytes = max_bytes or int(os.environ.get(MAX_BYTES_ENV) or DEFAULT_MAX_BYTES)
+        self._lock = threading.Lock()
+        self._cursors: "OrderedDict[str, Tuple[float, str, list]]" = OrderedDict()
+        
+        self._responses = 0
+        self._truncated = 0
+        self._bytes_out = 0
+    
+    def shape(
+        self,
+        result: Any,
+        fields: Optional[Sequence[str]] = None,
+        columnar: bool = False,
+        max_bytes: Optional[int] = None,
+    ) -> str:
+        """
+        도구 결과를 응답 문자열로 변환
+        
+        Args:
+            result: 도구 결과 딕셔너리
+            fields: 목록 항목에 남길 필드 (None이면 전체)
+            columnar: 목록을 열 기반으로 인코딩할지 여부
+            max_bytes: 응답 최대 크기 (None이면 기본값)
+        
+        Returns:
+            압축된 JSON 문자열 (예산을 넘으면 가장 큰 최상위 목록을 자르고 next_cursor 추가)
+        """
+        budget = max_bytes or self.max_bytes
+        value = project(result, fields)
+        render = to_columnar if columnar else (lambda item: item)
+        
+        text = encode(render(value))
+        truncated = False
+        if len(text.encode("utf-8")) > budget and isinstance(value, dict):
+            text, truncated = self._truncate(value, render, budget)
+        
+        with self._lock:
+            self._responses += 1
+            self._truncated += int(truncated)
+            self._bytes_out += len(text.encode("utf-8"))
+        return text
+    
+    def _truncate(self, value: dict, render, budget: int) -> Tuple[str, bool]:
+        """
+        가장 큰 최상위 목록을 예산에 맞게 자르고 나머지를 커서로 보관
+        
+        이어받기가 항상 진행되도록 한 행만으로 예산을 넘더라도 최소 한 행은 보내며,
+        목록에 한 행만 남았으면 자르지 않고 그대로 보냅니다.
+        """
+        lists = [(key, item) for key, item in value.items() if isinstance(item, list) and len(item) > 1]
+        if not lists:
+            return encode(render(value)), False
+        key, rows = max(lists, key=lambda entry: _size(entry[1]))
+        
+        def page(count: int, cursor: str) -> dict:
+            return {
+                **value,
+                key: rows[:count],
+                "truncated": True,
+                "returned": count,
+                "remaining": len(rows) - count,
+                "next_cursor": cursor,
+            }
+        
+        # 예산 안에 들어가는 최대 행 수 (이진 탐색, 최소 1행, 커서 길이는 실제 값과 같게 맞춤)
+        placeholder = uuid.uuid4().hex
+        low, high = 1, len(rows) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if _size(render(page(middle, placeholder))) <= budget:
+                low = middle
+            else:
+                high = middle - 1
+        
+        cursor = self._store(key, rows[low:])
+        return encode(render(page(low, cursor))), True
+    
+    def _store(self, key: str, rows: list) -> str:
+        """잘린 나머지 행 보관"""
+        cursor = uuid.uuid4().hex
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self._cursors[cursor] = (now, key, rows)
+            while len(self._cursors) > MAX_CURSORS:
+                self._cursors.popitem(last=False)
+        return cursor
+    
+    def _expire(self, now: float):
+        """만료된 커서 제거 (호출자가 lock을 잡고 있어야 함)"""
+        while self._cursors:
+            cursor, (created, _, _) = next(iter(self._cursors.items()))
+            if now - created <= CURSOR_TTL:
+                break
+            del self._cursors[cursor]
+    
+    def resume(self, cursor: str) -> dict:
+        """
+        잘린 응답의 나머지 가져오기 (커서는 한 번만 사용 가능)
+        
+        Args:
+            cursor: 이전 응답의 next_cursor
+        
+        Returns:
+            나머지 행을 원래 키로 담은 결과 딕셔너리 (다시 예산을 넘으면 shape()가 새 커서를 만듦)
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._cursors.pop(cursor, None)
+        if entry is None:
+            return {"success": False, "error": f"만료되었거나 알 수 없는 커서입니다: {cursor}"}
+        _, key, rows = entry
+        return {"success": True, key: rows, "count": len(rows)}
+    
+    def get_stats(self) -> dict:
+        """
+        응답 크기 통계
+        
+        Returns:
+            응답 수, 잘린 응답 수, 출력 바이트를 포함한 딕셔너리
+        """
+        with self._lock:
+            return {
+                "success": True,
+                "max_bytes": self.max_bytes,
+                "responses": self._responses,
+                "truncated": self._truncated,
+                "bytes_out": self._bytes_out,
+                "open_cursors": len(self._cursors),
+            }
+
+
+def response_options(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """도구 인자에서 응답 형태 옵션 추출"""
+    return {
+        "fields": arguments.get("fields"),
+        "columnar": arguments.get("columnar", False),
+        "max_bytes": arguments.get("max_bytes"),
+    }
+
+
+# 전역 인스턴스
+_response_shaper = None
+
+
+def get_response_shaper() -> ResponseShaper:
+    """응답 형태 조정기 싱글톤 인스턴스 반환"""
+    global _response_shaper
+    if _response_shaper is None:
+        _response_shaper = ResponseShaper()
+    return _response_shaper
@@ -3,14 +3,23 @@
 화면을 분할하고 OCR을 수행하여 텍스트와 위치 정보를 인덱싱
 """
 
+import asyncio
+import base64
+import json
 import logging
-from typing import List, Dict, Optional
+import threading
+import time
+import uuid
+from typing import AsyncIterator, Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import sqlite3
 from pathlib import Path
 
+from .cancellation import CancellationToken, OperationCancelled
 from .ocr import get_ocr_controller, TESSERACT_AVAILABLE
+from .ocr_scheduler import get_ocr_scheduler, PRIORITY_INTERACTIVE
+from .progress import ProgressCallback
 from .screenshot import get_screenshot_controller
 from .window import get_window_controller
 
@@ -30,6 +39,73 @@ class TextRegion:
     confidence: float = 0.0
 
 
+# 타일 좌표 (x, y, width, height) - 화면 좌표 기준
+Tile = Tuple[int, int, int, int]
+
+# find_text 기본 페이지 크기
+DEFAULT_FIND_LIMIT = 10
+
+# 프로세스별 커서 구분자 (인덱스 버전은 프로세스마다 0부터 다시 세므로 재시작 전 커서와 구분)
+CURSOR_EPOCH = uuid.uuid4().hex[:12]
+
+
+def _encode_cursor(state: dict) -> str:
+    """페이지 커서 생성 (조회 조건, 인덱스 버전, 위치, 발급한 프로세스를 담은 불투명 문자열)"""
+    payload = json.dumps({**state, "p": CURSOR_EPOCH}, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, query: dict, version: str) -> dict:
+    """
+    페이지 커서 해석
+    
+    Args:
+        cursor: _encode_cursor()로 만든 문자열
+        query: 현재 조회 조건 (커서를 만든 조회와 같아야 함)
+        version: 현재 인덱스 버전
+    
+    Returns:
+        커서 상태 딕셔너리 (잘못되었거나 인덱스가 바뀌었거나 다른 서버 프로세스가 발급했으면 success=False)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        return {"success": False, "error": "잘못된 커서입니다."}
+    if not isinstance(state, dict) or any(state.get(key) != value for key, value in query.items()):
+        return {"success": False, "error": "커서가 현재 조회 조건과 맞지 않습니다."}
+    if state.get("p") != CURSOR_EPOCH:
+        return {
+            "success": False,
+            "stale": True,
+            "error": "서버가 다시 시작되어 커서를 사용할 수 없습니다. 처음 페이지부터 다시 조회하세요.",
+        }
+    if state.get("v") != version:
+        return {
+            "success": False,
+            "stale": True,
+            "error": "커서를 발급한 뒤 인덱스가 바뀌었습니다. 처음 페이지부터 다시 조회하세요.",
+        }
+    return state
+
+
+def text_matches(text: str, search_text: str, exact_match: bool = False) -> bool:
+    """
+    인덱싱된 텍스트가 검색어와 일치하는지 판단 (find_text의 SQL 조건과 동일한 의미)
+    
+    Args:
+        text: 인덱싱된 텍스트
+        search_text: 검색할 텍스트
+        exact_match: 정확히 일치하는지 여부 (False면 대소문자 무시 부분 일치)
+    
+    Returns:
+        일치 여부
+    """
+    if exact_match:
+        return text == search_text
+    return search_text.casefold() in text.casefold()
+
+
 class ScreenIndexer:
     """화면 인덱서"""
     
@@ -40,10 +116,20 @@ class ScreenIndexer:
         """
         self.grid_size = grid_size
         self.ocr = get_ocr_controller()
+        self.scheduler = get_ocr_scheduler()
         self.screenshot = get_screenshot_controller()
         self.window = get_window_controller()
         self._db_path = Path.home() / ".mcp_desktop" / "screen_index.db"
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        # 이 프로세스에서 저장한 인덱스 세대 정보 (window_id별 영역, 그리드 크기, 캡처 시각)
+        self._generations: Dict[Optional[int], dict] = {}
+        # 세대 교체(삭제 + 추가)가 다른 스레드의 쓰기와 섞이지 않도록 보호
+        self._write_lock = threading.RLock()
+        # (전체 세대, window_id별 인덱스 버전) - 행이 바뀔 때마다 증가, 페이지 커서의 스냅샷 확인용.
+        # 바뀔 때마다 새 튜플로 교체하므로 get_version()은 쓰기 잠금 없이 한 번에 읽을 수 있음
+        self._version_state: Tuple[int, Dict[Optional[int], int]] = (0, {})
+        # window_id별 텍스트 집계 캐시 (버전, 집계 결과)
+        self._text_counts: Dict[Optional[int], Tuple[str, List[dict]]] = {}
         self._init_db()
     
     def _init_db(self):
@@ -83,12 +169,24 @@ class ScreenIndexer:
         conn.commit()
         conn.close()
     
-    def index_screen(self, grid_size: Optional[int] = None) -> dict:
+    def index_screen(
+        self,
+        grid_size: Optional[int] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        token: Optional[CancellationToken] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> dict:
         """
         화면을 인덱싱 (분할 + OCR)
         
+        취소되거나 마감 시간이 지나면 그때까지 OCR한 타일만 저장하고
+        partial=True 결과를 반환합니다.
+        
         Args:
             grid_size: 그리드 크기 (None이면 기본값 사용)
+            priority: OCR 작업 우선순위 (ocr_scheduler.PRIORITY_*)
+            token: 취소 토큰 (타일 사이마다 확인)
+            progress: 진행 콜백 (타일마다 호출)
         
         Returns:
             인덱싱 결과 딕셔너리
@@ -100,100 +198,61 @@ class ScreenIndexer:
             grid_size = grid_size or self.grid_size
             
             # 화면 크기 조회
-            screen_info = self.screenshot.get_screen_size()
-            if not screen_info.get("success"):
-                return {"success": False, "error": "화면 크기 조회 실패"}
-            
-            width = screen_info["width"]
-            height = screen_info["height"]
-            
-            # 이전 인덱스 삭제
-            self._clear_index()
+            area = self.get_index_area()
+            if not area.get("success"):
+                return area
             
-            # 화면을 그리드로 분할
-            regions = []
-            total_regions = 0
-            text_regions = []
+            width = area["width"]
+            height = area["height"]
             
-            for y in range(0, height, grid_size):
-                for x in range(0, width, grid_size):
-                    region_width = min(grid_size, width - x)
-                    region_height = min(grid_size, height - y)
-                    
-                    # 각 영역에 대해 OCR 수행
-                    ocr_result = self.ocr.extract_text_from_screenshot(
-                        x=x,
-                        y=y,
-                        width=region_width,
-                        height=region_height,
-                    )
-                    
-                    total_regions += 1
-                    
-                    if ocr_result.get("success") and ocr_result.get("text"):
-                        text = ocr_result["text"].strip()
-                        if text:
-                            center_x = x + region_width // 2
-                            center_y = y + region_height // 2
-                            
-                            region = TextRegion(
-                                text=text,
-                                x=x,
-                                y=y,
-                                width=region_width,
-                                height=region_height,
-                                center_x=center_x,
-                                center_y=center_y,
-                            )
-                            text_regions.append(region)
-                            regions.append(asdict(region))
+            # 화면을 그리드로 분할하여 각 영역에 대해 OCR 수행
+            captured_at = self.screenshot.frame_time()
+            tiles = self.plan_tiles(area, grid_size)
+            try:
+                text_regions = self._ocr_tiles(tiles, priority, token=token, progress=progress)
+            except OperationCancelled as e:
+                return self._store_partial(None, tiles, e)
+            regions = [asdict(region) for region in text_regions]
             
             # DB에 저장 (전체 화면이므로 window_id는 NULL)
-            timestamp = datetime.now().isoformat()
-            conn = sqlite3.connect(str(self._db_path))
-            for region in text_regions:
-                conn.execute("""
-                    INSERT INTO screen_regions 
-                    (timestamp, window_id, text, x, y, width, height, center_x, center_y, confidence)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    timestamp,
-                    None,  # 전체 화면 인덱스
-                    region.text,
-                    region.x,
-                    region.y,
-                    region.width,
-                    region.height,
-                    region.center_x,
-                    region.center_y,
-                    region.confidence,
-                ))
-            conn.commit()
-            conn.close()
+            timestamp = self.store_regions(None, text_regions, area, grid_size, captured_at)
             
-            logger.info(f"화면 인덱싱 완료: {total_regions}개 영역, {len(text_regions)}개 텍스트 영역")
+            logger.info(f"화면 인덱싱 완료: {len(tiles)}개 영역, {len(text_regions)}개 텍스트 영역")
             
             return {
                 "success": True,
-                "total_regions": total_regions,
+                "total_regions": len(tiles),
                 "text_regions": len(text_regions),
                 "timestamp": timestamp,
                 "grid_size": grid_size,
                 "screen_size": {"width": width, "height": height},
-                "regions": regions[:50],  # 처음 50개만 반환 (컨텍스트 절약)
+                "regions": regions,  # 응답 크기는 responses 모듈의 바이트 예산으로 제한
             }
         
         except Exception as e:
             logger.error(f"화면 인덱싱 실패: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
     
-    def index_window(self, hwnd: int, grid_size: Optional[int] = None) -> dict:
+    def index_window(
+        self,
+        hwnd: int,
+        grid_size: Optional[int] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        token: Optional[CancellationToken] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> dict:
         """
         특정 윈도우를 인덱싱 (분할 + OCR)
         
+        취소되거나 마감 시간이 지나면 그때까지 OCR한 타일만 저장하고
+        partial=True 결과를 반환합니다.
+        
         Args:
             hwnd: 윈도우 핸들
             grid_size: 그리드 크기 (None이면 기본값 사용)
+            priority: OCR 작업 우선순위 (ocr_scheduler.PRIORITY_*)
+            token: 취소 토큰 (타일 사이마다 확인)
+            progress: 진행 콜백 (타일마다 호출)
         
         Returns:
             인덱싱 결과 딕셔너리
@@ -205,155 +264,612 @@ class ScreenIndexer:
             grid_size = grid_size or self.grid_size
             
             # 윈도우 정보 조회
-            window_rect = self.window.get_window_rect(hwnd)
-            if not window_rect.get("success"):
-                return {"success": False, "error": f"윈도우 정보 조회 실패: {window_rect.get('error')}"}
-            
-            window_left = window_rect["left"]
-            window_top = window_rect["top"]
-            window_width = window_rect["width"]
-            window_height = window_rect["height"]
-            
-            # 해당 윈도우의 이전 인덱스 삭제
-            self._clear_index(window_id=hwnd)
+            area = self.get_index_area(hwnd)
+            if not area.get("success"):
+                return area
             
-            # 윈도우를 그리드로 분할
-            regions = []
-            total_regions = 0
-            text_regions = []
+            window_left = area["left"]
+            window_top = area["top"]
+            window_width = area["width"]
+            window_height = area["height"]
             
-            for y in range(0, window_height, grid_size):
-                for x in range(0, window_width, grid_size):
-                    region_width = min(grid_size, window_width - x)
-                    region_height = min(grid_size, window_height - y)
-                    
-                    # 화면 좌표로 변환 (윈도우 좌표 + 윈도우 위치)
-                    screen_x = window_left + x
-                    screen_y = window_top + y
-                    
-                    # 각 영역에 대해 OCR 수행
-                    ocr_result = self.ocr.extract_text_from_screenshot(
-                        x=screen_x,
-                        y=screen_y,
-                        width=region_width,
-                        height=region_height,
-                    )
-                    
-                    total_regions += 1
-                    
-                    if ocr_result.get("success") and ocr_result.get("text"):
-                        text = ocr_result["text"].strip()
-                        if text:
-                            center_x = screen_x + region_width // 2
-                            center_y = screen_y + region_height // 2
-                            
-                            region = TextRegion(
-                                text=text,
-                                x=screen_x,
-                                y=screen_y,
-                                width=region_width,
-                                height=region_height,
-                                center_x=center_x,
-                                center_y=center_y,
-                            )
-                            text_regions.append(region)
-                            regions.append(asdict(region))
+            # 윈도우를 그리드로 분할하여 각 영역에 대해 OCR 수행 (화면 좌표 기준)
+            captured_at = self.screenshot.frame_time()
+            tiles = self.plan_tiles(area, grid_size)
+            try:
+                text_regions = self._ocr_tiles(tiles, priority, window_id=hwnd, token=token, progress=progress)
+            except OperationCancelled as e:
+                return self._store_partial(hwnd, tiles, e)
+            regions = [asdict(region) for region in text_regions]
             
             # DB에 저장 (window_id는 hwnd)
-            timestamp = datetime.now().isoformat()
-            conn = sqlite3.connect(str(self._db_path))
-            for region in text_regions:
-                conn.execute("""
-                    INSERT INTO screen_regions 
-                    (timestamp, window_id, text, x, y, width, height, center_x, center_y, confidence)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    timestamp,
-                    hwnd,  # 윈도우 ID
-                    region.text,
-                    region.x,
-                    region.y,
-                    region.width,
-                    region.height,
-                    region.center_x,
-                    region.center_y,
-                    region.confidence,
-                ))
-            conn.commit()
-            conn.close()
+            timestamp = self.store_regions(hwnd, text_regions, area, grid_size, captured_at)
             
-            logger.info(f"윈도우 인덱싱 완료: hwnd={hwnd}, {total_regions}개 영역, {len(text_regions)}개 텍스트 영역")
+            logger.info(f"윈도우 인덱싱 완료: hwnd={hwnd}, {len(tiles)}개 영역, {len(text_regions)}개 텍스트 영역")
             
             return {
                 "success": True,
                 "hwnd": hwnd,
-                "total_regions": total_regions,
+                "total_regions": len(tiles),
                 "text_regions": len(text_regions),
                 "timestamp": timestamp,
                 "grid_size": grid_size,
                 "window_size": {"width": window_width, "height": window_height},
                 "window_position": {"left": window_left, "top": window_top},
-                "regions": regions[:50],  # 처음 50개만 반환 (컨텍스트 절약)
+                "regions": regions,  # 응답 크기는 responses 모듈의 바이트 예산으로 제한
             }
         
         except Exception as e:
             logger.error(f"윈도우 인덱싱 실패: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
     
-    def find_text(self, search_text: str, exact_match: bool = False, window_id: Optional[int] = None) -> dict:
+    def get_index_area(self, window_id: Optional[int] = None) -> dict:
+        """
+        인덱싱 대상 영역 조회 (화면 좌표 기준)
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+        
+        Returns:
+            left, top, width, height를 포함한 딕셔너리
+        """
+        if window_id is not None:
+            window_rect = self.window.get_window_rect(window_id)
+            if not window_rect.get("success"):
+                return {"success": False, "error": f"윈도우 정보 조회 실패: {window_rect.get('error')}"}
+            return {
+                "success": True,
+                "left": window_rect["left"],
+                "top": window_rect["top"],
+                "width": window_rect["width"],
+                "height": window_rect["height"],
+            }
+        
+        screen_info = self.screenshot.get_screen_size()
+        if not screen_info.get("success"):
+            return {"success": False, "error": "화면 크기 조회 실패"}
+        return {
+            "success": True,
+            "left": 0,
+            "top": 0,
+            "width": screen_info["width"],
+            "height": screen_info["height"],
+        }
+    
+    def plan_tiles(
+        self,
+        area: dict,
+        grid_size: Optional[int] = None,
+        prior: Optional[Tuple[int, int]] = None,
+    ) -> List[Tile]:
+        """
+        인덱싱 영역을 그리드 타일로 분할
+        
+        Args:
+            area: get_index_area() 결과 (left, top, width, height)
+            grid_size: 그리드 크기 (None이면 기본값 사용)
+            prior: 우선 탐색할 화면 좌표 (예: 마지막으로 찾은 위치).
+                지정하면 이 좌표에 가까운 타일부터 정렬합니다.
+        
+        Returns:
+            타일 목록 (기본은 위→아래, 왼쪽→오른쪽 읽기 순서)
+        """
+        grid_size = grid_size or self.grid_size
+        left, top = area["left"], area["top"]
+        width, height = area["width"], area["height"]
+        
+        tiles = []
+        for y in range(0, height, grid_size):
+            for x in range(0, width, grid_size):
+                tiles.append((
+                    left + x,
+                    top + y,
+                    min(grid_size, width - x),
+                    min(grid_size, height - y),
+                ))
+        
+        if prior is not None:
+            prior_x, prior_y = prior
+            # 안정 정렬이므로 같은 거리의 타일은 읽기 순서를 유지
+            tiles.sort(key=lambda t: (t[0] + t[2] / 2 - prior_x) ** 2 + (t[1] + t[3] / 2 - prior_y) ** 2)
+        
+        return tiles
+    
+    @staticmethod
+    def _to_text_region(tile: Tile, ocr_result: dict) -> Optional[TextRegion]:
+        """
+        타일 OCR 결과를 텍스트 영역으로 변환
+        
+        Args:
+            tile: 타일 좌표 (x, y, width, height)
+            ocr_result: extract_text_from_screenshot() 결과
+        
+        Returns:
+            텍스트 영역 (텍스트가 없으면 None)
+        """
+        x, y, width, height = tile
+        if not (ocr_result.get("success") and ocr_result.get("text")):
+            return None
+        
+        text = ocr_result["text"].strip()
+        if not text:
+            return None
+        
+        return TextRegion(
+            text=text,
+            x=x,
+            y=y,
+            width=width,
+            height=height,
+            center_x=x + width // 2,
+            center_y=y + height // 2,
+        )
+    
+    def _ocr_tiles(
+        self,
+        tiles: List[Tile],
+        priority: int = PRIORITY_INTERACTIVE,
+        window_id: Optional[int] = None,
+        token: Optional[CancellationToken] = None,
+        progress: Optional[ProgressCallback] = None,
+        offset: int = 0,
+        total: Optional[int] = None,
+    ) -> List[TextRegion]:
+        """
+        여러 타일을 OCR 스케줄러에 한꺼번에 등록하고, 텍스트가 있는 영역만 반환
+        
+        Args:
+            tiles: 타일 목록
+            priority: OCR 작업 우선순위 (ocr_scheduler.PRIORITY_*)
+            window_id: 작업을 요청한 윈도우 ID (None이면 전체 화면)
+            token: 취소 토큰 (None이면 취소하지 않음)
+            progress: 진행 콜백 (타일마다 호출)
+            offset: 진행 콜백에 보고할 이미 처리된 타일 수 (배치 단위 호출 시)
+            total: 진행 콜백에 보고할 전체 타일 수 (None이면 len(tiles))
+        
+        Returns:
+            텍스트 영역 목록 (타일 순서 유지)
+        
+        Raises:
+            OperationCancelled: 취소된 경우. 남은 타일 작업은 큐에서 제거되고,
+                예외의 partial/done에 완료된 타일의 결과가 담깁니다.
+        """
+        futures = [
+            (tile, self.scheduler.submit(*tile, priority=priority, window_id=window_id))
+            for tile in tiles
+        ]
+        text_regions = []
+        for done, (tile, future) in enumerate(futures):
+            try:
+                result = future.result() if token is None else token.wait_future(future)
+            except OperationCancelled as e:
+                for _, pending in futures[done:]:
+                    self.scheduler.cancel(pending)
+                raise OperationCancelled(e.reason, partial=text_regions, done=done)
+            region = self._to_text_region(tile, result)
+            if region is not None:
+                text_regions.append(region)
+            if progress is not None:
+                progress({
+                    "done": offset + done + 1,
+                    "total": total if total is not None else len(tiles),
+                    "regions": [region] if region is not None else [],
+                })
+        return text_regions
+    
+    def _store_partial(self, window_id: Optional[int], tiles: List[Tile], cancelled: OperationCancelled) -> dict:
+        """
+        취소된 인덱싱에서 완료된 타일의 결과만 저장하고 부분 결과 반환
+        
+        인덱스 세대는 갱신하지 않으므로 다음 조회 시 다시 인덱싱이 필요한 상태로 남습니다.
+        """
+        done_tiles = tiles[:cancelled.done]
+        self.merge_tiles(window_id, done_tiles, cancelled.partial)
+        logger.info(
+            f"인덱싱 중단 ({cancelled.reason}): window_id={window_id}, "
+            f"{len(done_tiles)}/{len(tiles)}개 타일 저장"
+        )
+        return {
+            "success": True,
+            "partial": True,
+            "cancel_reason": cancelled.reason,
+            "tiles_done": len(done_tiles),
+            "total_regions": len(tiles),
+            "text_regions": len(cancelled.partial),
+            "regions": [asdict(region) for region in cancelled.partial],
+        }
+    
+    def store_regions(
+        self,
+        window_id: Optional[int],
+        text_regions: List[TextRegion],
+        area: Optional[dict] = None,
+        grid_size: Optional[int] = None,
+        captured_at: Optional[float] = None,
+    ) -> str:
+        """
+        인덱싱 결과를 새 세대로 저장 (기존 인덱스는 삭제)
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+            text_regions: 저장할 텍스트 영역 목록
+            area: 인덱싱한 영역 (get_index_area() 결과)
+            grid_size: 인덱싱에 사용한 그리드 크기 (None이면 기본값)
+            captured_at: 인덱싱을 시작한 시각 (time.monotonic(), None이면 현재 시각)
+        
+        Returns:
+            저장된 세대의 타임스탬프
+        """
+        with self._write_lock:
+            # 이전 인덱스 삭제
+            self._clear_index(window_id=window_id)
+            
+            timestamp = datetime.now().isoformat()
+            self._write_regions(window_id, text_regions, timestamp)
+            self._generations[window_id] = {
+                "timestamp": timestamp,
+                "area": area,
+                "grid_size": grid_size or self.grid_size,
+                "captured_at": captured_at if captured_at is not None else time.monotonic(),
+            }
+            return timestamp
+    
+    def get_version(self, window_id: Optional[int] = None) -> str:
+        """
+        인덱스 버전 조회 (해당 윈도우의 행이 바뀔 때마다 달라짐)
+        
+        쓰기 잠금을 잡지 않으므로 이벤트 루프에서 호출해도 진행 중인 쓰기를 기다리지 않습니다.
+        버전 확인과 조회가 같은 세대여야 하면 호출자가 쓰기 잠금 안에서 호출합니다.
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+        
+        Returns:
+            버전 문자열
+        """
+        epoch, versions = self._version_state
+        return f"{epoch}.{versions.get(window_id, 0)}"
+    
+    def mark_changed(self, window_id: Optional[int] = None, all_windows: bool = False):
+        """
+        인덱스 버전 증가 (이전 버전의 페이지 커서와 집계 캐시 무효화)
+        
+        Args:
+            window_id: 행이 바뀐 윈도우 ID (None이면 전체 화면)
+            all_windows: True면 모든 윈도우의 버전 증가 (여러 윈도우의 행을 한 번에 삭제한 경우)
+        """
+        with self._write_lock:
+            epoch, versions = self._version_state
+            if all_windows:
+                self._version_state = (epoch + 1, {})
+                self._text_counts.clear()
+            else:
+                self._version_state = (epoch, {**versions, window_id: versions.get(window_id, 0) + 1})
+                self._text_counts.pop(window_id, None)
+    
+    def get_generation(self, window_id: Optional[int] = None) -> Optional[dict]:
+        """
+        이 프로세스에서 저장한 현재 인덱스 세대 정보 조회
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+        
+        Returns:
+            timestamp, area, grid_size, captured_at을 포함한 딕셔너리 (없으면 None)
+        """
+        return self._generations.get(window_id)
+    
+    def refresh_tiles(
+        self,
+        window_id: Optional[int],
+        tiles: List[Tile],
+        captured_at: Optional[float] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> int:
+        """
+        현재 인덱스 세대에서 지정한 타일만 다시 OCR하여 교체
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+            tiles: 다시 OCR할 타일 목록 (plan_tiles() 결과 중 일부)
+            captured_at: 갱신을 시작한 시각 (time.monotonic(), None이면 현재 시각)
+            priority: OCR 작업 우선순위 (ocr_scheduler.PRIORITY_*)
+        
+        Returns:
+            갱신된 타일에서 찾은 텍스트 영역 수
+        """
+        captured_at = captured_at if captured_at is not None else time.monotonic()
+        text_regions = self._ocr_tiles(tiles, priority, window_id)
+        
+        with self._write_lock:
+            timestamp = self.merge_tiles(window_id, tiles, text_regions)
+            generation = self._generations.get(window_id)
+            if generation is not None:
+                generation["timestamp"] = timestamp
+                generation["captured_at"] = captured_at
+        return len(text_regions)
+    
+    def merge_tiles(self, window_id: Optional[int], tiles: List[Tile], text_regions: List[TextRegion]) -> str:
+        """
+        지정한 타일의 기존 행을 새 OCR 결과로 교체 (나머지 타일은 유지)
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+            tiles: 교체할 타일 목록
+            text_regions: 해당 타일들의 텍스트 영역 목록
+        
+        Returns:
+            추가된 행의 타임스탬프
+        """
+        with self._write_lock:
+            conn = sqlite3.connect(str(self._db_path))
+            conn.executemany("""
+                DELETE FROM screen_regions
+                WHERE window_id IS ? AND x = ? AND y = ? AND width = ? AND height = ?
+            """, [(window_id, *tile) for tile in tiles])
+            conn.commit()
+            conn.close()
+            self.mark_changed(window_id)
+            
+            timestamp = datetime.now().isoformat()
+            self._write_regions(window_id, text_regions, timestamp)
+            return timestamp
+    
+    def _write_regions(self, window_id: Optional[int], text_regions: List[TextRegion], timestamp: str):
+        """텍스트 영역을 DB에 추가"""
+        conn = sqlite3.connect(str(self._db_path))
+        conn.executemany("""
+            INSERT INTO screen_regions 
+            (timestamp, window_id, text, x, y, width, height, center_x, center_y, confidence)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                timestamp,
+                window_id,
+                region.text,
+                region.x,
+                region.y,
+                region.width,
+                region.height,
+                region.center_x,
+                region.center_y,
+                region.confidence,
+            )
+            for region in text_regions
+        ])
+        conn.commit()
+        conn.close()
+        self.mark_changed(window_id)
+    
+    def iter_tile_batches(
+        self,
+        window_id: Optional[int] = None,
+        grid_size: Optional[int] = None,
+        prior: Optional[Tuple[int, int]] = None,
+        batch_size: int = 1,
+        priority: int = PRIORITY_INTERACTIVE,
+        token: Optional[CancellationToken] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Iterator[dict]:
+        """
+        타일 단위로 OCR을 수행하면서 배치별 결과를 순차적으로 반환 (동기 버전)
+        
+        DB에는 저장하지 않으므로, 호출자가 중간에 중단하거나 모두 모은 뒤 store_regions()로 저장합니다.
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+            grid_size: 그리드 크기 (None이면 기본값 사용)
+            prior: 우선 탐색할 화면 좌표 (plan_tiles 참고)
+            batch_size: 한 배치에 포함할 타일 수
+            priority: OCR 작업 우선순위 (ocr_scheduler.PRIORITY_*)
+            token: 취소 토큰 (배치 사이와 타일 대기 중에 확인)
+            progress: 진행 콜백 (타일마다 호출)
+        
+        Yields:
+            배치 결과 딕셔너리 (done, total, size, area, grid_size, captured_at, tiles, regions: TextRegion 목록)
+            실패 시 success=False 딕셔너리 하나를 반환하고 종료
+            (취소 시 cancelled=True, reason, done, total, 취소 전까지 완료된 타일의 regions 포함)
+        """
+        if not TESSERACT_AVAILABLE:
+            yield {"success": False, "error": "Tesseract OCR이 필요합니다."}
+            return
+        
+        area = self.get_index_area(window_id)
+        if not area.get("success"):
+            yield area
+            return
+        
+        grid_size = grid_size or self.grid_size
+        captured_at = self.screenshot.frame_time()
+        tiles = self.plan_tiles(area, grid_size, prior=prior)
+        size = {"width": area["width"], "height": area["height"]}
+        batch_size = max(1, batch_size)
+        
+        for start in range(0, len(tiles), batch_size):
+            batch = tiles[start:start + batch_size]
+            try:
+                regions = self._ocr_tiles(
+                    batch,
+                    priority,
+                    window_id,
+                    token,
+                    progress=progress,
+                    offset=start,
+                    total=len(tiles),
+                )
+            except OperationCancelled as e:
+                yield {
+                    "success": False,
+                    "cancelled": True,
+                    "reason": e.reason,
+                    "error": f"인덱싱 취소됨 ({e.reason})",
+                    "done": start + e.done,
+                    "total": len(tiles),
+                    "tiles": tiles[start:start + e.done],
+                    "regions": e.partial,
+                }
+                return
+            yield {
+                "success": True,
+                "done": start + len(batch),
+                "total": len(tiles),
+                "size": size,
+                "area": area,
+                "grid_size": grid_size,
+                "captured_at": captured_at,
+                "tiles": batch,
+                "regions": regions,
+            }
+    
+    async def stream_index(
+        self,
+        window_id: Optional[int] = None,
+        grid_size: Optional[int] = None,
+        prior: Optional[Tuple[int, int]] = None,
+        batch_size: int = 1,
+        priority: int = PRIORITY_INTERACTIVE,
+        token: Optional[CancellationToken] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> AsyncIterator[dict]:
         """
-        텍스트 검색하여 위치 반환
+        타일 단위 OCR 결과를 비동기 스트림으로 반환
+        
+        각 배치의 OCR은 워커 스레드에서 수행되므로 이벤트 루프를 막지 않으며,
+        소비자가 반복을 중단하면 남은 타일의 OCR도 수행되지 않습니다.
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+            grid_size: 그리드 크기 (None이면 기본값 사용)
+            prior: 우선 탐색할 화면 좌표 (plan_tiles 참고)
+            batch_size: 한 배치에 포함할 타일 수
+            priority: OCR 작업 우선순위 (ocr_scheduler.PRIORITY_*)
+            token: 취소 토큰 (None이면 스트림 자체의 취소만 처리)
+            progress: 진행 콜백 (타일마다 워커 스레드에서 호출)
+        
+        Yields:
+            iter_tile_batches()와 동일한 배치 결과 딕셔너리
+        """
+        # 소비자가 중단하거나 태스크가 취소되면 워커 스레드의 대기 중인 타일 OCR도 멈추도록 함
+        stream_token = CancellationToken(parent=token)
+        batches = self.iter_tile_batches(
+            window_id=window_id,
+            grid_size=grid_size,
+            prior=prior,
+            batch_size=batch_size,
+            priority=priority,
+            token=stream_token,
+            progress=progress,
+        )
+        try:
+            while True:
+                batch = await asyncio.to_thread(next, batches, None)
+                if batch is None:
+                    break
+                yield batch
+        finally:
+            stream_token.cancel()
+            try:
+                batches.close()
+            except ValueError:
+                # 워커 스레드가 아직 배치를 처리 중이면 취소를 확인한 뒤 스스로 종료
+                pass
+    
+    def get_last_known_position(
+        self,
+        search_text: str,
+        exact_match: bool = False,
+        window_id: Optional[int] = None,
+    ) -> Optional[Tuple[int, int]]:
+        """
+        이전 인덱스(만료된 인덱스 포함)에서 텍스트가 마지막으로 발견된 위치 조회
+        
+        Args:
+            search_text: 검색할 텍스트
+            exact_match: 정확히 일치하는지 여부
+            window_id: 윈도우 ID (None이면 전체 화면)
+        
+        Returns:
+            (center_x, center_y) 튜플, 없으면 None
+        """
+        result = self.find_text(search_text, exact_match=exact_match, window_id=window_id)
+        regions = result.get("regions") or []
+        if not regions:
+            return None
+        return (regions[0]["center_x"], regions[0]["center_y"])
+    
+    def find_text(
+        self,
+        search_text: str,
+        exact_match: bool = False,
+        window_id: Optional[int] = None,
+        limit: int = DEFAULT_FIND_LIMIT,
+        cursor: Optional[str] = None,
+        count_only: bool = False,
+    ) -> dict:
+        """
+        텍스트 검색하여 위치 반환 (최신 영역부터, 커서로 다음 페이지 조회)
         
         Args:
             search_text: 검색할 텍스트
             exact_match: 정확히 일치하는지 여부
             window_id: 윈도우 ID (None이면 전체 화면에서 검색)
+            limit: 페이지 크기
+            cursor: 이전 결과의 next_page_cursor (None이면 첫 페이지)
+            count_only: True면 영역 없이 일치하는 개수만 반환
         
         Returns:
-            찾은 텍스트 영역 정보
+            찾은 텍스트 영역 정보 (다음 페이지가 있으면 next_page_cursor 포함,
+            커서 발급 후 인덱스가 바뀌었으면 stale=True로 실패)
         """
         try:
-            conn = sqlite3.connect(str(self._db_path))
-            
-            if window_id is not None:
-                # 특정 윈도우에서 검색
-                if exact_match:
-                    cursor = conn.execute("""
-                        SELECT text, x, y, width, height, center_x, center_y, confidence, window_id
-                        FROM screen_regions
-                        WHERE text = ? AND window_id = ?
-                        ORDER BY timestamp DESC
-                        LIMIT 10
-                    """, (search_text, window_id))
-                else:
-                    cursor = conn.execute("""
-                        SELECT text, x, y, width, height, center_x, center_y, confidence, window_id
-                        FROM screen_regions
-                        WHERE text LIKE ? AND window_id = ?
-                        ORDER BY timestamp DESC
-                        LIMIT 10
-                    """, (f"%{search_text}%", window_id))
+            if exact_match:
+                condition, pattern = "text = ?", search_text
             else:
-                # 전체 화면에서 검색 (window_id가 NULL인 것만)
-                if exact_match:
-                    cursor = conn.execute("""
-                        SELECT text, x, y, width, height, center_x, center_y, confidence, window_id
-                        FROM screen_regions
-                        WHERE text = ? AND window_id IS NULL
-                        ORDER BY timestamp DESC
-                        LIMIT 10
-                    """, (search_text,))
-                else:
-                    cursor = conn.execute("""
-                        SELECT text, x, y, width, height, center_x, center_y, confidence, window_id
+                condition, pattern = "text LIKE ?", f"%{search_text}%"
+            query = {"k": "find", "q": search_text, "e": bool(exact_match), "w": window_id}
+            limit = max(1, int(limit))
+            
+            # 버전 확인과 조회 사이에 세대가 바뀌지 않도록 쓰기 잠금 안에서 조회
+            with self._write_lock:
+                version = self.get_version(window_id)
+                conn = sqlite3.connect(str(self._db_path))
+                try:
+                    if count_only:
+                        (count,) = conn.execute(f"""
+                            SELECT COUNT(*)
+                            FROM screen_regions
+                            WHERE {condition} AND window_id IS ?
+                        """, (pattern, window_id)).fetchone()
+                        return {
+                            "success": True,
+                            "search_text": search_text,
+                            "window_id": window_id,
+                            "version": version,
+                            "count": count,
+                        }
+                    
+                    keyset = ""
+                    params: list = [pattern, window_id]
+                    if cursor is not None:
+                        state = _decode_cursor(cursor, query, version)
+                        if not state.get("success", True):
+                            return state
+                        keyset = "AND (timestamp < ? OR (timestamp = ? AND id < ?))"
+                        params += [state["t"], state["t"], state["i"]]
+                    
+                    # 다음 페이지 존재 여부를 알기 위해 한 행 더 조회 (timestamp, id 기준 키셋 페이지네이션)
+                    rows = conn.execute(f"""
+                        SELECT text, x, y, width, height, center_x, center_y, confidence, window_id, timestamp, id
                         FROM screen_regions
-                        WHERE text LIKE ? AND window_id IS NULL
-                        ORDER BY timestamp DESC
-                        LIMIT 10
-                    """, (f"%{search_text}%",))
+                        WHERE {condition} AND window_id IS ? {keyset}
+                        ORDER BY timestamp DESC, id DESC
+                        LIMIT ?
+                    """, (*params, limit + 1)).fetchall()
+                finally:
+                    conn.close()
             
             results = []
-            for row in cursor.fetchall():
+            for row in rows[:limit]:
                 results.append({
                     "text": row[0],
                     "x": row[1],
@@ -366,64 +882,121 @@ class ScreenIndexer:
                     "window_id": row[8],
                 })
             
-            conn.close()
-            
-            return {
+            result = {
                 "success": True,
                 "search_text": search_text,
                 "window_id": window_id,
+                "version": version,
                 "count": len(results),
                 "regions": results,
             }
+            if len(rows) > limit:
+                last = rows[limit - 1]
+                result["next_page_cursor"] = _encode_cursor({**query, "v": version, "t": last[9], "i": last[10]})
+            return result
         
         except Exception as e:
             logger.error(f"텍스트 검색 실패: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
     
-    def get_indexed_texts(self, limit: int = 100, window_id: Optional[int] = None) -> dict:
+    def get_regions(self, window_id: Optional[int] = None) -> List[dict]:
         """
-        인덱싱된 텍스트 목록 조회
+        현재 인덱스의 모든 텍스트 영역 조회
         
         Args:
-            limit: 최대 반환 개수
+            window_id: 윈도우 ID (None이면 전체 화면)
+        
+        Returns:
+            TextRegion 필드를 가진 딕셔너리 목록
+        """
+        conn = sqlite3.connect(str(self._db_path))
+        if window_id is not None:
+            cursor = conn.execute("""
+                SELECT text, x, y, width, height, center_x, center_y, confidence
+                FROM screen_regions
+                WHERE window_id = ?
+                ORDER BY id
+            """, (window_id,))
+        else:
+            cursor = conn.execute("""
+                SELECT text, x, y, width, height, center_x, center_y, confidence
+                FROM screen_regions
+                WHERE window_id IS NULL
+                ORDER BY id
+            """)
+        regions = [asdict(TextRegion(*row)) for row in cursor.fetchall()]
+        conn.close()
+        return regions
+    
+    def get_indexed_texts(
+        self,
+        limit: int = 100,
+        window_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        count_only: bool = False,
+    ) -> dict:
+        """
+        인덱싱된 텍스트 목록 조회 (많이 나온 텍스트부터, 커서로 다음 페이지 조회)
+        
+        텍스트별 집계는 인덱스 버전마다 한 번만 계산하고, 이후 페이지는 집계 결과에서 잘라 반환합니다.
+        
+        Args:
+            limit: 페이지 크기
             window_id: 윈도우 ID (None이면 전체 화면에서 조회)
+            cursor: 이전 결과의 next_page_cursor (None이면 첫 페이지)
+            count_only: True면 목록 없이 고유 텍스트 수와 전체 영역 수만 반환
         
         Returns:
-            텍스트 목록
+            텍스트 목록 (다음 페이지가 있으면 next_page_cursor 포함,
+            커서 발급 후 인덱스가 바뀌었으면 stale=True로 실패)
         """
         try:
-            conn = sqlite3.connect(str(self._db_path))
+            query = {"k": "texts", "w": window_id}
+            limit = max(1, int(limit))
+            with self._write_lock:
+                version = self.get_version(window_id)
+                cached = self._text_counts.get(window_id)
+                if cached is None or cached[0] != version:
+                    conn = sqlite3.connect(str(self._db_path))
+                    rows = conn.execute("""
+                        SELECT text, COUNT(*) as count
+                        FROM screen_regions
+                        WHERE window_id IS ?
+                        GROUP BY text
+                        ORDER BY count DESC, text
+                    """, (window_id,)).fetchall()
+                    conn.close()
+                    cached = (version, [{"text": row[0], "count": row[1]} for row in rows])
+                    self._text_counts[window_id] = cached
+            texts = cached[1]
             
-            if window_id is not None:
-                # 특정 윈도우에서 조회
-                cursor = conn.execute("""
-                    SELECT DISTINCT text, COUNT(*) as count
-                    FROM screen_regions
-                    WHERE window_id = ?
-                    GROUP BY text
-                    ORDER BY count DESC, text
-                    LIMIT ?
-                """, (window_id, limit))
-            else:
-                # 전체 화면에서 조회 (window_id가 NULL인 것만)
-                cursor = conn.execute("""
-                    SELECT DISTINCT text, COUNT(*) as count
-                    FROM screen_regions
-                    WHERE window_id IS NULL
-                    GROUP BY text
-                    ORDER BY count DESC, text
-                    LIMIT ?
-                """, (limit,))
+            if count_only:
+                return {
+                    "success": True,
+                    "window_id": window_id,
+                    "version": version,
+                    "distinct_texts": len(texts),
+                    "total_regions": sum(item["count"] for item in texts),
+                }
             
-            texts = [{"text": row[0], "count": row[1]} for row in cursor.fetchall()]
-            conn.close()
+            offset = 0
+            if cursor is not None:
+                state = _decode_cursor(cursor, query, version)
+                if not state.get("success", True):
+                    return state
+                offset = state["o"]
             
-            return {
+            page = texts[offset:offset + limit]
+            result = {
                 "success": True,
                 "window_id": window_id,
-                "count": len(texts),
-                "texts": texts,
+                "version": version,
+                "count": len(page),
+                "texts": page,
             }
+            if offset + limit < len(texts):
+                result["next_page_cursor"] = _encode_cursor({**query, "v": version, "o": offset + limit})
+            return result
         
         except Exception as e:
             logger.error(f"텍스트 목록 조회 실패: {e}", exc_info=True)
@@ -444,6 +1017,7 @@ class ScreenIndexer:
                 conn.execute("DELETE FROM screen_regions WHERE window_id IS NULL")
             conn.commit()
             conn.close()
+            self.mark_changed(window_id)
         except Exception as e:
             logger.error(f"인덱스 초기화 실패: {e}")
     
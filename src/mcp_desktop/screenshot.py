@@ -2,50 +2,419 @@
 스크린샷 캡처 모듈
 """
 
-import pyautogui
 import base64
-from io import BytesIO
-from typing import Optional, Tuple
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
 from PIL import Image
 import logging
 
+import numpy as np
+
+from .capture import CaptureBackend, Region, create_backend, to_gray
+from .color_regions import Color, find_color_regions
+from .delta import DeltaTracker
+from .encoding import DEFAULT_PNG_COMPRESS_LEVEL, DEFAULT_QUALITY, EncodedImage, EncodeOptions, encode_image
+from .matching import TemplateCache, match_template
+from .utils import INPUT_DEVICE_LOCK, SingleFlight
+
 logger = logging.getLogger("mcp_desktop.screenshot")
 
+# 프레임 캐시 유효 시간 환경 변수 (초, 0이면 캐시 끔)
+FRAME_TTL_ENV = "MCP_DESKTOP_FRAME_TTL"
+
+# 기본 프레임 캐시 유효 시간 (초)
+DEFAULT_FRAME_TTL = 0.25
+
+# 돌려 쓰는 전체 화면 프레임 버퍼 수
+# grab_array()가 내준 뷰가 남아 있는 버퍼는 덮어쓰지 않고 그 자리에 새 버퍼를 할당합니다.
+FRAME_BUFFERS = 3
+
+# 이미지 인코딩 워커 스레드 수 환경 변수
+ENCODE_WORKERS_ENV = "MCP_DESKTOP_ENCODE_WORKERS"
+
+# 기본 이미지 인코딩 워커 스레드 수
+DEFAULT_ENCODE_WORKERS = 2
+
+# 한 번에 조회할 수 있는 최대 픽셀 수 (get_pixel_colors, sample_grid)
+MAX_PIXEL_SAMPLES = 10000
+
+
+def _sample_pixels(pixels: np.ndarray, xs: Sequence[int], ys: Sequence[int]) -> List[Optional[str]]:
+    """
+    프레임에서 여러 좌표의 색상을 한 번에 읽어 16진수 문자열 목록으로 반환
+    
+    Args:
+        pixels: 전체 화면 프레임 ((height, width, 3) uint8 배열)
+        xs: X 좌표 목록
+        ys: Y 좌표 목록 (xs와 같은 길이)
+    
+    Returns:
+        "#rrggbb" 목록 (화면 밖 좌표는 None)
+    """
+    height, width = pixels.shape[:2]
+    x_array = np.asarray(xs, dtype=np.int64)
+    y_array = np.asarray(ys, dtype=np.int64)
+    inside = (x_array >= 0) & (x_array < width) & (y_array >= 0) & (y_array < height)
+    # 화면 밖 좌표는 0으로 읽은 뒤 None으로 바꿈 (팬시 인덱싱 한 번으로 모든 점 조회)
+    rgb = pixels[np.where(inside, y_array, 0), np.where(inside, x_array, 0)].astype(np.uint32)
+    packed = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+    return [
+        f"#{value:06x}" if valid else None
+        for value, valid in zip(packed.tolist(), inside.tolist())
+    ]
+
+
+def _crop(array: np.ndarray, region: Optional[Region]) -> np.ndarray:
+    """프레임 배열에서 영역을 복사 없이 잘라낸 뷰 (화면 밖 부분은 제외)"""
+    if region is None:
+        return array
+    x, y, width, height = region
+    return array[max(0, y):max(0, y + height), max(0, x):max(0, x + width)]
+
+
+class _Borrow:
+    """
+    grab_array()가 내준 프레임 버퍼 뷰의 소유자
+    
+    반환하는 배열은 이 객체의 __array_interface__로 만들어 base가 이 객체가 되므로,
+    그 배열과 거기서 잘라낸 배열이 모두 사라질 때 이 객체도 사라집니다 (_FrameBuffer가 약한 참조로 추적).
+    """
+    
+    __slots__ = ("__array_interface__", "array", "__weakref__")
+    
+    def __init__(self, array: np.ndarray):
+        self.array = array
+        interface = dict(array.__array_interface__)
+        # 읽기 전용으로 내줌 (다른 호출자와 공유하는 버퍼)
+        interface["data"] = (interface["data"][0], True)
+        self.__array_interface__ = interface
+
+
+class _FrameBuffer:
+    """재사용하는 전체 화면 프레임 버퍼 (RGB와 필요할 때 계산하는 흑백)"""
+    
+    def __init__(self, width: int, height: int):
+        self.rgb = np.empty((height, width, 3), dtype=np.uint8)
+        self.gray = np.empty((height, width), dtype=np.uint8)
+        self.scratch = (np.empty((height, width), dtype=np.uint32), np.empty((height, width), dtype=np.uint32))
+        self.gray_ready = False
+        self.captured_at = 0.0
+        self.epoch = -1
+        # 다시 캡처할 때마다 증가 (캐시에서 꺼낸 뒤 뷰를 만들기 전에 버퍼가 재사용되었는지 확인)
+        self.generation = 0
+        # 아직 살아 있는 내준 뷰의 소유자
+        self._borrows: "weakref.WeakSet[_Borrow]" = weakref.WeakSet()
+    
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height)"""
+        return self.rgb.shape[1], self.rgb.shape[0]
+    
+    @property
+    def borrowed(self) -> bool:
+        """grab_array()가 내준 뷰가 아직 남아 있는지"""
+        return len(self._borrows) > 0
+    
+    def lend(self, array: np.ndarray) -> _Borrow:
+        """버퍼의 뷰를 내줄 소유자 등록 (소유자가 살아 있는 동안 이 버퍼는 다시 캡처에 쓰이지 않음)"""
+        borrow = _Borrow(array)
+        self._borrows.add(borrow)
+        return borrow
+
 
 class ScreenshotController:
     """스크린샷 제어 클래스"""
     
-    def capture_full_screen(self, format: str = "PNG") -> dict:
+    def __init__(self, frame_ttl: Optional[float] = None, backend: Optional[CaptureBackend] = None):
+        """
+        Args:
+            frame_ttl: 프레임 캐시 유효 시간 (초, None이면 환경 변수 또는 DEFAULT_FRAME_TTL, 0이면 끔)
+            backend: 캡처 백엔드 (None이면 MCP_DESKTOP_CAPTURE_BACKEND 또는 플랫폼 기본값)
+        """
+        if frame_ttl is None:
+            frame_ttl = float(os.environ.get(FRAME_TTL_ENV) or DEFAULT_FRAME_TTL)
+        self.frame_ttl = frame_ttl
+        self.backend = backend if backend is not None else create_backend()
+        # 동시에 캐시를 놓친 전체 화면 캡처는 한 번만 수행하고 결과 프레임을 공유
+        self._captures = SingleFlight()
+        # 돌려 쓰는 프레임 버퍼와 가장 최근 프레임
+        self._frame_lock = threading.Lock()
+        self._gray_lock = threading.Lock()
+        self._buffers: List[Optional[_FrameBuffer]] = [None] * FRAME_BUFFERS
+        self._next_buffer = 0
+        self._frame: Optional[_FrameBuffer] = None
+        self._frame_hits = 0
+        self._frame_misses = 0
+        self._allocations = 0
+        # 이미지 인코딩 워커 (처음 인코딩할 때 생성)
+        self._encoder: Optional[ThreadPoolExecutor] = None
+        self._encoder_lock = threading.Lock()
+        self._encodes = 0
+        self._encode_ms = 0.0
+        self._encoded_bytes = 0
+        # 델타 캡처용 키별 마지막 프레임
+        self.deltas = DeltaTracker()
+        # find_image 템플릿 피라미드 캐시
+        self.templates = TemplateCache()
+    
+    def _grab(self, region: Optional[Region] = None) -> Image.Image:
+        """
+        화면 캡처 (최근 전체 화면 프레임이 유효하면 그 프레임에서 잘라 반환)
+        
+        Args:
+            region: (x, y, width, height) 영역 (None이면 전체 화면)
+        
+        Returns:
+            PIL 이미지 (프레임 버퍼와 분리된 복사본)
+        """
+        return Image.fromarray(self.grab_array(region))
+    
+    def _valid_frame(self) -> Optional[_FrameBuffer]:
+        """유효한 캐시 프레임 (유효 시간이 지났거나 그 뒤 입력 동작이 있었으면 None, self._frame_lock을 잡고 호출)"""
+        frame = self._frame
+        if frame is None or self.frame_ttl <= 0:
+            return None
+        if time.monotonic() - frame.captured_at > self.frame_ttl or frame.epoch != INPUT_DEVICE_LOCK.epoch:
+            return None
+        return frame
+    
+    def _cached_frame(self) -> Optional[_FrameBuffer]:
+        """유효한 캐시 프레임 (없으면 None)"""
+        with self._frame_lock:
+            return self._valid_frame()
+    
+    def _lookup_frame(self) -> Optional[Tuple[_FrameBuffer, int]]:
+        """유효한 캐시 프레임과 그 세대 (없으면 None, 적중/실패 통계 기록)"""
+        with self._frame_lock:
+            frame = self._valid_frame()
+            if frame is None:
+                self._frame_misses += 1
+                return None
+            self._frame_hits += 1
+            return frame, frame.generation
+    
+    def _capture_frame(self) -> Tuple[_FrameBuffer, int]:
+        """다음 프레임 버퍼에 전체 화면을 새로 캡처하여 최근 프레임으로 저장 (프레임과 세대 반환)"""
+        # 캡처 전에 시각과 입력 세대를 기록 (캡처 도중 입력이 끝나면 다음 조회에서 무효)
+        captured_at = time.monotonic()
+        epoch = INPUT_DEVICE_LOCK.epoch
+        size = self.backend.screen_size()
+        with self._frame_lock:
+            index = self._next_buffer
+            self._next_buffer = (index + 1) % FRAME_BUFFERS
+            frame = self._buffers[index]
+            if frame is None or frame.size != size or frame.borrowed:
+                # 해상도가 바뀌었거나 내준 뷰가 아직 쓰이는 버퍼는 덮어쓰지 않고 새로 할당
+                # (이전 버퍼는 마지막 뷰가 사라질 때 해제됨)
+                frame = _FrameBuffer(*size)
+                self._buffers[index] = frame
+                self._allocations += 1
+            if self._frame is frame:
+                self._frame = None
+            frame.generation += 1
+            frame.gray_ready = False
+            generation = frame.generation
+        
+        self.backend.grab_into(frame.rgb)
+        with self._frame_lock:
+            frame.captured_at = captured_at
+            frame.epoch = epoch
+            if self._frame is None or self._frame.captured_at <= captured_at:
+                self._frame = frame
+        return frame, generation
+    
+    def _get_frame(self, fresh: bool = False) -> Tuple[_FrameBuffer, int]:
+        """전체 화면 프레임과 세대 (캐시가 유효하면 재사용, 아니면 새로 캡처)"""
+        if not fresh:
+            cached = self._lookup_frame()
+            if cached is not None:
+                return cached
+        else:
+            with self._frame_lock:
+                self._frame_misses += 1
+        captured, _ = self._captures.do(None, self._capture_frame)
+        return captured
+    
+    def _grab_region_array(self, region: Region, gray: bool) -> np.ndarray:
+        """요청한 영역만 새 배열로 캡처 (화면 밖 부분은 제외)"""
+        x, y, width, height = region
+        screen_width, screen_height = self.backend.screen_size()
+        left, top = max(0, x), max(0, y)
+        right, bottom = min(screen_width, x + width), min(screen_height, y + height)
+        width, height = max(0, right - left), max(0, bottom - top)
+        pixels = np.empty((height, width, 3), dtype=np.uint8)
+        if pixels.size:
+            self.backend.grab_into(pixels, (left, top, width, height))
+        return to_gray(pixels) if gray else pixels
+    
+    def grab_array(self, region: Optional[Region] = None, gray: bool = False, fresh: bool = False) -> np.ndarray:
+        """
+        화면 영역을 NumPy 배열로 캡처 (유효한 캐시 프레임이 있으면 복사 없이 그 프레임의 뷰를 반환)
+        
+        캐시 프레임이 없으면 영역 요청은 전체 화면 대신 그 영역만 새 배열로 캡처합니다.
+        프레임 버퍼의 뷰는 읽기 전용이며, 뷰가 남아 있는 동안 그 버퍼는 다음 캡처에 재사용되지 않으므로
+        반환된 배열의 내용은 바뀌지 않습니다. 오래 보관하면 그만큼 버퍼가 새로 할당됩니다.
+        
+        Args:
+            region: (x, y, width, height) 영역 (None이면 전체 화면, 화면 밖 부분은 제외)
+            gray: True면 OCR용 흑백 (height, width) 배열 (프레임마다 한 번만 변환)
+            fresh: True면 캐시를 무시하고 전체 화면을 새로 캡처 (새 프레임은 캐시에 저장)
+        
+        Returns:
+            (height, width, 3) 또는 (height, width) uint8 배열
+        """
+        while True:
+            if region is None or fresh:
+                frame, generation = self._get_frame(fresh)
+            else:
+                cached = self._lookup_frame()
+                if cached is None:
+                    # 유효한 캐시 프레임이 없으면 전체 화면을 캡처하지 않고 영역만 캡처
+                    return self._grab_region_array(region, gray)
+                frame, generation = cached
+            with self._frame_lock:
+                # 세대가 같을 때 등록한 소유자는 버퍼가 다음 캡처에 재사용되지 않도록 고정함
+                if frame.generation == generation:
+                    borrow = frame.lend(frame.rgb if gray else _crop(frame.rgb, region))
+                    break
+        
+        if gray:
+            # 흑백 변환 동안은 전체 RGB 소유자가 버퍼를 고정하고, 변환 뒤 흑백 뷰의 소유자로 바꿈
+            with self._gray_lock:
+                if not frame.gray_ready:
+                    to_gray(frame.rgb, out=frame.gray, scratch=frame.scratch)
+                    frame.gray_ready = True
+            with self._frame_lock:
+                borrow = frame.lend(_crop(frame.gray, region))
+        return np.asarray(borrow)
+    
+    def frame_time(self) -> float:
+        """
+        지금 캡처를 요청하면 받게 될 프레임의 캡처 시각 (time.monotonic())
+        
+        캐시된 프레임이 유효하면 그 프레임의 캡처 시각, 아니면 현재 시각입니다.
+        인덱스 세대의 captured_at을 실제 화면 시점보다 늦게 기록하지 않도록 캡처 전에 사용합니다.
+        """
+        if self.frame_ttl > 0:
+            frame = self._cached_frame()
+            if frame is not None:
+                return frame.captured_at
+        return time.monotonic()
+    
+    def invalidate_frame(self):
+        """캐시된 프레임 버리기"""
+        with self._frame_lock:
+            self._frame = None
+    
+    def encode(self, pixels: np.ndarray, options: Optional[EncodeOptions] = None) -> EncodedImage:
+        """
+        캡처 배열을 인코딩 워커 스레드에서 인코딩
+        
+        동시에 실행되는 인코딩 수를 워커 수(MCP_DESKTOP_ENCODE_WORKERS)로 제한하여
+        여러 캡처 요청이 몰려도 OCR과 캡처에 쓸 CPU를 남겨 둡니다.
+        프레임 버퍼는 인코딩 중에 덮어써질 수 있으므로 호출한 스레드에서 먼저 복사합니다.
+        
+        Args:
+            pixels: (height, width, 3) 또는 (height, width) uint8 배열 (grab_array 결과 등)
+            options: 인코딩 옵션
+        
+        Returns:
+            인코딩 결과
+        """
+        return self.encode_many([pixels], options)[0]
+    
+    def encode_many(self, arrays: Sequence[np.ndarray], options: Optional[EncodeOptions] = None) -> List[EncodedImage]:
+        """
+        여러 캡처 배열을 인코딩 워커 스레드에서 나눠 인코딩 (델타 패치 등)
+        
+        Args:
+            arrays: uint8 배열 목록
+            options: 인코딩 옵션 (모든 배열에 같이 적용)
+        
+        Returns:
+            arrays 순서대로 인코딩 결과
+        """
+        arrays = [pixels if pixels.flags.owndata else pixels.copy() for pixels in arrays]
+        with self._encoder_lock:
+            if self._encoder is None:
+                workers = int(os.environ.get(ENCODE_WORKERS_ENV) or DEFAULT_ENCODE_WORKERS)
+                self._encoder = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="mcp-encode")
+            encoder = self._encoder
+        futures = [encoder.submit(encode_image, pixels, options) for pixels in arrays]
+        results = [future.result() for future in futures]
+        with self._encoder_lock:
+            for encoded in results:
+                self._encodes += 1
+                self._encode_ms += encoded.encode_ms
+                self._encoded_bytes += len(encoded.data)
+        return results
+    
+    def get_capture_stats(self) -> dict:
+        """동시 캡처 합치기, 프레임 캐시, 캡처 백엔드, 인코딩 통계"""
+        stats = self._captures.get_stats()
+        with self._frame_lock:
+            lookups = self._frame_hits + self._frame_misses
+            stats["backend"] = self.backend.name
+            stats["buffer_allocations"] = self._allocations
+            stats["frame_cache"] = {
+                "ttl": self.frame_ttl,
+                "hits": self._frame_hits,
+                "misses": self._frame_misses,
+                "hit_rate": round(self._frame_hits / lookups, 3) if lookups else 0.0,
+            }
+        with self._encoder_lock:
+            stats["encode"] = {
+                "count": self._encodes,
+                "avg_ms": round(self._encode_ms / self._encodes, 2) if self._encodes else 0.0,
+                "avg_bytes": self._encoded_bytes // self._encodes if self._encodes else 0,
+            }
+        stats["delta"] = self.deltas.get_stats()
+        stats["templates"] = self.templates.get_stats()
+        return stats
+    
+    def capture_full_screen(
+        self,
+        format: str = "PNG",
+        quality: int = DEFAULT_QUALITY,
+        compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+        grayscale: bool = False,
+        max_dimension: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> dict:
         """
         전체 화면 캡처
         
         Args:
-            format: 이미지 형식 ("PNG", "JPEG")
+            format: 이미지 형식 ("PNG", "JPEG", "WEBP")
+            quality: JPEG/WebP 품질 (1-100)
+            compress_level: PNG 압축 수준 (0-9)
+            grayscale: True면 흑백으로 인코딩
+            max_dimension: 긴 변의 최대 길이 (픽셀, 선택적)
+            max_bytes: base64 이미지 최대 크기 (바이트, 선택적)
         
         Returns:
-            작업 결과 딕셔너리 (base64 인코딩된 이미지 포함)
+            작업 결과 딕셔너리 (base64 인코딩된 이미지와 인코딩 정보 포함)
         """
         try:
-            screenshot = pyautogui.screenshot()
+            options = EncodeOptions(format, quality, compress_level, grayscale, max_dimension, max_bytes)
+            pixels = self.grab_array(gray=grayscale)
+            height, width = pixels.shape[:2]
+            encoded = self.encode(pixels, options)
             
-            # 이미지를 바이트로 변환
-            buffer = BytesIO()
-            screenshot.save(buffer, format=format)
-            image_bytes = buffer.getvalue()
-            
-            # Base64 인코딩
-            image_base64 = base64.b64encode(image_bytes).decode("utf-8")
-            
-            # 해상도 정보
-            width, height = screenshot.size
-            
-            logger.info(f"전체 화면 캡처: {width}x{height}, 형식={format}")
+            logger.info(
+                f"전체 화면 캡처: {width}x{height}, 형식={encoded.format}, "
+                f"{len(encoded.data)}바이트, {encoded.encode_ms:.1f}ms"
+            )
             return {
                 "success": True,
-                "image_base64": image_base64,
-                "format": format.lower(),
+                "image_base64": encoded.to_base64(),
                 "width": width,
                 "height": height,
+                **encoded.metadata(),
             }
         except Exception as e:
             logger.error(f"전체 화면 캡처 실패: {e}")
@@ -58,45 +427,160 @@ class ScreenshotController:
         width: int,
         height: int,
         format: str = "PNG",
+        quality: int = DEFAULT_QUALITY,
+        compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+        grayscale: bool = False,
+        max_dimension: Optional[int] = None,
+        max_bytes: Optional[int] = None,
     ) -> dict:
         """
         화면 영역 캡처
         
+        이미지를 축소했으면 화면 좌표는 x + 이미지 X / scale, y + 이미지 Y / scale 입니다.
+        
         Args:
             x: 시작 X 좌표
             y: 시작 Y 좌표
             width: 너비
             height: 높이
-            format: 이미지 형식 ("PNG", "JPEG")
+            format: 이미지 형식 ("PNG", "JPEG", "WEBP")
+            quality: JPEG/WebP 품질 (1-100)
+            compress_level: PNG 압축 수준 (0-9)
+            grayscale: True면 흑백으로 인코딩
+            max_dimension: 긴 변의 최대 길이 (픽셀, 선택적)
+            max_bytes: base64 이미지 최대 크기 (바이트, 선택적). 넘으면 품질을 낮추고 축소합니다.
         
         Returns:
-            작업 결과 딕셔너리 (base64 인코딩된 이미지 포함)
+            작업 결과 딕셔너리 (base64 인코딩된 이미지와 인코딩 정보 포함)
         """
         try:
-            screenshot = pyautogui.screenshot(region=(x, y, width, height))
-            
-            # 이미지를 바이트로 변환
-            buffer = BytesIO()
-            screenshot.save(buffer, format=format)
-            image_bytes = buffer.getvalue()
-            
-            # Base64 인코딩
-            image_base64 = base64.b64encode(image_bytes).decode("utf-8")
+            options = EncodeOptions(format, quality, compress_level, grayscale, max_dimension, max_bytes)
+            pixels = self.grab_array((x, y, width, height), gray=grayscale)
+            encoded = self.encode(pixels, options)
             
-            logger.info(f"영역 캡처: ({x}, {y}) {width}x{height}, 형식={format}")
+            logger.info(
+                f"영역 캡처: ({x}, {y}) {width}x{height}, 형식={encoded.format}, "
+                f"{len(encoded.data)}바이트, {encoded.encode_ms:.1f}ms"
+            )
             return {
                 "success": True,
-                "image_base64": image_base64,
-                "format": format.lower(),
+                "image_base64": encoded.to_base64(),
                 "x": x,
                 "y": y,
                 "width": width,
                 "height": height,
+                **encoded.metadata(),
             }
         except Exception as e:
             logger.error(f"영역 캡처 실패: {e}")
             return {"success": False, "error": str(e)}
     
+    def capture_region_delta(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        key: str = "default",
+        since: Optional[int] = None,
+        format: str = "PNG",
+        quality: int = DEFAULT_QUALITY,
+        compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+        grayscale: bool = False,
+        max_dimension: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> dict:
+        """
+        화면 영역 델타 캡처 (같은 키와 영역의 마지막 프레임 대비 바뀐 사각형만 반환)
+        
+        결과의 delta 값:
+        - "keyframe": 처음 캡처, since 불일치, 크기 변경, 절반 이상 변경 시 전체 이미지 (image_base64)
+        - "patches": base_frame 위에 덮어쓸 패치 목록 (patches: 영역 기준 x, y, width, height, image_base64)
+        - "unchanged": 바뀐 픽셀 없음 (이미지 없음)
+        
+        since가 없으면 keyframe을 보냅니다. 패치는 클라이언트가 가진 이미지가 원본 픽셀과 같아야 맞으므로
+        PNG이고 max_dimension과 max_bytes가 없을 때만 보내며, JPEG/WEBP나 축소 옵션을 쓰면 항상 keyframe을 보냅니다.
+        
+        Args:
+            x: 시작 X 좌표
+            y: 시작 Y 좌표
+            width: 너비
+            height: 높이
+            key: 클라이언트 키 (여러 클라이언트나 작업이 같은 영역을 따로 추적할 때 구분)
+            since: 클라이언트가 마지막으로 받은 frame_id (없거나 다르면 keyframe을 보냄)
+            format: 이미지 형식 ("PNG", "JPEG", "WEBP")
+            quality: JPEG/WebP 품질 (1-100)
+            compress_level: PNG 압축 수준 (0-9)
+            grayscale: True면 흑백으로 비교하고 인코딩
+            max_dimension: keyframe 긴 변의 최대 길이 (픽셀, 선택적)
+            max_bytes: keyframe base64 이미지 최대 크기 (바이트, 선택적)
+        
+        Returns:
+            작업 결과 딕셔너리 (delta, frame_id, base_frame, 이미지 또는 패치)
+        """
+        try:
+            options = EncodeOptions(format, quality, compress_level, grayscale, max_dimension, max_bytes)
+            pixels = self.grab_array((x, y, width, height), gray=grayscale)
+            delta_key = f"{key}:{x},{y},{width},{height}:{'gray' if grayscale else 'rgb'}"
+            # 손실 압축이나 축소로 인코딩한 keyframe 위에는 원본 해상도 패치를 맞출 수 없음
+            delta = self.deltas.compare(delta_key, pixels, since if options.lossless else None)
+            result = {
+                "success": True,
+                "delta": delta.kind,
+                "frame_id": delta.frame_id,
+                "x": x,
+                "y": y,
+                "width": width,
+                "height": height,
+            }
+            
+            if delta.kind == "keyframe":
+                encoded = self.encode(pixels, options)
+                result.update(image_base64=encoded.to_base64(), **encoded.metadata())
+            elif delta.kind == "patches":
+                encoded_patches = self.encode_many(
+                    [pixels[py:py + ph, px:px + pw] for px, py, pw, ph in delta.patches],
+                    options,
+                )
+                result["base_frame"] = delta.base_frame
+                result["format"] = encoded_patches[0].format.lower()
+                result["changed_ratio"] = round(delta.changed_ratio, 4)
+                result["patches"] = [
+                    {"x": px, "y": py, "width": pw, "height": ph, "image_base64": encoded.to_base64()}
+                    for (px, py, pw, ph), encoded in zip(delta.patches, encoded_patches)
+                ]
+                result["bytes"] = sum(len(encoded.data) for encoded in encoded_patches)
+            
+            logger.info(f"영역 델타 캡처: ({x}, {y}) {width}x{height}, {delta.kind}, frame={delta.frame_id}")
+            return result
+        except Exception as e:
+            logger.error(f"영역 델타 캡처 실패: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def grab_region(self, x: int, y: int, width: int, height: int) -> Image.Image:
+        """
+        화면 영역을 인코딩 없이 이미지 객체로 캡처 (내부 처리용)
+        
+        Args:
+            x: 시작 X 좌표
+            y: 시작 Y 좌표
+            width: 너비
+            height: 높이
+        
+        Returns:
+            PIL 이미지
+        """
+        return self._grab((x, y, width, height))
+    
+    def grab_screen(self) -> Image.Image:
+        """
+        전체 화면을 인코딩 없이 이미지 객체로 캡처 (내부 처리용)
+        
+        Returns:
+            PIL 이미지
+        """
+        return self._grab()
+    
     def get_screen_size(self) -> dict:
         """
         화면 크기 조회
@@ -105,7 +589,7 @@ class ScreenshotController:
             화면 크기 정보 딕셔너리
         """
         try:
-            width, height = pyautogui.size()
+            width, height = self.backend.screen_size()
             logger.info(f"화면 크기: {width}x{height}")
             return {"success": True, "width": width, "height": height}
         except Exception as e:
@@ -114,7 +598,7 @@ class ScreenshotController:
     
     def get_pixel_color(self, x: int, y: int) -> dict:
         """
-        특정 좌표의 픽셀 색상 조회
+        특정 좌표의 픽셀 색상 조회 (최근 프레임이 유효하면 새로 캡처하지 않음)
         
         Args:
             x: X 좌표
@@ -124,8 +608,10 @@ class ScreenshotController:
             픽셀 색상 정보 딕셔너리 (RGB)
         """
         try:
-            screenshot = pyautogui.screenshot()
-            rgb = screenshot.getpixel((x, y))
+            pixels = self.grab_array()
+            if not (0 <= x < pixels.shape[1] and 0 <= y < pixels.shape[0]):
+                raise IndexError(f"화면 밖 좌표입니다: ({x}, {y})")
+            rgb = tuple(int(value) for value in pixels[y, x])
             logger.info(f"픽셀 색상 조회: ({x}, {y}) = RGB{rgb}")
             return {
                 "success": True,
@@ -136,6 +622,196 @@ class ScreenshotController:
         except Exception as e:
             logger.error(f"픽셀 색상 조회 실패: {e}")
             return {"success": False, "error": str(e)}
+    
+    def get_pixel_colors(self, points: Sequence[Sequence[int]]) -> dict:
+        """
+        여러 좌표의 픽셀 색상을 한 번의 캡처로 조회
+        
+        Args:
+            points: [x, y] 좌표 목록
+        
+        Returns:
+            작업 결과 딕셔너리 (colors: 좌표 순서대로 "#rrggbb", 화면 밖 좌표는 None)
+        """
+        try:
+            if len(points) > MAX_PIXEL_SAMPLES:
+                return {"success": False, "error": f"한 번에 조회할 수 있는 픽셀은 최대 {MAX_PIXEL_SAMPLES}개입니다."}
+            xs = [int(point[0]) for point in points]
+            ys = [int(point[1]) for point in points]
+            colors = _sample_pixels(self.grab_array(), xs, ys)
+            logger.info(f"픽셀 색상 일괄 조회: {len(colors)}개")
+            return {"success": True, "count": len(colors), "colors": colors}
+        except Exception as e:
+            logger.error(f"픽셀 색상 일괄 조회 실패: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def sample_grid(self, x: int, y: int, width: int, height: int, step: int = 10) -> dict:
+        """
+        영역을 일정 간격의 격자로 샘플링하여 픽셀 색상 조회 (한 번의 캡처)
+        
+        Args:
+            x: 시작 X 좌표
+            y: 시작 Y 좌표
+            width: 너비
+            height: 높이
+            step: 샘플 간격 (픽셀)
+        
+        Returns:
+            작업 결과 딕셔너리 (xs, ys: 샘플 좌표, colors: 행(y)별 "#rrggbb" 목록)
+        """
+        try:
+            step = max(1, int(step))
+            columns = list(range(x, x + width, step))
+            rows = list(range(y, y + height, step))
+            if len(columns) * len(rows) > MAX_PIXEL_SAMPLES:
+                return {
+                    "success": False,
+                    "error": f"샘플 수가 최대 {MAX_PIXEL_SAMPLES}개를 넘습니다. step을 늘리세요.",
+                }
+            xs = columns * len(rows)
+            ys = [row for row in rows for _ in columns]
+            colors = _sample_pixels(self.grab_array(), xs, ys)
+            logger.info(f"격자 샘플링: ({x}, {y}) {width}x{height}, 간격={step}, {len(colors)}개")
+            return {
+                "success": True,
+                "step": step,
+                "xs": columns,
+                "ys": rows,
+                "colors": [colors[index:index + len(columns)] for index in range(0, len(colors), len(columns) or 1)],
+            }
+        except Exception as e:
+            logger.error(f"격자 샘플링 실패: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def find_image(
+        self,
+        template_base64: Optional[str] = None,
+        template_path: Optional[str] = None,
+        x: Optional[int] = None,
+        y: Optional[int] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        threshold: float = 0.8,
+        max_results: int = 5,
+    ) -> dict:
+        """
+        화면에서 템플릿 이미지(아이콘, 버튼 등) 위치 찾기
+        
+        흑백 프레임에서 정규화 상호상관으로 비교하므로 밝기/대비가 조금 달라도 찾을 수 있지만,
+        크기나 배율이 다른 이미지는 찾지 못합니다. 템플릿은 내용별로 캐시되어 다음 호출에서는 바로 사용합니다.
+        
+        Args:
+            template_base64: Base64 인코딩된 템플릿 이미지
+            template_path: 템플릿 이미지 파일 경로 (template_base64 대신)
+            x: 검색 영역 시작 X 좌표 (선택적, 영역을 주면 더 빠름)
+            y: 검색 영역 시작 Y 좌표
+            width: 검색 영역 너비
+            height: 검색 영역 높이
+            threshold: 최소 일치 점수 (0 ~ 1)
+            max_results: 최대 결과 수
+        
+        Returns:
+            작업 결과 딕셔너리 (matches: 점수 내림차순 {x, y, width, height, center_x, center_y, score}, 화면 좌표)
+        """
+        try:
+            if (template_base64 is None) == (template_path is None):
+                return {"success": False, "error": "template_base64와 template_path 중 하나만 지정하세요."}
+            if template_path is not None:
+                from .utils import safe_file_path, validate_file_access
+                
+                is_allowed, error_msg = validate_file_access(template_path, "read")
+                if not is_allowed:
+                    return {"success": False, "error": error_msg}
+                data = safe_file_path(template_path).read_bytes()
+            else:
+                data = base64.b64decode(template_base64)
+            
+            started = time.perf_counter()
+            template = self.templates.get(data)
+            region = (x, y, width, height) if None not in (x, y, width, height) else None
+            gray = self.grab_array(region, gray=True)
+            left, top = (max(0, x), max(0, y)) if region is not None else (0, 0)
+            matches = match_template(gray, template, threshold=threshold, max_results=max(1, int(max_results)))
+            for match in matches:
+                match["x"] += left
+                match["y"] += top
+                match["center_x"] += left
+                match["center_y"] += top
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            
+            logger.info(f"이미지 찾기: 템플릿 {template.width}x{template.height}, {len(matches)}개, {elapsed_ms:.1f}ms")
+            return {
+                "success": True,
+                "found": bool(matches),
+                "count": len(matches),
+                "matches": matches,
+                "template_width": template.width,
+                "template_height": template.height,
+                "elapsed_ms": round(elapsed_ms, 2),
+            }
+        except Exception as e:
+            logger.error(f"이미지 찾기 실패: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def find_color_regions(
+        self,
+        color: Color,
+        tolerance: int = 0,
+        x: Optional[int] = None,
+        y: Optional[int] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        min_area: int = 1,
+        max_results: int = 50,
+    ) -> dict:
+        """
+        화면에서 지정한 색의 연결된 영역 찾기 (강조된 셀, 상태 배지, 선택 표시 등)
+        
+        Args:
+            color: "#rrggbb" 또는 [R, G, B]
+            tolerance: 채널별 허용 차이 (0-255, 안티앨리어싱이나 JPEG 원격 화면이면 높임)
+            x: 검색 영역 시작 X 좌표 (선택적)
+            y: 검색 영역 시작 Y 좌표
+            width: 검색 영역 너비
+            height: 검색 영역 높이
+            min_area: 최소 면적 (픽셀, 더 작은 영역은 제외)
+            max_results: 최대 결과 수
+        
+        Returns:
+            작업 결과 딕셔너리 (regions: 면적 내림차순 {x, y, width, height, area, center_x, center_y}, 화면 좌표)
+        """
+        try:
+            started = time.perf_counter()
+            region = (x, y, width, height) if None not in (x, y, width, height) else None
+            pixels = self.grab_array(region)
+            left, top = (max(0, x), max(0, y)) if region is not None else (0, 0)
+            regions, total = find_color_regions(
+                pixels,
+                color,
+                tolerance=tolerance,
+                min_area=min_area,
+                max_results=max(1, int(max_results)),
+            )
+            for found in regions:
+                found["x"] += left
+                found["y"] += top
+                found["center_x"] += left
+                found["center_y"] += top
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            
+            logger.info(f"색상 영역 찾기: {color}, {total}개, {elapsed_ms:.1f}ms")
+            return {
+                "success": True,
+                "found": bool(regions),
+                "count": len(regions),
+                "total": total,
+                "truncated": total > len(regions),
+                "regions": regions,
+                "elapsed_ms": round(elapsed_ms, 2),
+            }
+        except Exception as e:
+            logger.error(f"색상 영역 찾기 실패: {e}")
+            return {"success": False, "error": str(e)}
 
 
 # 전역 인스턴스
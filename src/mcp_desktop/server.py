@@ -4,23 +4,29 @@ MCP 서버 메인 모듈
 """
 
 import asyncio
+import os
 import sys
 import logging
-from typing import Any, Dict
+from contextlib import nullcontext
+from typing import Any, Dict, Optional
+
+from .startup import get_startup_timer
 
 try:
     from mcp.server import Server
     from mcp.server.stdio import stdio_server
-    from mcp.types import Tool, TextContent
+    from mcp.types import Tool, TextContent, ImageContent
     MCP_AVAILABLE = True
 except ImportError:
     MCP_AVAILABLE = False
     logging.warning("mcp 패키지가 설치되지 않았습니다. MCP 서버를 사용할 수 없습니다.")
 
 from .utils import setup_logging
-from .tools import get_all_tools, call_tool
+from .tools import get_all_tools, call_tool_with_images
+from .progress import ProgressReporter
 
 logger = setup_logging()
+get_startup_timer().mark("server_module_loaded")
 
 # Resources는 선택적으로 import (MCP 버전에 따라 지원되지 않을 수 있음)
 try:
@@ -31,17 +37,56 @@ except ImportError:
     logger.warning("Resources 모듈을 로드할 수 없습니다. Resources 기능이 비활성화됩니다.")
 
 
+# 백그라운드 사전 인덱싱 활성화 환경 변수 ("1", "true", "yes", "on")
+BACKGROUND_INDEX_ENV = "MCP_DESKTOP_BACKGROUND_INDEX"
+
+# 화면 변경 감시 활성화 환경 변수 및 샘플링 주기 (Hz)
+CHANGE_WATCHER_ENV = "MCP_DESKTOP_CHANGE_WATCHER"
+CHANGE_WATCHER_RATE_ENV = "MCP_DESKTOP_CHANGE_WATCHER_HZ"
+
+
+def _env_flag(name: str) -> bool:
+    """환경 변수를 불리언 플래그로 해석"""
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
 class DesktopMCPServer:
     """데스크탑 자동화 MCP 서버"""
     
-    def __init__(self):
-        """서버 초기화"""
+    def __init__(
+        self,
+        background_index: bool = False,
+        change_watcher_rate: Optional[float] = None,
+    ):
+        """
+        서버 초기화
+        
+        Args:
+            background_index: 유휴 시간에 포그라운드 윈도우를 미리 인덱싱할지 여부
+            change_watcher_rate: 화면 변경 감시 샘플링 주기 (Hz, None이면 감시하지 않음)
+        """
         if not MCP_AVAILABLE:
             raise ImportError("mcp 패키지가 필요합니다. pip install mcp로 설치하세요.")
         
+        with get_startup_timer().phase("server_init"):
+            self._init_components(background_index, change_watcher_rate)
+        logger.info("MCP 데스크탑 자동화 서버 초기화 완료")
+    
+    def _init_components(self, background_index: bool, change_watcher_rate: Optional[float]):
+        """선택 기능과 MCP 핸들러 초기화 (디스플레이, OCR, SQLite는 도구 호출 시점에 로드)"""
+        self.change_watcher = None
+        if change_watcher_rate:
+            from .change_watcher import get_change_watcher
+            self.change_watcher = get_change_watcher()
+            self.change_watcher.sample_rate = change_watcher_rate
+        
+        self.background_indexer = None
+        if background_index:
+            from .background_indexer import get_background_indexer
+            self.background_indexer = get_background_indexer()
+        
         self.server = Server("mcp-desktop-automation")
         self._setup_handlers()
-        logger.info("MCP 데스크탑 자동화 서버 초기화 완료")
     
     def _setup_handlers(self):
         """MCP 핸들러 설정"""
@@ -49,18 +94,38 @@ class DesktopMCPServer:
         @self.server.list_tools()
         async def list_tools() -> list[Tool]:
             """사용 가능한 도구 목록 반환"""
-            tools = get_all_tools()
+            timer = get_startup_timer()
+            with timer.phase("first_list_tools"):
+                tools = get_all_tools()
+            timer.mark("first_list_tools")
             logger.info(f"도구 목록 요청: {len(tools)}개")
             return tools
         
         # Tool 호출 처리
         @self.server.call_tool()
-        async def call_tool_handler(name: str, arguments: Dict[str, Any]) -> list[TextContent]:
+        async def call_tool_handler(name: str, arguments: Dict[str, Any]) -> list[TextContent | ImageContent]:
             """도구 호출 처리"""
             logger.info(f"도구 호출: {name}, 인자: {arguments}")
+            get_startup_timer().mark("first_tool_call")
             try:
-                result = await call_tool(name, arguments)
-                return [TextContent(type="text", text=result)]
+                # 도구 호출 중에는 백그라운드 인덱싱이 양보
+                interactive = (
+                    self.background_indexer.interactive()
+                    if self.background_indexer is not None
+                    else nullcontext()
+                )
+                # 클라이언트가 progressToken을 보낸 경우 인덱싱 진행 상황을 알림으로 전송
+                progress = ProgressReporter.from_request_context(
+                    self.server,
+                    stream_regions=bool(arguments.get("stream_regions", False)),
+                )
+                with interactive:
+                    result, images = await call_tool_with_images(name, arguments, progress=progress)
+                # 이미지는 base64 JSON 문자열 대신 MCP 이미지 콘텐츠로 전송 (텍스트에는 메타데이터만)
+                return [
+                    TextContent(type="text", text=result),
+                    *(ImageContent(type="image", data=data, mimeType=mime_type) for data, mime_type in images),
+                ]
             except Exception as e:
                 logger.error(f"도구 호출 실패: {e}", exc_info=True)
                 return [TextContent(type="text", text=f"오류: {str(e)}")]
@@ -93,18 +158,42 @@ class DesktopMCPServer:
     
     async def run(self):
         """서버 실행"""
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                self.server.create_initialization_options(),
-            )
+        background_task = None
+        if self.background_indexer is not None:
+            background_task = asyncio.create_task(self.background_indexer.run())
+        if self.change_watcher is not None:
+            self.change_watcher.start()
+        
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                timer = get_startup_timer()
+                timer.mark("server_ready")
+                logger.info(
+                    f"서버 준비 완료: {timer.elapsed() * 1000:.1f}ms "
+                    f"(로드된 무거운 모듈: {', '.join(timer.report()['heavy_modules_loaded']) or '없음'})"
+                )
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    self.server.create_initialization_options(),
+                )
+        finally:
+            if background_task is not None:
+                background_task.cancel()
+            if self.change_watcher is not None:
+                self.change_watcher.stop()
 
 
 async def main():
     """메인 진입점"""
     try:
-        server = DesktopMCPServer()
+        change_watcher_rate = None
+        if _env_flag(CHANGE_WATCHER_ENV):
+            change_watcher_rate = float(os.environ.get(CHANGE_WATCHER_RATE_ENV) or 2.0)
+        server = DesktopMCPServer(
+            background_index=_env_flag(BACKGROUND_INDEX_ENV),
+            change_watcher_rate=change_watcher_rate,
+        )
         await server.run()
     except KeyboardInterrupt:
         logger.info("서버 종료 요청")
@@ -3,14 +3,22 @@
 인덱싱 상태를 추적하고 필요시 자동으로 인덱싱을 수행
 """
 
+import asyncio
 import logging
+from dataclasses import asdict
 from typing import Optional, Dict
 from datetime import datetime, timedelta
 from pathlib import Path
 import sqlite3
 
-from .screen_indexer import get_screen_indexer
+from .cancellation import CancellationToken, OperationCancelled, check_token
+from .change_watcher import get_change_watcher
+from .ocr_scheduler import get_ocr_scheduler, PRIORITY_TARGETED
+from .label_priors import get_label_prior_store, SCREEN_WINDOW_CLASS
+from .screen_indexer import get_screen_indexer, text_matches, ProgressCallback, TextRegion
+from .state_library import compute_detail, compute_fingerprint, get_state_library
 from .screenshot import get_screenshot_controller
+from .utils import SingleFlight
 from .window import get_window_controller
 
 logger = logging.getLogger("mcp_desktop.smart_indexer")
@@ -27,6 +35,11 @@ class SmartIndexer:
         self.indexer = get_screen_indexer()
         self.screenshot = get_screenshot_controller()
         self.window = get_window_controller()
+        self.priors = get_label_prior_store()
+        self.library = get_state_library()
+        self.change_watcher = get_change_watcher()
+        # 같은 윈도우에 대한 동시 인덱싱/갱신은 하나로 합쳐 진행 중인 결과를 공유
+        self._flights = SingleFlight()
         self._db_path = Path.home() / ".mcp_desktop" / "screen_index.db"
         self._init_metadata_table()
     
@@ -183,21 +196,74 @@ class SmartIndexer:
         window_id: Optional[int] = None,
         force: bool = False,
         grid_size: Optional[int] = None,
+        token: Optional[CancellationToken] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> dict:
         """
         인덱싱이 최신인지 확인하고 필요시 수행
         
+        같은 윈도우, force, grid_size로 이미 진행 중인 호출이 있으면 새로 인덱싱하지 않고
+        그 결과를 기다려 공유합니다 (결과에 coalesced=True 표시). 기다리는 동안에도 token을 확인하며,
+        공유한 결과가 앞선 호출의 취소/마감 때문에 부분 결과이면 이 호출의 토큰으로 다시 인덱싱합니다.
+        취소되거나 마감 시간이 지나면 완료된 타일만 저장하고 partial=True 결과를 반환하며,
+        인덱스는 다음 호출 때 다시 인덱싱이 필요한 상태로 남습니다.
+        
         Args:
             window_id: 윈도우 ID (None이면 전체 화면)
             force: 강제 재인덱싱 여부
             grid_size: 그리드 크기 (None이면 기본값 사용)
+            token: 취소 토큰 (단계와 타일 사이마다 확인)
+            progress: 진행 콜백 (새로 인덱싱할 때 타일마다 호출)
         
         Returns:
             인덱싱 결과 딕셔너리
         """
+        while True:
+            try:
+                result, shared = self._flights.do(
+                    self._index_key(window_id, force, grid_size),
+                    self._ensure_indexed,
+                    window_id,
+                    force,
+                    grid_size,
+                    token,
+                    progress,
+                    token=token,
+                )
+            except OperationCancelled as e:
+                logger.info(f"인덱싱 대기 취소됨 ({e.reason}): window_id={window_id}")
+                return {"success": False, "cancelled": True, "error": f"인덱싱 취소됨 ({e.reason})"}
+            if not shared:
+                return result
+            if result.get("partial") or result.get("cancelled"):
+                # 앞선 호출의 마감/취소로 끝난 결과이므로 이 호출의 토큰으로 다시 시도
+                logger.info(f"공유한 인덱싱이 완료되지 않아 다시 시도: window_id={window_id}")
+                continue
+            logger.info(f"진행 중인 인덱싱 결과 공유: window_id={window_id}")
+            return {**result, "coalesced": True}
+    
+    @staticmethod
+    def _index_key(window_id: Optional[int], force: bool, grid_size: Optional[int]) -> tuple:
+        """인덱싱 호출을 합칠 기준 키 (결과가 달라지는 인자를 모두 포함)"""
+        return ("index", window_id, force, grid_size)
+    
+    def _ensure_indexed(
+        self,
+        window_id: Optional[int],
+        force: bool,
+        grid_size: Optional[int],
+        token: Optional[CancellationToken] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> dict:
+        """ensure_indexed() 실제 구현 (윈도우별로 한 번에 하나만 실행)"""
         try:
             # 강제 재인덱싱이 아니면 상태 확인
             if not force:
+                # 변경 감시기가 실행 중이면 변경된 타일만 다시 OCR
+                refreshed = self.refresh_dirty_tiles(window_id)
+                if refreshed is not None and refreshed.get("success"):
+                    return refreshed
+                
                 if not self.is_indexing_needed(window_id):
                     logger.info(f"인덱싱이 최신 상태입니다. window_id={window_id}")
                     return {
@@ -206,19 +272,48 @@ class SmartIndexer:
                         "message": "이미 최신 인덱싱이 있습니다.",
                     }
             
+            # 이전에 인덱싱한 화면 상태와 같으면 OCR 없이 복원
+            check_token(token)
+            state = self.capture_state(window_id)
+            if state is not None and not force:
+                restored = self.restore_from_library(window_id, state)
+                if restored is not None:
+                    return {
+                        "success": True,
+                        "indexed": True,
+                        "restored": True,
+                        "result": restored,
+                    }
+            
             # 인덱싱 수행
+            check_token(token)
             logger.info(f"인덱싱 시작: window_id={window_id}, force={force}")
             
             if window_id is not None:
-                result = self.indexer.index_window(hwnd=window_id, grid_size=grid_size)
+                result = self.indexer.index_window(
+                    hwnd=window_id,
+                    grid_size=grid_size,
+                    token=token,
+                    progress=progress,
+                )
             else:
-                result = self.indexer.index_screen(grid_size=grid_size)
+                result = self.indexer.index_screen(grid_size=grid_size, token=token, progress=progress)
             
             if not result.get("success"):
                 return result
+            if result.get("partial"):
+                # 부분 결과는 저장만 하고 최신 인덱스로 표시하지 않음
+                return {
+                    "success": True,
+                    "indexed": True,
+                    "partial": True,
+                    "result": result,
+                }
             
             # 메타데이터 저장
             self._update_metadata(window_id, result)
+            if state is not None:
+                self._remember_state(window_id, state)
             
             logger.info(f"인덱싱 완료: window_id={window_id}")
             return {
@@ -227,10 +322,418 @@ class SmartIndexer:
                 "result": result,
             }
         
+        except OperationCancelled as e:
+            logger.info(f"인덱싱 취소됨 ({e.reason}): window_id={window_id}")
+            return {"success": False, "cancelled": True, "error": f"인덱싱 취소됨 ({e.reason})"}
         except Exception as e:
             logger.error(f"인덱싱 보장 실패: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
     
+    def refresh_dirty_tiles(self, window_id: Optional[int] = None) -> Optional[dict]:
+        """
+        변경 감시기가 변경을 감지한 타일만 다시 OCR하여 인덱스 갱신
+        
+        감시기가 현재 인덱스 세대를 캡처하기 전부터 실행 중이고, 인덱싱 영역(윈도우 위치/크기)이
+        그대로이며, 마지막 전체 인덱싱이 INDEX_VALIDITY_SECONDS 안인 경우에만 적용됩니다.
+        변경된 타일이 없으면 OCR 없이 인덱스를 최신으로 간주합니다. 타일 갱신은 유효 시간을
+        늘리지 않으므로, 감시기가 놓친 변화도 유효 시간이 지나면 전체 재인덱싱으로 바로잡힙니다.
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+        
+        Returns:
+            갱신 결과 딕셔너리 (적용할 수 없으면 None)
+        """
+        result, _ = self._flights.do(("refresh", window_id), self._refresh_dirty_tiles, window_id)
+        return result
+    
+    def _refresh_dirty_tiles(self, window_id: Optional[int]) -> Optional[dict]:
+        """refresh_dirty_tiles() 실제 구현 (윈도우별로 한 번에 하나만 실행)"""
+        try:
+            if not self.change_watcher.is_running():
+                return None
+            
+            generation = self.indexer.get_generation(window_id)
+            if generation is None or generation["area"] is None:
+                return None
+            if not self.change_watcher.covers(generation["captured_at"]):
+                return None
+            
+            area = self.indexer.get_index_area(window_id)
+            if not area.get("success"):
+                return None
+            if any(area[key] != generation["area"][key] for key in ("left", "top", "width", "height")):
+                return None
+            if self.is_indexing_needed(window_id):
+                return None
+            
+            captured_at = self.screenshot.frame_time()
+            dirty_tiles = [
+                tile
+                for tile in self.indexer.plan_tiles(area, generation["grid_size"])
+                if self.change_watcher.changed_since(tile, generation["captured_at"])
+            ]
+            text_regions = 0
+            if dirty_tiles:
+                # 세대의 캡처 시각은 실제로 갱신한 경우에만 앞당김 (메타데이터의 인덱싱 시각은 그대로 둠)
+                text_regions = self.indexer.refresh_tiles(window_id, dirty_tiles, captured_at)
+            
+            logger.info(f"변경된 타일 갱신: window_id={window_id}, {len(dirty_tiles)}개 타일")
+            return {
+                "success": True,
+                "indexed": bool(dirty_tiles),
+                "refreshed_tiles": len(dirty_tiles),
+                "text_regions": text_regions,
+            }
+        
+        except Exception as e:
+            logger.error(f"변경된 타일 갱신 실패: {e}", exc_info=True)
+            return {"success": False, "error": str(e)}
+    
+    async def locate_text(
+        self,
+        search_text: str,
+        window_id: Optional[int] = None,
+        exact_match: bool = False,
+        grid_size: Optional[int] = None,
+        token: Optional[CancellationToken] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> dict:
+        """
+        텍스트 위치 탐색 (조기 종료 지원)
+        
+        인덱스가 최신이면(변경 감시기가 표시한 타일은 다시 OCR한 뒤) DB에서 바로 검색합니다.
+        같은 윈도우를 인덱싱 중인 호출이 있어도 기다리지 않고 타겟 검색을 진행합니다.
+        이전에 인덱싱한 화면 상태와 같으면 인덱스를
+        복원한 뒤 검색합니다. 그렇지 않으면 먼저 같은 윈도우 클래스에서
+        레이블이 발견되었던 위치(사전정보)를 작은 영역만 확인하고, 실패하면 마지막으로 발견된
+        위치에 가까운 타일부터 OCR 결과를 스트리밍하면서 일치하는 텍스트를 찾는 즉시 OCR을
+        중단합니다. 끝까지 찾지 못해 모든 타일을 처리한 경우에는 전체 인덱싱 결과로 저장합니다.
+        취소되거나 마감 시간이 지나면 그때까지 OCR한 타일만 인덱스에 반영하고 cancelled=True를 반환합니다.
+        
+        Args:
+            search_text: 검색할 텍스트
+            window_id: 윈도우 ID (None이면 전체 화면)
+            exact_match: 정확히 일치하는지 여부
+            grid_size: 그리드 크기 (None이면 기본값 사용)
+            token: 취소 토큰 (단계와 타일 사이마다 확인)
+            progress: 진행 콜백 (타겟 검색 시 타일마다 호출)
+        
+        Returns:
+            find_text()와 같은 형식의 결과 딕셔너리
+            (source: "index", "state_library", "label_prior" 또는 "targeted_search")
+        """
+        try:
+            # 같은 윈도우를 인덱싱 중인 호출이 있어도 완료를 기다리지 않음 (전체 인덱싱을 기다리면 조기 종료와
+            # 마감 시간이 의미가 없어짐). 타겟 검색의 타일 OCR은 스케줄러에서 진행 중인 같은 타일 작업과
+            # 합쳐지고 우선순위만 올라가므로 OCR을 중복하지 않음
+            refreshed = await asyncio.to_thread(self.refresh_dirty_tiles, window_id)
+            if refreshed is not None and not refreshed.get("success"):
+                refreshed = None
+            if refreshed is not None or not await asyncio.to_thread(self.is_indexing_needed, window_id):
+                result = await asyncio.to_thread(
+                    self.indexer.find_text,
+                    search_text=search_text,
+                    exact_match=exact_match,
+                    window_id=window_id,
+                )
+                result["source"] = "index"
+                if result.get("regions"):
+                    await asyncio.to_thread(self._remember_location, window_id, search_text, result["regions"][0])
+                return result
+            
+            # 이전에 인덱싱한 화면 상태와 같으면 복원 후 DB에서 검색
+            check_token(token)
+            state = await asyncio.to_thread(self.capture_state, window_id)
+            if state is not None:
+                restored = await asyncio.to_thread(self.restore_from_library, window_id, state)
+                if restored is not None:
+                    result = await asyncio.to_thread(
+                        self.indexer.find_text,
+                        search_text=search_text,
+                        exact_match=exact_match,
+                        window_id=window_id,
+                    )
+                    result["source"] = "state_library"
+                    return result
+            
+            # 사전정보 위치 확인 (픽셀 해시 또는 작은 영역 OCR 한 번)
+            check_token(token)
+            context = await asyncio.to_thread(self.priors.get_context, window_id)
+            if context is not None:
+                verified = await asyncio.to_thread(
+                    self.priors.verify, search_text, window_id, exact_match, context
+                )
+                if verified is not None:
+                    return {
+                        "success": True,
+                        "search_text": search_text,
+                        "window_id": window_id,
+                        "count": 1,
+                        "regions": [verified],
+                        "source": "label_prior",
+                    }
+            
+            prior = await asyncio.to_thread(
+                self.indexer.get_last_known_position, search_text, exact_match, window_id
+            )
+            logger.info(f"타겟 검색 시작: '{search_text}', window_id={window_id}, prior={prior}")
+            
+            check_token(token)
+            collected = []
+            scanned_tiles = []
+            scan_info = None
+            total = 0
+            async for batch in self.indexer.stream_index(
+                window_id=window_id,
+                grid_size=grid_size,
+                prior=prior,
+                priority=PRIORITY_TARGETED,
+                token=token,
+                progress=progress,
+            ):
+                if batch.get("cancelled"):
+                    # 마감/취소: 지금까지 OCR한 타일만 인덱스에 반영 (세대는 갱신하지 않음)
+                    await asyncio.to_thread(
+                        self.indexer.merge_tiles,
+                        window_id,
+                        scanned_tiles + batch["tiles"],
+                        collected + batch["regions"],
+                    )
+                    logger.info(f"타겟 검색 중단 ({batch['reason']}): {batch['done']}/{batch['total']}개 타일 처리")
+                    return {
+                        "success": False,
+                        "cancelled": True,
+                        "error": batch["error"],
+                        "search_text": search_text,
+                        "window_id": window_id,
+                        "source": "targeted_search",
+                        "tiles_scanned": batch["done"],
+                        "total_tiles": batch["total"],
+                    }
+                if not batch.get("success"):
+                    return batch
+                
+                scan_info = batch
+                total = batch["total"]
+                scanned_tiles.extend(batch["tiles"])
+                collected.extend(batch["regions"])
+                matches = [
+                    {**asdict(region), "window_id": window_id}
+                    for region in batch["regions"]
+                    if text_matches(region.text, search_text, exact_match)
+                ]
+                if matches:
+                    logger.info(f"타겟 검색 조기 종료: {batch['done']}/{total}개 타일 처리")
+                    if context is not None:
+                        await asyncio.to_thread(self.priors.record, context, search_text, matches[0])
+                    return {
+                        "success": True,
+                        "search_text": search_text,
+                        "window_id": window_id,
+                        "count": len(matches),
+                        "regions": matches,
+                        "source": "targeted_search",
+                        "tiles_scanned": batch["done"],
+                        "total_tiles": total,
+                    }
+            
+            # 모든 타일을 처리했으므로 전체 인덱싱 결과로 저장
+            if scan_info is not None:
+                await asyncio.to_thread(self.commit_scan, window_id, collected, scan_info, state)
+            
+            return {
+                "success": True,
+                "search_text": search_text,
+                "window_id": window_id,
+                "count": 0,
+                "regions": [],
+                "source": "targeted_search",
+                "tiles_scanned": total,
+                "total_tiles": total,
+            }
+        
+        except OperationCancelled as e:
+            logger.info(f"텍스트 위치 탐색 취소됨 ({e.reason}): '{search_text}'")
+            return {"success": False, "cancelled": True, "error": f"탐색 취소됨 ({e.reason})"}
+        except Exception as e:
+            logger.error(f"텍스트 위치 탐색 실패: {e}", exc_info=True)
+            return {"success": False, "error": str(e)}
+    
+    def _get_window_class(self, window_id: Optional[int] = None) -> Optional[str]:
+        """윈도우 클래스 조회 (전체 화면은 SCREEN_WINDOW_CLASS, 조회 실패 시 None)"""
+        if window_id is None:
+            return SCREEN_WINDOW_CLASS
+        info = self.window.get_window_info(window_id)
+        if not info.get("success"):
+            return None
+        return info["window"]["class"]
+    
+    def capture_state(self, window_id: Optional[int] = None) -> Optional[dict]:
+        """
+        현재 인덱싱 영역의 화면 상태 키 계산
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+        
+        Returns:
+            window_class, fingerprint, detail, area, captured_at을 포함한 딕셔너리 (실패 시 None)
+        """
+        try:
+            window_class = self._get_window_class(window_id)
+            if window_class is None:
+                return None
+            area = self.indexer.get_index_area(window_id)
+            if not area.get("success"):
+                return None
+            captured_at = self.screenshot.frame_time()
+            image = self.screenshot.grab_region(area["left"], area["top"], area["width"], area["height"])
+            return {
+                "window_class": window_class,
+                "fingerprint": compute_fingerprint(image),
+                "detail": compute_detail(image),
+                "area": area,
+                "captured_at": captured_at,
+            }
+        except Exception as e:
+            logger.debug(f"화면 상태 계산 실패: {e}")
+            return None
+    
+    def restore_from_library(self, window_id: Optional[int], state: dict) -> Optional[dict]:
+        """
+        화면 상태 라이브러리에서 일치하는 세대를 찾아 인덱스로 복원
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+            state: capture_state() 결과
+        
+        Returns:
+            복원 결과 딕셔너리 (일치하는 상태가 없으면 None)
+        """
+        area = state["area"]
+        saved = self.library.lookup(
+            state["window_class"], state["fingerprint"], area["width"], area["height"], detail=state["detail"]
+        )
+        if saved is None:
+            return None
+        
+        # 상대 좌표를 현재 윈도우 위치 기준 화면 좌표로 변환
+        left, top = area["left"], area["top"]
+        regions = [
+            TextRegion(**{
+                **region,
+                "x": region["x"] + left,
+                "y": region["y"] + top,
+                "center_x": region["center_x"] + left,
+                "center_y": region["center_y"] + top,
+            })
+            for region in saved.regions
+        ]
+        timestamp = self.indexer.store_regions(window_id, regions, area, saved.grid_size, state["captured_at"])
+        size = {"width": area["width"], "height": area["height"]}
+        size_key = "window_size" if window_id is not None else "screen_size"
+        self._update_metadata(window_id, {size_key: size})
+        
+        logger.info(f"화면 상태 복원: window_id={window_id}, {len(regions)}개 텍스트 영역")
+        return {
+            "success": True,
+            "timestamp": timestamp,
+            "text_regions": len(regions),
+            size_key: size,
+        }
+    
+    def _remember_state(self, window_id: Optional[int], state: dict):
+        """
+        현재 인덱스를 화면 상태 라이브러리에 저장
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+            state: 인덱싱 직전에 계산한 capture_state() 결과
+        """
+        area = state["area"]
+        left, top = area["left"], area["top"]
+        regions = [
+            {
+                **region,
+                "x": region["x"] - left,
+                "y": region["y"] - top,
+                "center_x": region["center_x"] - left,
+                "center_y": region["center_y"] - top,
+            }
+            for region in self.indexer.get_regions(window_id)
+        ]
+        generation = self.indexer.get_generation(window_id)
+        self.library.store(
+            state["window_class"],
+            state["fingerprint"],
+            area["width"],
+            area["height"],
+            regions,
+            grid_size=generation["grid_size"] if generation else None,
+            detail=state["detail"],
+        )
+    
+    def get_stats(self) -> dict:
+        """화면 상태 라이브러리 적중률, 변경 감시기, OCR 작업 큐, 동시 호출 합치기 통계 보고서"""
+        return {
+            "success": True,
+            "state_library": self.library.get_stats(),
+            "change_watcher": self.change_watcher.get_stats(),
+            "ocr_scheduler": get_ocr_scheduler().get_stats(),
+            "single_flight": {
+                "indexing": self._flights.get_stats(),
+                "captures": self.screenshot.get_capture_stats(),
+            },
+        }
+    
+    def _remember_location(self, window_id: Optional[int], search_text: str, region: dict):
+        """
+        인덱스에서 찾은 위치를 사전정보로 기록 (없거나 위치가 바뀐 경우에만)
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+            search_text: 검색한 텍스트
+            region: 찾은 텍스트 영역 (화면 좌표)
+        """
+        context = self.priors.get_context(window_id)
+        if context is None:
+            return
+        prior = self.priors.lookup(context, search_text)
+        if (
+            prior is None
+            or prior["rel_x"] != region["x"] - context["left"]
+            or prior["rel_y"] != region["y"] - context["top"]
+        ):
+            self.priors.record(context, search_text, region)
+    
+    def commit_scan(
+        self,
+        window_id: Optional[int],
+        regions: list,
+        scan_info: dict,
+        state: Optional[dict] = None,
+    ):
+        """
+        타일 스트림으로 모은 전체 스캔 결과를 인덱스 세대로 저장
+        
+        Args:
+            window_id: 윈도우 ID (None이면 전체 화면)
+            regions: TextRegion 목록
+            scan_info: 스캔의 마지막 배치 결과 (size, area, grid_size, captured_at)
+            state: 스캔 시작 전에 계산한 capture_state() 결과 (화면 상태 라이브러리에 저장)
+        """
+        self.indexer.store_regions(
+            window_id,
+            regions,
+            scan_info["area"],
+            scan_info["grid_size"],
+            scan_info["captured_at"],
+        )
+        size_key = "window_size" if window_id is not None else "screen_size"
+        self._update_metadata(window_id, {size_key: scan_info["size"]})
+        if state is not None:
+            self._remember_state(window_id, state)
+    
     def _update_metadata(self, window_id: Optional[int], index_result: dict):
         """
         인덱싱 메타데이터 업데이트
@@ -310,6 +813,9 @@ class SmartIndexer:
             
             conn.commit()
             conn.close()
+            if deleted_count:
+                # 여러 윈도우의 행이 삭제되었을 수 있으므로 모든 페이지 커서 무효화
+                self.indexer.mark_changed(all_windows=True)
             
             logger.info(f"오래된 인덱스 정리: {deleted_count}개 영역, {deleted_meta_count}개 메타데이터")
             
@@ -0,0 +1,200 @@
+"""
+시작 시간 측정 모듈
+서버 시작, initialize, list_tools 구간과 하위 시스템(마우스, OCR, 인덱서 등)을
+처음 사용할 때의 지연 import 시간을 기록하여 릴리스별 콜드 스타트 지연을 추적할 수 있도록 함
+
+하위 시스템별 import 시간 분석 (-X importtime 기반):
+    python -m mcp_desktop.startup [--json]
+"""
+
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger("mcp_desktop.startup")
+
+# 이 모듈이 처음 import된 시각 (서버가 가장 먼저 import하므로 프로세스 시작 기준으로 사용)
+_STARTED_AT = time.perf_counter()
+
+# 서버 시작/목록 조회 단계에서 로드되면 안 되는 무거운 모듈 (디스플레이, OCR 엔진, SQLite)
+HEAVY_MODULES = ("pyautogui", "PIL", "pytesseract", "sqlite3", "numpy", "win32gui")
+
+# 하위 시스템 이름 -> 모듈 (mcp_desktop 기준)
+SUBSYSTEMS = {
+    "server": "server",
+    "tools": "tools",
+    "mouse": "mouse",
+    "keyboard": "keyboard",
+    "screenshot": "screenshot",
+    "window": "window",
+    "filesystem": "filesystem",
+    "ocr": "ocr",
+    "screen_indexer": "screen_indexer",
+    "smart_indexer": "smart_indexer",
+}
+
+# 하위 시스템별로 보여줄 가장 무거운 모듈 수
+TOP_MODULES = 5
+
+# -X importtime 출력 형식: "import time:       self |  cumulative | module"
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+class StartupTimer:
+    """시작 단계별 소요 시간 기록기 (스레드 안전)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._phases: Dict[str, float] = {}
+        self._marks: Dict[str, float] = {}
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        구간 소요 시간 측정 (같은 이름은 처음 한 번만 기록)
+        
+        Args:
+            name: 구간 이름 (예: "server_init", "import:mouse")
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+    
+    def record(self, name: str, seconds: float):
+        """구간 소요 시간 기록 (같은 이름은 처음 한 번만 기록)"""
+        with self._lock:
+            self._phases.setdefault(name, seconds)
+    
+    def mark(self, name: str):
+        """프로세스 시작 기준 경과 시간 기록 (같은 이름은 처음 한 번만 기록)"""
+        with self._lock:
+            self._marks.setdefault(name, time.perf_counter() - _STARTED_AT)
+    
+    def elapsed(self) -> float:
+        """프로세스 시작 기준 경과 시간 (초)"""
+        return time.perf_counter() - _STARTED_AT
+    
+    def report(self) -> dict:
+        """
+        시작 시간 보고서
+        
+        Returns:
+            구간별 소요 시간(ms), 시작 기준 시점(ms), 현재 로드된 무거운 모듈 목록을 포함한 딕셔너리
+        """
+        with self._lock:
+            phases = {name: round(seconds * 1000, 2) for name, seconds in self._phases.items()}
+            marks = {name: round(seconds * 1000, 2) for name, seconds in self._marks.items()}
+        return {
+            "success": True,
+            "phases_ms": phases,
+            "marks_ms": marks,
+            "heavy_modules_loaded": loaded_heavy_modules(),
+        }
+
+
+def loaded_heavy_modules() -> List[str]:
+    """현재 프로세스에 로드된 무거운 모듈 목록"""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def measure_import_times(subsystems: Optional[Dict[str, str]] = None) -> dict:
+    """
+    하위 시스템별 콜드 import 시간 측정
+    
+    하위 시스템마다 새 인터프리터에서 `python -X importtime -c "import mcp_desktop.<모듈>"`을 실행하여
+    다른 하위 시스템이 먼저 로드한 모듈의 영향 없이 누적 import 시간을 측정합니다.
+    
+    Args:
+        subsystems: 하위 시스템 이름 -> 모듈 (None이면 SUBSYSTEMS)
+    
+    Returns:
+        하위 시스템별 누적 시간(ms), 가장 무거운 모듈 목록, 로드된 무거운 모듈을 포함한 딕셔너리
+    """
+    package = __package__ or "mcp_desktop"
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    
+    results = {}
+    for name, module in (subsystems or SUBSYSTEMS).items():
+        target = f"{package}.{module}"
+        # import 시도만 하고 실패한 모듈도 importtime에 기록되므로, 실제로 로드된 모듈은 sys.modules로 확인
+        script = (
+            f"import sys, {target}; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        try:
+            completed = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", script],
+                capture_output=True,
+                text=True,
+                env=env,
+                timeout=60,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            results[name] = {"success": False, "error": str(e)}
+            continue
+        
+        imports = []
+        for line in completed.stderr.splitlines():
+            match = _IMPORTTIME_LINE.match(line)
+            if match:
+                imports.append((match.group(4), int(match.group(1)), int(match.group(2))))
+        
+        if completed.returncode != 0:
+            error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "import 실패"
+            results[name] = {"success": False, "error": error}
+            continue
+        
+        cumulative = next((cum for mod, _, cum in imports if mod == target), sum(s for _, s, _ in imports))
+        heaviest = sorted(imports, key=lambda item: item[1], reverse=True)[:TOP_MODULES]
+        results[name] = {
+            "success": True,
+            "cumulative_ms": round(cumulative / 1000, 2),
+            "top_modules": [{"module": mod, "self_ms": round(s / 1000, 2)} for mod, s, _ in heaviest],
+            "heavy_modules": [mod for mod in completed.stdout.strip().split(",") if mod],
+        }
+    return {"success": True, "python": sys.version.split()[0], "subsystems": results}
+
+
+# 전역 인스턴스
+_startup_timer = None
+
+
+def get_startup_timer() -> StartupTimer:
+    """시작 시간 기록기 싱글톤 인스턴스 반환"""
+    global _startup_timer
+    if _startup_timer is None:
+        _startup_timer = StartupTimer()
+    return _startup_timer
+
+
+def main():
+    """하위 시스템별 import 시간 보고서 출력"""
+    report = measure_import_times()
+    if "--json" in sys.argv[1:]:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    
+    print(f"Python {report['python']} 하위 시스템별 콜드 import 시간")
+    for name, result in report["subsystems"].items():
+        if not result["success"]:
+            print(f"  {name:<16} 실패: {result['error']}")
+            continue
+        heavy = ", ".join(result["heavy_modules"]) or "-"
+        print(f"  {name:<16} {result['cumulative_ms']:>9.1f}ms  무거운 모듈: {heavy}")
+        for item in result["top_modules"]:
+            print(f"      {item['self_ms']:>9.1f}ms  {item['module']}")
+
+
+if __name__ == "__main__":
+    main()
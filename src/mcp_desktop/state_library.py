@@ -0,0 +1,246 @@
+"""
+화면 상태 라이브러리
+이전에 인덱싱한 화면 상태를 지각 해시(perceptual hash)로 기억하여,
+같은 화면으로 돌아왔을 때 OCR 없이 인덱스를 즉시 복원
+
+지각 해시는 후보를 고르는 데만 쓰고, 복원하기 전에 축소 흑백 이미지를 비교하여
+글자만 바뀐 화면(해시 거리가 거의 같음)에서 이전 텍스트를 복원하지 않도록 검증합니다.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger("mcp_desktop.state_library")
+
+# 지각 해시 크기 (HASH_SIZE x HASH_SIZE 비트)
+HASH_SIZE = 16
+
+# 같은 화면으로 간주할 최대 해밍 거리 (비트 수)
+DEFAULT_TOLERANCE = 8
+
+# 라이브러리에 보관할 최대 화면 상태 수
+DEFAULT_MAX_ENTRIES = 32
+
+# 검증용 축소 이미지 배율 (DETAIL_SCALE x DETAIL_SCALE 상자 평균, 1920x1080이면 240x135)
+DETAIL_SCALE = 8
+
+# 같은 화면으로 간주할 검증용 축소 이미지의 최대 밝기 차이
+# 글자 하나가 바뀌어도 상자 평균이 수십 단계 바뀌므로, 압축/안티에일리어싱 잡음만 허용
+DETAIL_TOLERANCE = 4
+
+
+def compute_fingerprint(image: Image.Image, hash_size: int = HASH_SIZE) -> int:
+    """
+    이미지의 지각 해시(dHash) 계산
+    
+    이미지를 (hash_size + 1) x hash_size 그레이스케일로 축소한 뒤
+    가로로 인접한 픽셀의 밝기 변화 방향을 비트로 기록합니다.
+    
+    Args:
+        image: PIL 이미지
+        hash_size: 해시 크기
+    
+    Returns:
+        hash_size * hash_size 비트 정수
+    """
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+    pixels = small.tobytes()
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """두 지각 해시의 해밍 거리"""
+    return (a ^ b).bit_count()
+
+
+def compute_detail(image: Image.Image, scale: int = DETAIL_SCALE) -> np.ndarray:
+    """
+    복원 전 검증용 축소 흑백 이미지 계산
+    
+    Args:
+        image: PIL 이미지
+        scale: 축소 배율 (scale x scale 상자 평균)
+    
+    Returns:
+        (height / scale, width / scale) uint8 배열
+    """
+    return np.asarray(image.convert("L").reduce(scale))
+
+
+def same_detail(a: np.ndarray, b: np.ndarray, tolerance: int = DETAIL_TOLERANCE) -> bool:
+    """두 검증용 축소 이미지가 같은 화면인지 확인 (모든 상자의 밝기 차이가 tolerance 이하)"""
+    if a.shape != b.shape:
+        return False
+    return int(np.abs(a.astype(np.int16) - b).max(initial=0)) <= tolerance
+
+
+@dataclass
+class ScreenState:
+    """저장된 화면 상태 (인덱스 세대)"""
+    window_class: str
+    fingerprint: int
+    width: int
+    height: int
+    regions: List[dict]  # 영역 좌표는 인덱싱 영역 원점 기준 상대 좌표
+    grid_size: Optional[int] = None
+    detail: Optional[np.ndarray] = None  # 복원 전 검증용 축소 흑백 이미지 (compute_detail)
+    created: str = field(default_factory=lambda: datetime.now().isoformat())
+    hits: int = 0
+
+
+class ScreenStateLibrary:
+    """화면 상태 라이브러리 (LRU)"""
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, tolerance: int = DEFAULT_TOLERANCE):
+        """
+        Args:
+            max_entries: 보관할 최대 화면 상태 수
+            tolerance: 같은 화면으로 간주할 최대 해밍 거리
+        """
+        self.max_entries = max_entries
+        self.tolerance = tolerance
+        self._states: "OrderedDict[tuple, ScreenState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._rejected = 0
+        self._evictions = 0
+    
+    def lookup(
+        self,
+        window_class: str,
+        fingerprint: int,
+        width: int,
+        height: int,
+        detail: Optional[np.ndarray] = None,
+    ) -> Optional[ScreenState]:
+        """
+        허용 오차 안에서 일치하는 화면 상태 조회
+        
+        Args:
+            window_class: 윈도우 클래스
+            fingerprint: 현재 화면의 지각 해시
+            width: 인덱싱 영역 너비
+            height: 인덱싱 영역 높이
+            detail: 현재 화면의 검증용 축소 이미지 (지정하면 이 이미지까지 같은 상태만 반환)
+        
+        Returns:
+            가장 가까운 화면 상태 (없으면 None)
+        """
+        with self._lock:
+            candidates = []
+            for key, state in self._states.items():
+                if state.window_class != window_class or (state.width, state.height) != (width, height):
+                    continue
+                distance = hamming_distance(state.fingerprint, fingerprint)
+                if distance <= self.tolerance:
+                    candidates.append((distance, key))
+            
+            best_key = None
+            best_distance = None
+            for distance, key in sorted(candidates, key=lambda candidate: candidate[0]):
+                saved = self._states[key].detail
+                if detail is None or (saved is not None and same_detail(saved, detail)):
+                    best_key, best_distance = key, distance
+                    break
+                # 지각 해시는 비슷하지만 내용(글자 등)이 다른 화면
+                self._rejected += 1
+            
+            if best_key is None:
+                self._misses += 1
+                return None
+            
+            self._states.move_to_end(best_key)
+            state = self._states[best_key]
+            state.hits += 1
+            self._hits += 1
+            logger.info(f"화면 상태 적중: class={window_class}, 거리={best_distance}")
+            return state
+    
+    def store(
+        self,
+        window_class: str,
+        fingerprint: int,
+        width: int,
+        height: int,
+        regions: List[dict],
+        grid_size: Optional[int] = None,
+        detail: Optional[np.ndarray] = None,
+    ):
+        """
+        화면 상태 저장 (같은 키가 있으면 교체, 최대 개수를 넘으면 가장 오래 사용하지 않은 상태 제거)
+        
+        Args:
+            window_class: 윈도우 클래스
+            fingerprint: 화면의 지각 해시
+            width: 인덱싱 영역 너비
+            height: 인덱싱 영역 높이
+            regions: 인덱싱 영역 원점 기준 상대 좌표의 텍스트 영역 목록
+            grid_size: 인덱싱에 사용한 그리드 크기
+            detail: 화면의 검증용 축소 이미지 (compute_detail)
+        """
+        key = (window_class, fingerprint, width, height)
+        with self._lock:
+            self._states[key] = ScreenState(
+                window_class=window_class,
+                fingerprint=fingerprint,
+                width=width,
+                height=height,
+                regions=regions,
+                grid_size=grid_size,
+                detail=detail,
+            )
+            self._states.move_to_end(key)
+            while len(self._states) > self.max_entries:
+                self._states.popitem(last=False)
+                self._evictions += 1
+    
+    def clear(self):
+        """라이브러리 비우기"""
+        with self._lock:
+            self._states.clear()
+    
+    def get_stats(self) -> dict:
+        """
+        적중률 보고서
+        
+        Returns:
+            보관 개수, 적중/실패 횟수, 적중률, 검증 탈락 횟수, 제거 횟수를 포함한 딕셔너리
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "success": True,
+                "entries": len(self._states),
+                "max_entries": self.max_entries,
+                "tolerance": self.tolerance,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "rejected": self._rejected,
+                "evictions": self._evictions,
+            }
+
+
+# 전역 인스턴스
+_state_library = None
+
+
+def get_state_library() -> ScreenStateLibrary:
+    """화면 상태 라이브러리 싱글톤 인스턴스 반환"""
+    global _state_library
+    if _state_library is None:
+        _state_library = ScreenStateLibrary()
+    return _state_library
@@ -0,0 +1,234 @@
+"""
+MCP 도구 레지스트리
+도구마다 핸들러, 스키마, 컨트롤러 의존성, 미들웨어를 선언해 두고
+이름으로 바로 찾아 호출 (컨트롤러는 실제로 필요한 도구가 호출될 때만 생성)
+"""
+
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from mcp.types import Tool
+
+from .startup import get_startup_timer
+
+logger = logging.getLogger("mcp_desktop.tool_registry")
+
+# 미들웨어: (spec, arguments, call_next) -> 결과 딕셔너리
+# call_next()를 호출해 다음 미들웨어(마지막은 핸들러)를 실행합니다.
+Middleware = Callable[["ToolSpec", Dict[str, Any], Callable[[], Awaitable[dict]]], Awaitable[dict]]
+
+
+@dataclass
+class ToolSpec:
+    """도구 선언"""
+    name: str
+    handler: Callable[..., Any]  # handler(arguments, **deps, token=..., progress=...) -> dict
+    deps: Tuple[str, ...] = ()  # 핸들러에 키워드 인자로 전달할 컨트롤러 이름
+    description: Optional[str] = None  # None이면 list_tools에 노출하지 않는 내부 도구
+    input_schema: Dict[str, Any] = field(default_factory=lambda: {"type": "object", "properties": {}})
+    middleware: Tuple[Middleware, ...] = ()  # 이 도구에만 적용할 미들웨어 (공통 미들웨어 다음에 실행)
+    
+    @property
+    def listed(self) -> bool:
+        """list_tools에 노출되는 도구인지 여부"""
+        return self.description is not None
+    
+    @property
+    def is_async(self) -> bool:
+        """핸들러가 코루틴 함수인지 여부 (아니면 워커 스레드에서 실행)"""
+        return asyncio.iscoroutinefunction(self.handler)
+    
+    @property
+    def required(self) -> Tuple[str, ...]:
+        """필수 인자 목록"""
+        return tuple(self.input_schema.get("required", ()))
+
+
+class ToolRegistry:
+    """도구 레지스트리"""
+    
+    def __init__(self):
+        self._specs: Dict[str, ToolSpec] = {}
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._middleware: List[Middleware] = []
+        self._tools: Optional[List[Tool]] = None
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._seconds: Dict[str, float] = {}
+    
+    def register(self, spec: ToolSpec):
+        """도구 등록 (같은 이름이 있으면 교체)"""
+        self._specs[spec.name] = spec
+        self._tools = None
+    
+    def register_dependency(self, name: str, factory: Callable[[], Any]):
+        """
+        컨트롤러 의존성 등록
+        
+        Args:
+            name: 의존성 이름 (ToolSpec.deps에 사용)
+            factory: 컨트롤러를 반환하는 함수 (get_xxx_controller 등, 도구 호출 시점에 실행)
+        """
+        self._factories[name] = factory
+    
+    def use(self, middleware: Middleware):
+        """모든 도구에 적용할 공통 미들웨어 추가"""
+        self._middleware.append(middleware)
+    
+    def get(self, name: str) -> Optional[ToolSpec]:
+        """이름으로 도구 선언 조회"""
+        return self._specs.get(name)
+    
+    def list_tools(self) -> List[Tool]:
+        """
+        노출할 도구 목록 (처음 한 번만 생성하고 재사용)
+        
+        Returns:
+            Tool 객체 리스트 (등록 순서)
+        """
+        if self._tools is None:
+            self._tools = [
+                Tool(name=spec.name, description=spec.description, inputSchema=spec.input_schema)
+                for spec in self._specs.values()
+                if spec.listed
+            ]
+        return self._tools
+    
+    def resolve(self, deps: Tuple[str, ...]) -> Dict[str, Any]:
+        """의존성 이름 목록을 컨트롤러 인스턴스로 변환"""
+        return {name: self._factories[name]() for name in deps}
+    
+    async def call(self, name: str, arguments: Dict[str, Any], **context) -> Optional[dict]:
+        """
+        도구 호출
+        
+        Args:
+            name: 도구 이름
+            arguments: 도구 인자
+            **context: 핸들러에 그대로 전달할 호출 컨텍스트 (token, progress 등)
+        
+        Returns:
+            결과 딕셔너리 (등록되지 않은 도구면 None)
+        """
+        spec = self._specs.get(name)
+        if spec is None:
+            return None
+        
+        async def invoke() -> dict:
+            if spec.is_async:
+                return await spec.handler(arguments, **self.resolve(spec.deps), **context)
+            # 블로킹 핸들러는 의존성 생성까지 포함해 워커 스레드에서 실행
+            return await asyncio.to_thread(
+                lambda: spec.handler(arguments, **self.resolve(spec.deps), **context)
+            )
+        
+        call_next = invoke
+        for middleware in reversed((*self._middleware, *spec.middleware)):
+            call_next = self._bind(middleware, spec, arguments, call_next)
+        
+        started = time.perf_counter()
+        try:
+            result = await call_next()
+        except Exception:
+            self._record(name, time.perf_counter() - started, error=True)
+            raise
+        self._record(name, time.perf_counter() - started, error=not (result or {}).get("success", True))
+        return result
+    
+    @staticmethod
+    def _bind(
+        middleware: Middleware,
+        spec: ToolSpec,
+        arguments: Dict[str, Any],
+        call_next: Callable[[], Awaitable[dict]],
+    ) -> Callable[[], Awaitable[dict]]:
+        """미들웨어를 다음 단계에 연결"""
+        async def bound() -> dict:
+            return await middleware(spec, arguments, call_next)
+        return bound
+    
+    def _record(self, name: str, seconds: float, error: bool):
+        """도구별 호출 통계 기록"""
+        with self._lock:
+            self._calls[name] = self._calls.get(name, 0) + 1
+            self._seconds[name] = self._seconds.get(name, 0.0) + seconds
+            if error:
+                self._errors[name] = self._errors.get(name, 0) + 1
+    
+    def get_stats(self) -> dict:
+        """
+        도구별 호출 통계
+        
+        Returns:
+            도구 이름별 호출 수, 실패 수, 평균 소요 시간(ms)을 포함한 딕셔너리
+        """
+        with self._lock:
+            return {
+                name: {
+                    "calls": calls,
+                    "errors": self._errors.get(name, 0),
+                    "avg_ms": round(self._seconds[name] / calls * 1000, 2),
+                }
+                for name, calls in self._calls.items()
+            }
+
+
+def lazy_factory(module: str, attr: str) -> Callable[[], Any]:
+    """
+    처음 호출될 때 모듈을 import하는 의존성 팩토리 생성
+    
+    서버 시작과 list_tools에서는 pyautogui, Tesseract, SQLite를 로드하지 않고,
+    해당 컨트롤러가 필요한 도구가 처음 호출될 때 로드합니다.
+    
+    Args:
+        module: mcp_desktop 기준 상대 모듈 경로 (예: ".mouse")
+        attr: 컨트롤러를 반환하는 함수 이름 (예: "get_mouse_controller")
+    
+    Returns:
+        컨트롤러를 반환하는 함수
+    """
+    def factory():
+        getter = getattr(factory, "_getter", None)
+        if getter is None:
+            with get_startup_timer().phase(f"import:{module.lstrip('.')}"):
+                getter = getattr(importlib.import_module(module, __package__), attr)
+            factory._getter = getter
+        return getter()
+    return factory
+
+
+async def validate_required(spec: ToolSpec, arguments: Dict[str, Any], call_next) -> dict:
+    """필수 인자가 빠진 호출을 핸들러 실행 전에 거부하는 미들웨어"""
+    missing = [key for key in spec.required if key not in arguments]
+    if missing:
+        return {"success": False, "error": f"필수 인자가 없습니다: {', '.join(missing)}"}
+    return await call_next()
+
+
+async def log_timing(spec: ToolSpec, arguments: Dict[str, Any], call_next) -> dict:
+    """도구 실행 시간을 로그로 남기는 미들웨어"""
+    started = time.perf_counter()
+    try:
+        return await call_next()
+    finally:
+        logger.debug(f"도구 실행 시간: {spec.name} {(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+# 전역 인스턴스
+_tool_registry = None
+
+
+def get_tool_registry() -> ToolRegistry:
+    """도구 레지스트리 싱글톤 인스턴스 반환"""
+    global _tool_registry
+    if _tool_registry is None:
+        _tool_registry = ToolRegistry()
+        _tool_registry.use(log_timing)
+        _tool_registry.use(validate_required)
+    return _tool_registry
@@ -4,379 +4,383 @@ MCP Tools 정의 및 호출 처리
 
 import asyncio
 import logging
-from typing import Any, Dict, List
-from mcp.types import Tool, TextContent
-
-from .mouse import get_mouse_controller
-from .keyboard import get_keyboard_controller
-from .screenshot import get_screenshot_controller
-from .window import get_window_controller
-from .filesystem import get_filesystem_controller
-from .ocr import get_ocr_controller
-from .screen_indexer import get_screen_indexer
-from .smart_indexer import get_smart_indexer
+from typing import Any, Dict, List, Optional, Tuple
+from mcp.types import Tool
+
+from .progress import ProgressCallback
+from .responses import RESPONSE_PROPERTIES, encode, get_response_shaper, response_options
+from .startup import get_startup_timer
+from .utils import INPUT_DEVICE_LOCK
+from .cancellation import CancellationToken
+from .memo import get_query_memo
+from .images import ImagePart, extract_images, get_image_store
+from .tool_registry import ToolRegistry, ToolSpec, get_tool_registry, lazy_factory
 
 logger = logging.getLogger("mcp_desktop.tools")
 
+# 고수준 도구 공통 마감 시간 인자
+DEADLINE_PROPERTY = {
+    "type": "number",
+    "description": "마감 시간 (초, 선택적). 지나면 OCR을 멈추고 그때까지의 부분 결과를 저장한 뒤 반환합니다.",
+}
+
+# 고수준 도구 공통 진행 알림 옵션 (요청에 progressToken이 있을 때만 사용)
+STREAM_REGIONS_PROPERTY = {
+    "type": "boolean",
+    "default": False,
+    "description": "인덱싱 진행 알림에 새로 찾은 텍스트 영역을 포함할지 여부",
+}
+
+# find_element 메모 유효 시간 (초). 인덱스 세대가 그대로여도 입력 없이 화면이 바뀔 수 있으므로
+# 인덱스 신선도 확인(ensure_indexed)을 건너뛰는 시간을 짧게 제한
+FIND_ELEMENT_MEMO_TTL = 5.0
+
 
 def get_all_tools() -> List[Tool]:
     """
-    모든 MCP Tools 목록 반환 (고수준 도구만 노출)
+    모든 MCP Tools 목록 반환 (고수준 도구와 일부 유틸리티 도구만 노출)
+    
+    Tool 객체는 처음 요청될 때 한 번만 만들고 이후에는 그대로 재사용합니다.
     
     Returns:
         Tool 객체 리스트
     """
-    return [
-        # 고수준 통합 도구
-        Tool(
-            name="click_text",
-            description="화면에서 텍스트를 찾아서 클릭합니다. 인덱싱이 필요하면 자동으로 수행합니다.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "search_text": {
-                        "type": "string",
-                        "description": "클릭할 텍스트 (예: '저장', '확인', '로그인')",
-                    },
-                    "window_id": {
-                        "type": "integer",
-                        "description": "윈도우 핸들 (선택적). 지정하면 해당 윈도우에서만 검색합니다.",
-                    },
-                    "exact_match": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "정확히 일치하는지 여부 (False면 부분 일치)",
-                    },
-                    "button": {
-                        "type": "string",
-                        "enum": ["left", "right", "middle"],
-                        "default": "left",
-                        "description": "클릭 버튼",
-                    },
-                },
-                "required": ["search_text"],
-            },
-        ),
-        Tool(
-            name="type_text",
-            description="텍스트가 있는 위치를 찾아서 해당 위치에 텍스트를 입력합니다. 먼저 입력 필드를 찾아 클릭한 후 텍스트를 입력합니다.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "search_text": {
-                        "type": "string",
-                        "description": "입력 필드를 찾기 위한 텍스트 (예: '이름', '검색', '주소')",
-                    },
-                    "text": {
-                        "type": "string",
-                        "description": "입력할 텍스트",
-                    },
-                    "window_id": {
-                        "type": "integer",
-                        "description": "윈도우 핸들 (선택적). 지정하면 해당 윈도우에서만 검색합니다.",
-                    },
-                    "exact_match": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "정확히 일치하는지 여부 (False면 부분 일치)",
-                    },
-                },
-                "required": ["search_text", "text"],
-            },
-        ),
-        Tool(
-            name="find_element",
-            description="화면에서 텍스트나 요소를 찾아서 위치 정보를 반환합니다. 인덱싱이 필요하면 자동으로 수행합니다.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "search_text": {
-                        "type": "string",
-                        "description": "검색할 텍스트",
-                    },
-                    "window_id": {
-                        "type": "integer",
-                        "description": "윈도우 핸들 (선택적). 지정하면 해당 윈도우에서만 검색합니다.",
-                    },
-                    "exact_match": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "정확히 일치하는지 여부 (False면 부분 일치)",
-                    },
-                },
-                "required": ["search_text"],
-            },
-        ),
-        Tool(
-            name="interact_window",
-            description="특정 윈도우에서 일련의 작업을 수행합니다. 윈도우를 찾아 활성화한 후 여러 작업을 순차적으로 실행합니다.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "window_title": {
-                        "type": "string",
-                        "description": "윈도우 제목 (부분 일치)",
-                    },
-                    "actions": {
-                        "type": "array",
-                        "description": "수행할 작업 목록",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "type": {
-                                    "type": "string",
-                                    "enum": ["click_text", "type", "key", "hotkey"],
-                                    "description": "작업 유형",
-                                },
-                                "search_text": {
-                                    "type": "string",
-                                    "description": "click_text 작업 시 사용할 검색 텍스트",
-                                },
-                                "text": {
-                                    "type": "string",
-                                    "description": "type 작업 시 입력할 텍스트",
-                                },
-                                "key": {
-                                    "type": "string",
-                                    "description": "key 작업 시 누를 키",
-                                },
-                                "keys": {
-                                    "type": "array",
-                                    "items": {"type": "string"},
-                                    "description": "hotkey 작업 시 사용할 키 조합",
-                                },
-                            },
-                            "required": ["type"],
-                        },
-                    },
-                },
-                "required": ["window_title", "actions"],
-            },
-        ),
-        # 유틸리티 도구 (필요한 경우에만 사용)
-        Tool(
-            name="window_find",
-            description="윈도우 찾기",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "title": {"type": "string", "description": "윈도우 제목 (부분 일치)"},
-                    "class_name": {"type": "string", "description": "윈도우 클래스명"},
-                },
-            },
-        ),
-        Tool(
-            name="filesystem_read_file",
-            description="파일 읽기",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "file_path": {"type": "string", "description": "파일 경로"},
-                    "encoding": {"type": "string", "default": "utf-8", "description": "인코딩"},
-                },
-                "required": ["file_path"],
-            },
-        ),
-        Tool(
-            name="filesystem_list_directory",
-            description="디렉토리 목록 조회",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "dir_path": {
-                        "type": "string",
-                        "default": ".",
-                        "description": "디렉토리 경로",
-                    },
-                },
-            },
-        ),
-    ]
+    return get_tool_registry().list_tools()
 
 
-async def call_tool(name: str, arguments: Dict[str, Any]) -> str:
+async def call_tool(
+    name: str,
+    arguments: Dict[str, Any],
+    progress: Optional[ProgressCallback] = None,
+) -> str:
     """
     Tool 호출 처리
     
+    이미지는 JSON 안의 base64 문자열로 반환합니다 (image_output이 file/shm이면 핸들).
+    
     Args:
         name: Tool 이름
         arguments: Tool 인자
+        progress: 인덱싱 진행 콜백 (progress.ProgressReporter 등, None이면 알림 없음)
     
     Returns:
         결과 JSON 문자열
     """
-    import json
+    output = arguments.get("image_output", "base64")
+    text, _ = await call_tool_with_images(
+        name,
+        {**arguments, "image_output": "base64" if output == "content" else output},
+        progress=progress,
+    )
+    return text
+
+
+async def call_tool_with_images(
+    name: str,
+    arguments: Dict[str, Any],
+    progress: Optional[ProgressCallback] = None,
+) -> Tuple[str, List[ImagePart]]:
+    """
+    Tool 호출 처리 (이미지는 MCP 이미지 콘텐츠로 분리)
     
+    Args:
+        name: Tool 이름
+        arguments: Tool 인자 (image_output: content, base64, file, shm, 기본값 content)
+        progress: 인덱싱 진행 콜백 (progress.ProgressReporter 등, None이면 알림 없음)
+    
+    Returns:
+        (결과 JSON 문자열, (base64 데이터, MIME 타입) 이미지 목록)
+    """
+    # 호출별 취소 토큰 (deadline_seconds 인자 또는 클라이언트 취소 시 인덱싱 중단)
+    token = CancellationToken(arguments.get("deadline_seconds"))
     try:
-        mouse = get_mouse_controller()
-        keyboard = get_keyboard_controller()
-        screenshot = get_screenshot_controller()
-        window = get_window_controller()
-        filesystem = get_filesystem_controller()
-        ocr = get_ocr_controller()
-        screen_indexer = get_screen_indexer()
-        smart_indexer = get_smart_indexer()
-        
-        result = None
-        
-        # 고수준 통합 도구
-        if name == "click_text":
-            result = _handle_click_text(
-                arguments, mouse, screen_indexer, smart_indexer
-            )
-        elif name == "type_text":
-            result = _handle_type_text(
-                arguments, mouse, keyboard, screen_indexer, smart_indexer
-            )
-        elif name == "find_element":
-            result = _handle_find_element(
-                arguments, screen_indexer, smart_indexer
-            )
-        elif name == "interact_window":
-            result = await _handle_interact_window(
-                arguments, mouse, keyboard, window, screen_indexer, smart_indexer
-            )
-        
-        # 저수준 도구들 (내부적으로만 사용, 고수준 도구에서 호출)
-        elif name == "mouse_click":
-            result = mouse.click(
-                x=arguments.get("x"),
-                y=arguments.get("y"),
-                button=arguments.get("button", "left"),
-                clicks=arguments.get("clicks", 1),
-                interval=arguments.get("interval", 0.0),
-            )
-        elif name == "mouse_move":
-            result = mouse.move(
-                x=arguments["x"],
-                y=arguments["y"],
-                duration=arguments.get("duration", 0.0),
-            )
-        elif name == "mouse_drag":
-            result = mouse.drag(
-                start_x=arguments["start_x"],
-                start_y=arguments["start_y"],
-                end_x=arguments["end_x"],
-                end_y=arguments["end_y"],
-                duration=arguments.get("duration", 0.5),
-                button=arguments.get("button", "left"),
-            )
-        elif name == "mouse_scroll":
-            result = mouse.scroll(
-                x=arguments.get("x"),
-                y=arguments.get("y"),
-                clicks=arguments.get("clicks", 3),
-            )
-        elif name == "mouse_get_position":
-            result = mouse.get_position()
+        # 도구 이름으로 바로 핸들러를 찾고, 선언된 컨트롤러만 생성하여 전달
+        # 블로킹 핸들러(pyautogui, Tesseract, SQLite)는 워커 스레드에서 실행하여
+        # 실행 중에도 이벤트 루프가 다른 요청(list_tools, 취소 등)에 응답할 수 있도록 함
+        result = await get_tool_registry().call(name, arguments, token=token, progress=progress)
+        if result is None:
+            return encode({"error": f"알 수 없는 도구: {name}"}), []
         
-        # 키보드 제어
-        elif name == "keyboard_type":
-            result = keyboard.type(
-                text=arguments["text"],
-                interval=arguments.get("interval", 0.0),
-            )
-        elif name == "keyboard_press":
-            result = keyboard.press(
-                key=arguments["key"],
-                presses=arguments.get("presses", 1),
-                interval=arguments.get("interval", 0.0),
-            )
-        elif name == "keyboard_hotkey":
-            result = keyboard.hotkey(*arguments["keys"])
+        # 이미지는 텍스트 JSON에서 떼어내 이미지 콘텐츠나 파일/공유 메모리 핸들로 전달
+        result, images = extract_images(result, arguments.get("image_output", "content"))
         
-        # 스크린샷
-        # 주의: screenshot_full은 컨텍스트를 많이 소모하므로 제공하지 않음
-        # 대신 screen_index를 사용하여 텍스트 기반으로 작업하세요
-        elif name == "screenshot_region":
-            result = screenshot.capture_region(
-                x=arguments["x"],
-                y=arguments["y"],
-                width=arguments["width"],
-                height=arguments["height"],
-                format=arguments.get("format", "PNG"),
-            )
-        elif name == "screenshot_get_size":
-            result = screenshot.get_screen_size()
-        elif name == "screenshot_get_pixel_color":
-            result = screenshot.get_pixel_color(x=arguments["x"], y=arguments["y"])
-        
-        # 윈도우 관리
-        elif name == "window_find":
-            result = window.find_window(
-                title=arguments.get("title"),
-                class_name=arguments.get("class_name"),
-            )
-        elif name == "window_activate":
-            result = window.activate_window(hwnd=arguments["hwnd"])
-        elif name == "window_get_info":
-            result = window.get_window_info(hwnd=arguments["hwnd"])
-        
-        # 파일 시스템
-        elif name == "filesystem_read_file":
-            result = filesystem.read_file(
-                file_path=arguments["file_path"],
-                encoding=arguments.get("encoding", "utf-8"),
-            )
-        elif name == "filesystem_list_directory":
-            result = filesystem.list_directory(dir_path=arguments.get("dir_path", "."))
-        elif name == "filesystem_get_file_info":
-            result = filesystem.get_file_info(file_path=arguments["file_path"])
-        
-        # OCR
-        elif name == "ocr_extract_from_image":
-            result = ocr.extract_text_from_image(
-                image_base64=arguments["image_base64"],
-                lang=arguments.get("lang", "kor+eng"),
-            )
-        elif name == "ocr_extract_from_screenshot":
-            result = ocr.extract_text_from_screenshot(
-                x=arguments.get("x"),
-                y=arguments.get("y"),
-                width=arguments.get("width"),
-                height=arguments.get("height"),
-                lang=arguments.get("lang", "kor+eng"),
-            )
-        
-        # 화면 인덱싱
-        elif name == "screen_index":
-            result = screen_indexer.index_screen(
-                grid_size=arguments.get("grid_size"),
-            )
-        elif name == "screen_index_window":
-            result = screen_indexer.index_window(
-                hwnd=arguments["hwnd"],
-                grid_size=arguments.get("grid_size"),
-            )
-        elif name == "screen_find_text":
-            result = screen_indexer.find_text(
-                search_text=arguments["search_text"],
-                exact_match=arguments.get("exact_match", False),
-                window_id=arguments.get("window_id"),
-            )
-        elif name == "screen_get_indexed_texts":
-            result = screen_indexer.get_indexed_texts(
-                limit=arguments.get("limit", 100),
-                window_id=arguments.get("window_id"),
-            )
-        
-        else:
-            return json.dumps({"error": f"알 수 없는 도구: {name}"})
-        
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        # 압축 JSON + 필드 선택/열 기반 목록/바이트 예산 적용
+        return get_response_shaper().shape(result, **response_options(arguments)), images
     
+    except asyncio.CancelledError:
+        # 클라이언트가 요청을 취소하면 워커 스레드의 OCR도 다음 타일에서 멈추도록 함
+        token.cancel()
+        logger.info(f"도구 호출 취소됨: {name}")
+        raise
     except Exception as e:
         logger.error(f"도구 호출 오류 ({name}): {e}", exc_info=True)
-        return json.dumps({"error": str(e)}, ensure_ascii=False)
+        return encode({"error": str(e)}), []
+
+
+# 저수준 도구 핸들러 함수들 (블로킹, 워커 스레드에서 실행)
+# 고수준 도구에서 사용하는 컨트롤러 기능을 직접 호출할 때 사용
+
+def _mouse_click(arguments: Dict[str, Any], mouse, **context) -> dict:
+    return mouse.click(
+        x=arguments.get("x"),
+        y=arguments.get("y"),
+        button=arguments.get("button", "left"),
+        clicks=arguments.get("clicks", 1),
+        interval=arguments.get("interval", 0.0),
+    )
+
+
+def _mouse_move(arguments: Dict[str, Any], mouse, **context) -> dict:
+    return mouse.move(
+        x=arguments["x"],
+        y=arguments["y"],
+        duration=arguments.get("duration", 0.0),
+    )
+
+
+def _mouse_drag(arguments: Dict[str, Any], mouse, **context) -> dict:
+    return mouse.drag(
+        start_x=arguments["start_x"],
+        start_y=arguments["start_y"],
+        end_x=arguments["end_x"],
+        end_y=arguments["end_y"],
+        duration=arguments.get("duration", 0.5),
+        button=arguments.get("button", "left"),
+    )
+
+
+def _mouse_scroll(arguments: Dict[str, Any], mouse, **context) -> dict:
+    return mouse.scroll(
+        x=arguments.get("x"),
+        y=arguments.get("y"),
+        clicks=arguments.get("clicks", 3),
+    )
+
+
+def _mouse_get_position(arguments: Dict[str, Any], mouse, **context) -> dict:
+    return mouse.get_position()
+
+
+def _keyboard_type(arguments: Dict[str, Any], keyboard, **context) -> dict:
+    return keyboard.type(
+        text=arguments["text"],
+        interval=arguments.get("interval", 0.0),
+    )
+
+
+def _keyboard_press(arguments: Dict[str, Any], keyboard, **context) -> dict:
+    return keyboard.press(
+        key=arguments["key"],
+        presses=arguments.get("presses", 1),
+        interval=arguments.get("interval", 0.0),
+    )
+
+
+def _keyboard_hotkey(arguments: Dict[str, Any], keyboard, **context) -> dict:
+    return keyboard.hotkey(*arguments["keys"])
+
+
+# 주의: screenshot_full은 컨텍스트를 많이 소모하므로 제공하지 않음
+# 대신 screen_index를 사용하여 텍스트 기반으로 작업하세요
+def _screenshot_region(arguments: Dict[str, Any], screenshot, **context) -> dict:
+    options = dict(
+        format=arguments.get("format", "PNG"),
+        quality=arguments.get("quality", 80),
+        compress_level=arguments.get("compress_level", 6),
+        grayscale=arguments.get("grayscale", False),
+        max_dimension=arguments.get("max_dimension"),
+        max_bytes=arguments.get("max_image_bytes"),
+    )
+    region = dict(x=arguments["x"], y=arguments["y"], width=arguments["width"], height=arguments["height"])
+    if arguments.get("delta"):
+        # 같은 영역을 반복 캡처할 때 바뀐 사각형만 전송
+        return screenshot.capture_region_delta(
+            **region,
+            key=arguments.get("delta_key", "default"),
+            since=arguments.get("since"),
+            **options,
+        )
+    return screenshot.capture_region(**region, **options)
+
+
+def _screenshot_get_size(arguments: Dict[str, Any], screenshot, **context) -> dict:
+    return screenshot.get_screen_size()
+
+
+def _screenshot_get_pixel_color(arguments: Dict[str, Any], screenshot, **context) -> dict:
+    return screenshot.get_pixel_color(x=arguments["x"], y=arguments["y"])
+
+
+def _screenshot_get_pixel_colors(arguments: Dict[str, Any], screenshot, **context) -> dict:
+    return screenshot.get_pixel_colors(points=arguments["points"])
+
+
+def _screenshot_sample_grid(arguments: Dict[str, Any], screenshot, **context) -> dict:
+    return screenshot.sample_grid(
+        x=arguments["x"],
+        y=arguments["y"],
+        width=arguments["width"],
+        height=arguments["height"],
+        step=arguments.get("step", 10),
+    )
+
+
+def _handle_find_image(arguments: Dict[str, Any], screenshot, **context) -> dict:
+    """화면에서 템플릿 이미지를 찾는 고수준 도구 핸들러"""
+    return screenshot.find_image(
+        template_base64=arguments.get("template_base64"),
+        template_path=arguments.get("template_path"),
+        x=arguments.get("x"),
+        y=arguments.get("y"),
+        width=arguments.get("width"),
+        height=arguments.get("height"),
+        threshold=arguments.get("threshold", 0.8),
+        max_results=arguments.get("max_results", 5),
+    )
+
+
+def _handle_find_color_regions(arguments: Dict[str, Any], screenshot, **context) -> dict:
+    """화면에서 지정한 색의 영역을 찾는 고수준 도구 핸들러"""
+    return screenshot.find_color_regions(
+        color=arguments["color"],
+        tolerance=arguments.get("tolerance", 0),
+        x=arguments.get("x"),
+        y=arguments.get("y"),
+        width=arguments.get("width"),
+        height=arguments.get("height"),
+        min_area=arguments.get("min_area", 1),
+        max_results=arguments.get("max_results", 50),
+    )
+
+
+def _window_find(arguments: Dict[str, Any], window, **context) -> dict:
+    return window.find_window(
+        title=arguments.get("title"),
+        class_name=arguments.get("class_name"),
+    )
+
+
+def _window_activate(arguments: Dict[str, Any], window, **context) -> dict:
+    return window.activate_window(hwnd=arguments["hwnd"])
+
+
+def _window_get_info(arguments: Dict[str, Any], window, **context) -> dict:
+    return window.get_window_info(hwnd=arguments["hwnd"])
+
+
+def _filesystem_read_file(arguments: Dict[str, Any], filesystem, **context) -> dict:
+    return filesystem.read_file(
+        file_path=arguments["file_path"],
+        encoding=arguments.get("encoding", "utf-8"),
+    )
+
+
+def _filesystem_list_directory(arguments: Dict[str, Any], filesystem, **context) -> dict:
+    return filesystem.list_directory(dir_path=arguments.get("dir_path", "."))
+
+
+def _filesystem_get_file_info(arguments: Dict[str, Any], filesystem, **context) -> dict:
+    return filesystem.get_file_info(file_path=arguments["file_path"])
+
+
+def _ocr_extract_from_image(arguments: Dict[str, Any], ocr, **context) -> dict:
+    return ocr.extract_text_from_image(
+        image_base64=arguments.get("image_base64"),
+        lang=arguments.get("lang", "kor+eng"),
+        path=arguments.get("path"),
+        shm_name=arguments.get("shm_name"),
+        shm_size=arguments.get("shm_size"),
+        shm_shape=arguments.get("shm_shape"),
+    )
+
+
+def _ocr_extract_from_screenshot(arguments: Dict[str, Any], ocr, ocr_scheduler, **context) -> dict:
+    region = [arguments.get(key) for key in ("x", "y", "width", "height")]
+    if all(value is not None for value in region):
+        # 영역 OCR은 스케줄러를 거쳐 백그라운드 작업보다 먼저 처리
+        return ocr_scheduler.ocr_region(
+            *region,
+            lang=arguments.get("lang", "kor+eng"),
+        )
+    return ocr.extract_text_from_screenshot(
+        x=arguments.get("x"),
+        y=arguments.get("y"),
+        width=arguments.get("width"),
+        height=arguments.get("height"),
+        lang=arguments.get("lang", "kor+eng"),
+    )
+
+
+def _screen_index(
+    arguments: Dict[str, Any],
+    screen_indexer,
+    token: Optional[CancellationToken] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> dict:
+    return screen_indexer.index_screen(
+        grid_size=arguments.get("grid_size"),
+        token=token,
+        progress=progress,
+    )
+
+
+def _screen_index_window(
+    arguments: Dict[str, Any],
+    screen_indexer,
+    token: Optional[CancellationToken] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> dict:
+    return screen_indexer.index_window(
+        hwnd=arguments["hwnd"],
+        grid_size=arguments.get("grid_size"),
+        token=token,
+        progress=progress,
+    )
+
+
+def _screen_find_text(arguments: Dict[str, Any], screen_indexer, **context) -> dict:
+    return screen_indexer.find_text(
+        search_text=arguments["search_text"],
+        exact_match=arguments.get("exact_match", False),
+        window_id=arguments.get("window_id"),
+        limit=arguments.get("limit", 10),
+        cursor=arguments.get("cursor"),
+        count_only=arguments.get("count_only", False),
+    )
+
+
+def _screen_get_indexed_texts(arguments: Dict[str, Any], screen_indexer, **context) -> dict:
+    return screen_indexer.get_indexed_texts(
+        limit=arguments.get("limit", 100),
+        window_id=arguments.get("window_id"),
+        cursor=arguments.get("cursor"),
+        count_only=arguments.get("count_only", False),
+    )
+
+
+def _screen_index_stats(arguments: Dict[str, Any], smart_indexer, background_indexer, **context) -> dict:
+    stats = smart_indexer.get_stats()
+    stats["tools"] = get_tool_registry().get_stats()
+    stats["startup"] = get_startup_timer().report()
+    stats["responses"] = get_response_shaper().get_stats()
+    stats["memo"] = get_query_memo().get_stats()
+    stats["image_handles"] = get_image_store().get_stats()
+    stats["background_indexer"] = background_indexer.get_stats()
+    return stats
+
+
+def _response_continue(arguments: Dict[str, Any], **context) -> dict:
+    return get_response_shaper().resume(arguments["cursor"])
 
 
 # 고수준 도구 핸들러 함수들
 
-def _handle_click_text(
+async def _handle_click_text(
     arguments: Dict[str, Any],
     mouse,
-    screen_indexer,
     smart_indexer,
+    token: Optional[CancellationToken] = None,
+    progress: Optional[ProgressCallback] = None,
 ) -> dict:
     """
     텍스트를 찾아서 클릭하는 고수준 도구 핸들러
@@ -384,8 +388,9 @@ def _handle_click_text(
     Args:
         arguments: 도구 인자
         mouse: 마우스 컨트롤러
-        screen_indexer: 화면 인덱서
         smart_indexer: 스마트 인덱서
+        token: 취소 토큰
+        progress: 인덱싱 진행 콜백
     
     Returns:
         작업 결과 딕셔너리
@@ -396,25 +401,20 @@ def _handle_click_text(
         exact_match = arguments.get("exact_match", False)
         button = arguments.get("button", "left")
         
-        # 인덱싱 보장
-        index_result = smart_indexer.ensure_indexed(window_id=window_id)
-        if not index_result.get("success"):
-            return {
-                "success": False,
-                "error": f"인덱싱 실패: {index_result.get('error')}",
-            }
-        
-        # 텍스트 검색
-        find_result = screen_indexer.find_text(
+        # 텍스트 검색 (인덱스가 없거나 오래되었으면 찾는 즉시 OCR을 중단하는 타겟 검색)
+        find_result = await smart_indexer.locate_text(
             search_text=search_text,
-            exact_match=exact_match,
             window_id=window_id,
+            exact_match=exact_match,
+            token=token,
+            progress=progress,
         )
         
         if not find_result.get("success"):
             return {
                 "success": False,
                 "error": f"텍스트 검색 실패: {find_result.get('error')}",
+                "cancelled": find_result.get("cancelled", False),
             }
         
         regions = find_result.get("regions", [])
@@ -431,7 +431,7 @@ def _handle_click_text(
         center_y = first_region["center_y"]
         
         # 클릭 수행
-        click_result = mouse.click(x=center_x, y=center_y, button=button)
+        click_result = await asyncio.to_thread(mouse.click, x=center_x, y=center_y, button=button)
         
         if not click_result.get("success"):
             return click_result
@@ -449,12 +449,13 @@ def _handle_click_text(
         return {"success": False, "error": str(e)}
 
 
-def _handle_type_text(
+async def _handle_type_text(
     arguments: Dict[str, Any],
     mouse,
     keyboard,
-    screen_indexer,
     smart_indexer,
+    token: Optional[CancellationToken] = None,
+    progress: Optional[ProgressCallback] = None,
 ) -> dict:
     """
     텍스트 위치를 찾아서 입력하는 고수준 도구 핸들러
@@ -463,8 +464,9 @@ def _handle_type_text(
         arguments: 도구 인자
         mouse: 마우스 컨트롤러
         keyboard: 키보드 컨트롤러
-        screen_indexer: 화면 인덱서
         smart_indexer: 스마트 인덱서
+        token: 취소 토큰
+        progress: 인덱싱 진행 콜백
     
     Returns:
         작업 결과 딕셔너리
@@ -475,25 +477,20 @@ def _handle_type_text(
         window_id = arguments.get("window_id")
         exact_match = arguments.get("exact_match", False)
         
-        # 인덱싱 보장
-        index_result = smart_indexer.ensure_indexed(window_id=window_id)
-        if not index_result.get("success"):
-            return {
-                "success": False,
-                "error": f"인덱싱 실패: {index_result.get('error')}",
-            }
-        
-        # 입력 필드 찾기
-        find_result = screen_indexer.find_text(
+        # 입력 필드 찾기 (인덱스가 없거나 오래되었으면 찾는 즉시 OCR을 중단하는 타겟 검색)
+        find_result = await smart_indexer.locate_text(
             search_text=search_text,
-            exact_match=exact_match,
             window_id=window_id,
+            exact_match=exact_match,
+            token=token,
+            progress=progress,
         )
         
         if not find_result.get("success"):
             return {
                 "success": False,
                 "error": f"입력 필드 검색 실패: {find_result.get('error')}",
+                "cancelled": find_result.get("cancelled", False),
             }
         
         regions = find_result.get("regions", [])
@@ -509,16 +506,22 @@ def _handle_type_text(
         center_x = first_region["center_x"]
         center_y = first_region["center_y"]
         
-        # 클릭 후 입력
-        click_result = mouse.click(x=center_x, y=center_y)
+        # 클릭 후 입력 (다른 도구 호출의 입력이 끼어들지 않도록 입력 장치 잠금을 유지)
+        def click_and_type():
+            with INPUT_DEVICE_LOCK:
+                click_result = mouse.click(x=center_x, y=center_y)
+                if not click_result.get("success"):
+                    return click_result, None
+                return click_result, keyboard.type(text=text)
+        
+        click_result, type_result = await asyncio.to_thread(click_and_type)
         if not click_result.get("success"):
             return {
                 "success": False,
                 "error": f"클릭 실패: {click_result.get('error')}",
             }
         
-        # 텍스트 입력
-        type_result = keyboard.type(text=text)
+        # 텍스트 입력 결과
         if not type_result.get("success"):
             return {
                 "success": False,
@@ -542,14 +545,20 @@ def _handle_find_element(
     arguments: Dict[str, Any],
     screen_indexer,
     smart_indexer,
+    token: Optional[CancellationToken] = None,
+    progress: Optional[ProgressCallback] = None,
 ) -> dict:
     """
     화면에서 요소를 찾는 고수준 도구 핸들러
     
+    마감 시간이 지나 인덱싱이 중단되면 그때까지 인덱싱된 영역에서 검색하고 partial=True를 표시합니다.
+    
     Args:
         arguments: 도구 인자
         screen_indexer: 화면 인덱서
         smart_indexer: 스마트 인덱서
+        token: 취소 토큰
+        progress: 인덱싱 진행 콜백
     
     Returns:
         작업 결과 딕셔너리
@@ -560,12 +569,14 @@ def _handle_find_element(
         exact_match = arguments.get("exact_match", False)
         
         # 인덱싱 보장
-        index_result = smart_indexer.ensure_indexed(window_id=window_id)
+        index_result = smart_indexer.ensure_indexed(window_id=window_id, token=token, progress=progress)
         if not index_result.get("success"):
             return {
                 "success": False,
                 "error": f"인덱싱 실패: {index_result.get('error')}",
+                "cancelled": index_result.get("cancelled", False),
             }
+        partial = index_result.get("partial", False)
         
         # 텍스트 검색
         find_result = screen_indexer.find_text(
@@ -582,14 +593,18 @@ def _handle_find_element(
             return {
                 "success": True,
                 "found": False,
+                "partial": partial,
                 "search_text": search_text,
+                "version": find_result.get("version"),
                 "message": f"텍스트를 찾을 수 없습니다: '{search_text}'",
             }
         
         return {
             "success": True,
             "found": True,
+            "partial": partial,
             "search_text": search_text,
+            "version": find_result.get("version"),
             "count": len(regions),
             "regions": regions,
         }
@@ -604,19 +619,23 @@ async def _handle_interact_window(
     mouse,
     keyboard,
     window,
-    screen_indexer,
     smart_indexer,
+    token: Optional[CancellationToken] = None,
+    progress: Optional[ProgressCallback] = None,
 ) -> dict:
     """
     윈도우에서 일련의 작업을 수행하는 고수준 도구 핸들러
     
+    마감 시간이 지나면 남은 작업을 수행하지 않고 그때까지의 결과를 반환합니다.
+    
     Args:
         arguments: 도구 인자
         mouse: 마우스 컨트롤러
         keyboard: 키보드 컨트롤러
         window: 윈도우 컨트롤러
-        screen_indexer: 화면 인덱서
         smart_indexer: 스마트 인덱서
+        token: 취소 토큰
+        progress: 인덱싱 진행 콜백
     
     Returns:
         작업 결과 딕셔너리
@@ -626,7 +645,7 @@ async def _handle_interact_window(
         actions = arguments["actions"]
         
         # 윈도우 찾기
-        find_result = window.find_window(title=window_title)
+        find_result = await asyncio.to_thread(window.find_window, title=window_title)
         if not find_result.get("success"):
             return {
                 "success": False,
@@ -645,7 +664,7 @@ async def _handle_interact_window(
         hwnd = target_window["hwnd"]
         
         # 윈도우 활성화
-        activate_result = window.activate_window(hwnd=hwnd)
+        activate_result = await asyncio.to_thread(window.activate_window, hwnd=hwnd)
         if not activate_result.get("success"):
             return {
                 "success": False,
@@ -653,11 +672,17 @@ async def _handle_interact_window(
             }
         
         # 윈도우 인덱싱 보장
-        index_result = smart_indexer.ensure_indexed(window_id=hwnd)
+        index_result = await asyncio.to_thread(
+            smart_indexer.ensure_indexed,
+            window_id=hwnd,
+            token=token,
+            progress=progress,
+        )
         if not index_result.get("success"):
             return {
                 "success": False,
                 "error": f"윈도우 인덱싱 실패: {index_result.get('error')}",
+                "cancelled": index_result.get("cancelled", False),
             }
         
         # 작업 수행
@@ -665,6 +690,15 @@ async def _handle_interact_window(
         for i, action in enumerate(actions):
             action_type = action.get("type")
             
+            if token is not None and token.is_cancelled():
+                results.append({
+                    "index": i,
+                    "success": False,
+                    "cancelled": True,
+                    "error": f"작업 취소됨 ({token.reason})",
+                })
+                break
+            
             try:
                 if action_type == "click_text":
                     search_text = action.get("search_text")
@@ -676,7 +710,7 @@ async def _handle_interact_window(
                         })
                         continue
                     
-                    click_result = _handle_click_text(
+                    click_result = await _handle_click_text(
                         {
                             "search_text": search_text,
                             "window_id": hwnd,
@@ -684,8 +718,9 @@ async def _handle_interact_window(
                             "button": action.get("button", "left"),
                         },
                         mouse,
-                        screen_indexer,
                         smart_indexer,
+                        token,
+                        progress,
                     )
                     results.append({"index": i, "type": "click_text", **click_result})
                 
@@ -699,7 +734,7 @@ async def _handle_interact_window(
                         })
                         continue
                     
-                    type_result = keyboard.type(text=text)
+                    type_result = await asyncio.to_thread(keyboard.type, text=text)
                     results.append({"index": i, "type": "type", **type_result})
                 
                 elif action_type == "key":
@@ -712,7 +747,7 @@ async def _handle_interact_window(
                         })
                         continue
                     
-                    key_result = keyboard.press(key=key)
+                    key_result = await asyncio.to_thread(keyboard.press, key=key)
                     results.append({"index": i, "type": "key", **key_result})
                 
                 elif action_type == "hotkey":
@@ -725,7 +760,7 @@ async def _handle_interact_window(
                         })
                         continue
                     
-                    hotkey_result = keyboard.hotkey(*keys)
+                    hotkey_result = await asyncio.to_thread(keyboard.hotkey, *keys)
                     results.append({"index": i, "type": "hotkey", **hotkey_result})
                 
                 else:
@@ -757,3 +792,355 @@ async def _handle_interact_window(
         logger.error(f"interact_window 처리 실패: {e}", exc_info=True)
         return {"success": False, "error": str(e)}
 
+
+# 도구 등록
+
+def _index_version(arguments: Dict[str, Any]) -> Optional[str]:
+    """조회 도구 인자의 window_id에 해당하는 현재 인덱스 세대 (메모 키용)"""
+    screen_indexer = get_tool_registry().resolve(("screen_indexer",))["screen_indexer"]
+    return screen_indexer.get_version(arguments.get("window_id"))
+
+
+def _register_tools(registry: ToolRegistry):
+    """
+    컨트롤러 의존성과 도구를 레지스트리에 등록
+    
+    list_tools에는 description이 있는 도구만 등록 순서대로 노출됩니다.
+    
+    Args:
+        registry: 도구 레지스트리
+    """
+    memo = get_query_memo()
+    # 읽기 전용 조회 도구는 같은 인자와 같은 인덱스 세대면 이전 결과를 재사용하고,
+    # 화면을 바꿀 수 있는 입력 도구가 실행되면 메모를 모두 버림
+    memoized = (memo.middleware(_index_version),)
+    invalidates = (memo.invalidate_after,)
+    
+    # 컨트롤러 모듈은 해당 의존성을 선언한 도구가 처음 호출될 때 import
+    registry.register_dependency("mouse", lazy_factory(".mouse", "get_mouse_controller"))
+    registry.register_dependency("keyboard", lazy_factory(".keyboard", "get_keyboard_controller"))
+    registry.register_dependency("screenshot", lazy_factory(".screenshot", "get_screenshot_controller"))
+    registry.register_dependency("window", lazy_factory(".window", "get_window_controller"))
+    registry.register_dependency("filesystem", lazy_factory(".filesystem", "get_filesystem_controller"))
+    registry.register_dependency("ocr", lazy_factory(".ocr", "get_ocr_controller"))
+    registry.register_dependency("ocr_scheduler", lazy_factory(".ocr_scheduler", "get_ocr_scheduler"))
+    registry.register_dependency("screen_indexer", lazy_factory(".screen_indexer", "get_screen_indexer"))
+    registry.register_dependency("smart_indexer", lazy_factory(".smart_indexer", "get_smart_indexer"))
+    registry.register_dependency(
+        "background_indexer", lazy_factory(".background_indexer", "get_background_indexer")
+    )
+    
+    for spec in (
+        # 고수준 통합 도구
+        ToolSpec(
+            name="click_text",
+            handler=_handle_click_text,
+            middleware=invalidates,
+            deps=("mouse", "smart_indexer"),
+            description="화면에서 텍스트를 찾아서 클릭합니다. 인덱싱이 필요하면 자동으로 수행합니다.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "search_text": {
+                        "type": "string",
+                        "description": "클릭할 텍스트 (예: '저장', '확인', '로그인')",
+                    },
+                    "window_id": {
+                        "type": "integer",
+                        "description": "윈도우 핸들 (선택적). 지정하면 해당 윈도우에서만 검색합니다.",
+                    },
+                    "exact_match": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "정확히 일치하는지 여부 (False면 부분 일치)",
+                    },
+                    "button": {
+                        "type": "string",
+                        "enum": ["left", "right", "middle"],
+                        "default": "left",
+                        "description": "클릭 버튼",
+                    },
+                    "deadline_seconds": DEADLINE_PROPERTY,
+                    "stream_regions": STREAM_REGIONS_PROPERTY,
+                    **RESPONSE_PROPERTIES,
+                },
+                "required": ["search_text"],
+            },
+        ),
+        ToolSpec(
+            name="type_text",
+            handler=_handle_type_text,
+            middleware=invalidates,
+            deps=("mouse", "keyboard", "smart_indexer"),
+            description="텍스트가 있는 위치를 찾아서 해당 위치에 텍스트를 입력합니다. 먼저 입력 필드를 찾아 클릭한 후 텍스트를 입력합니다.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "search_text": {
+                        "type": "string",
+                        "description": "입력 필드를 찾기 위한 텍스트 (예: '이름', '검색', '주소')",
+                    },
+                    "text": {
+                        "type": "string",
+                        "description": "입력할 텍스트",
+                    },
+                    "window_id": {
+                        "type": "integer",
+                        "description": "윈도우 핸들 (선택적). 지정하면 해당 윈도우에서만 검색합니다.",
+                    },
+                    "exact_match": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "정확히 일치하는지 여부 (False면 부분 일치)",
+                    },
+                    "deadline_seconds": DEADLINE_PROPERTY,
+                    "stream_regions": STREAM_REGIONS_PROPERTY,
+                    **RESPONSE_PROPERTIES,
+                },
+                "required": ["search_text", "text"],
+            },
+        ),
+        ToolSpec(
+            name="find_element",
+            handler=_handle_find_element,
+            middleware=(memo.middleware(_index_version, ttl=FIND_ELEMENT_MEMO_TTL),),
+            deps=("screen_indexer", "smart_indexer"),
+            description="화면에서 텍스트나 요소를 찾아서 위치 정보를 반환합니다. 인덱싱이 필요하면 자동으로 수행합니다.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "search_text": {
+                        "type": "string",
+                        "description": "검색할 텍스트",
+                    },
+                    "window_id": {
+                        "type": "integer",
+                        "description": "윈도우 핸들 (선택적). 지정하면 해당 윈도우에서만 검색합니다.",
+                    },
+                    "exact_match": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "정확히 일치하는지 여부 (False면 부분 일치)",
+                    },
+                    "deadline_seconds": DEADLINE_PROPERTY,
+                    "stream_regions": STREAM_REGIONS_PROPERTY,
+                    **RESPONSE_PROPERTIES,
+                },
+                "required": ["search_text"],
+            },
+        ),
+        ToolSpec(
+            name="find_image",
+            handler=_handle_find_image,
+            deps=("screenshot",),
+            description="화면에서 아이콘이나 버튼 이미지(템플릿)를 찾아 위치와 일치 점수를 반환합니다. 텍스트로 찾을 수 없는 대상에 사용합니다.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "template_base64": {
+                        "type": "string",
+                        "description": "찾을 이미지 (Base64 PNG/JPEG, 화면과 같은 배율)",
+                    },
+                    "template_path": {
+                        "type": "string",
+                        "description": "찾을 이미지 파일 경로 (template_base64 대신)",
+                    },
+                    "x": {"type": "integer", "description": "검색 영역 시작 X 좌표 (선택적)"},
+                    "y": {"type": "integer", "description": "검색 영역 시작 Y 좌표 (선택적)"},
+                    "width": {"type": "integer", "description": "검색 영역 너비 (선택적)"},
+                    "height": {"type": "integer", "description": "검색 영역 높이 (선택적)"},
+                    "threshold": {
+                        "type": "number",
+                        "default": 0.8,
+                        "description": "최소 일치 점수 (0 ~ 1)",
+                    },
+                    "max_results": {
+                        "type": "integer",
+                        "default": 5,
+                        "description": "최대 결과 수",
+                    },
+                    **RESPONSE_PROPERTIES,
+                },
+            },
+        ),
+        ToolSpec(
+            name="find_color_regions",
+            handler=_handle_find_color_regions,
+            deps=("screenshot",),
+            description="화면에서 지정한 색의 연결된 영역(강조된 셀, 상태 배지, 선택 표시 등)을 찾아 경계 사각형과 면적을 반환합니다.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "color": {
+                        "type": ["string", "array"],
+                        "items": {"type": "integer", "minimum": 0, "maximum": 255},
+                        "description": "찾을 색 (\"#rrggbb\" 또는 [R, G, B])",
+                    },
+                    "tolerance": {
+                        "type": "integer",
+                        "default": 0,
+                        "description": "채널별 허용 차이 (0-255)",
+                    },
+                    "x": {"type": "integer", "description": "검색 영역 시작 X 좌표 (선택적)"},
+                    "y": {"type": "integer", "description": "검색 영역 시작 Y 좌표 (선택적)"},
+                    "width": {"type": "integer", "description": "검색 영역 너비 (선택적)"},
+                    "height": {"type": "integer", "description": "검색 영역 높이 (선택적)"},
+                    "min_area": {
+                        "type": "integer",
+                        "default": 1,
+                        "description": "최소 면적 (픽셀, 더 작은 영역은 제외)",
+                    },
+                    "max_results": {
+                        "type": "integer",
+                        "default": 50,
+                        "description": "최대 결과 수 (면적이 큰 순서)",
+                    },
+                    **RESPONSE_PROPERTIES,
+                },
+                "required": ["color"],
+            },
+        ),
+        ToolSpec(
+            name="interact_window",
+            handler=_handle_interact_window,
+            middleware=invalidates,
+            deps=("mouse", "keyboard", "window", "smart_indexer"),
+            description="특정 윈도우에서 일련의 작업을 수행합니다. 윈도우를 찾아 활성화한 후 여러 작업을 순차적으로 실행합니다.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "window_title": {
+                        "type": "string",
+                        "description": "윈도우 제목 (부분 일치)",
+                    },
+                    "actions": {
+                        "type": "array",
+                        "description": "수행할 작업 목록",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "type": {
+                                    "type": "string",
+                                    "enum": ["click_text", "type", "key", "hotkey"],
+                                    "description": "작업 유형",
+                                },
+                                "search_text": {
+                                    "type": "string",
+                                    "description": "click_text 작업 시 사용할 검색 텍스트",
+                                },
+                                "text": {
+                                    "type": "string",
+                                    "description": "type 작업 시 입력할 텍스트",
+                                },
+                                "key": {
+                                    "type": "string",
+                                    "description": "key 작업 시 누를 키",
+                                },
+                                "keys": {
+                                    "type": "array",
+                                    "items": {"type": "string"},
+                                    "description": "hotkey 작업 시 사용할 키 조합",
+                                },
+                            },
+                            "required": ["type"],
+                        },
+                    },
+                    "deadline_seconds": DEADLINE_PROPERTY,
+                    "stream_regions": STREAM_REGIONS_PROPERTY,
+                    **RESPONSE_PROPERTIES,
+                },
+                "required": ["window_title", "actions"],
+            },
+        ),
+        # 유틸리티 도구 (필요한 경우에만 사용)
+        ToolSpec(
+            name="window_find",
+            handler=_window_find,
+            deps=("window",),
+            description="윈도우 찾기",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string", "description": "윈도우 제목 (부분 일치)"},
+                    "class_name": {"type": "string", "description": "윈도우 클래스명"},
+                    **RESPONSE_PROPERTIES,
+                },
+            },
+        ),
+        ToolSpec(
+            name="filesystem_read_file",
+            handler=_filesystem_read_file,
+            deps=("filesystem",),
+            description="파일 읽기",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "file_path": {"type": "string", "description": "파일 경로"},
+                    "encoding": {"type": "string", "default": "utf-8", "description": "인코딩"},
+                },
+                "required": ["file_path"],
+            },
+        ),
+        ToolSpec(
+            name="filesystem_list_directory",
+            handler=_filesystem_list_directory,
+            deps=("filesystem",),
+            description="디렉토리 목록 조회",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "dir_path": {
+                        "type": "string",
+                        "default": ".",
+                        "description": "디렉토리 경로",
+                    },
+                    **RESPONSE_PROPERTIES,
+                },
+            },
+        ),
+        ToolSpec(
+            name="response_continue",
+            handler=_response_continue,
+            description="max_bytes를 넘어 잘린 이전 응답의 나머지를 가져옵니다 (응답의 next_cursor 사용).",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "cursor": {"type": "string", "description": "이전 응답의 next_cursor"},
+                    **RESPONSE_PROPERTIES,
+                },
+                "required": ["cursor"],
+            },
+        ),
+        # 저수준 도구 (list_tools에 노출하지 않음, 내부적으로만 사용)
+        ToolSpec(name="mouse_click", handler=_mouse_click, deps=("mouse",), middleware=invalidates),
+        ToolSpec(name="mouse_move", handler=_mouse_move, deps=("mouse",), middleware=invalidates),
+        ToolSpec(name="mouse_drag", handler=_mouse_drag, deps=("mouse",), middleware=invalidates),
+        ToolSpec(name="mouse_scroll", handler=_mouse_scroll, deps=("mouse",), middleware=invalidates),
+        ToolSpec(name="mouse_get_position", handler=_mouse_get_position, deps=("mouse",)),
+        ToolSpec(name="keyboard_type", handler=_keyboard_type, deps=("keyboard",), middleware=invalidates),
+        ToolSpec(name="keyboard_press", handler=_keyboard_press, deps=("keyboard",), middleware=invalidates),
+        ToolSpec(name="keyboard_hotkey", handler=_keyboard_hotkey, deps=("keyboard",), middleware=invalidates),
+        ToolSpec(name="screenshot_region", handler=_screenshot_region, deps=("screenshot",)),
+        ToolSpec(name="screenshot_get_size", handler=_screenshot_get_size, deps=("screenshot",)),
+        ToolSpec(name="screenshot_get_pixel_color", handler=_screenshot_get_pixel_color, deps=("screenshot",)),
+        ToolSpec(name="screenshot_get_pixel_colors", handler=_screenshot_get_pixel_colors, deps=("screenshot",)),
+        ToolSpec(name="screenshot_sample_grid", handler=_screenshot_sample_grid, deps=("screenshot",)),
+        ToolSpec(name="window_activate", handler=_window_activate, deps=("window",), middleware=invalidates),
+        ToolSpec(name="window_get_info", handler=_window_get_info, deps=("window",)),
+        ToolSpec(name="filesystem_get_file_info", handler=_filesystem_get_file_info, deps=("filesystem",)),
+        ToolSpec(name="ocr_extract_from_image", handler=_ocr_extract_from_image, deps=("ocr",)),
+        ToolSpec(name="ocr_extract_from_screenshot", handler=_ocr_extract_from_screenshot, deps=("ocr", "ocr_scheduler")),
+        ToolSpec(name="screen_index", handler=_screen_index, deps=("screen_indexer",)),
+        ToolSpec(name="screen_index_window", handler=_screen_index_window, deps=("screen_indexer",)),
+        ToolSpec(name="screen_find_text", handler=_screen_find_text, deps=("screen_indexer",), middleware=memoized),
+        ToolSpec(name="screen_get_indexed_texts", handler=_screen_get_indexed_texts, deps=("screen_indexer",), middleware=memoized),
+        ToolSpec(
+            name="screen_index_stats",
+            handler=_screen_index_stats,
+            deps=("smart_indexer", "background_indexer"),
+        ),
+    ):
+        registry.register(spec)
+
+
+_register_tools(get_tool_registry())
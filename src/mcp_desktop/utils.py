@@ -4,13 +4,50 @@
 
 import logging
 import json
-from typing import Any, Dict, Optional
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
+from .cancellation import CancellationToken
+
 # 보안 로그 파일 경로
 SECURITY_LOG_FILE = Path.home() / ".mcp_desktop" / "security.log"
 
+class InputDeviceLock:
+    """
+    입력 장치 잠금 (재진입 가능)
+    
+    잠금을 풀 때마다 입력 세대(epoch)가 증가하므로, 캡처 시점의 세대를 기억해 두면
+    그 뒤에 클릭/입력이 있었는지 알 수 있습니다 (스크린샷 프레임 캐시 무효화에 사용).
+    """
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._epoch = 0
+    
+    @property
+    def epoch(self) -> int:
+        """지금까지 끝난 입력 동작 수"""
+        return self._epoch
+    
+    def __enter__(self):
+        self._lock.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._epoch += 1
+        finally:
+            self._lock.release()
+
+
+# 마우스/키보드 입력 장치 잠금
+# 도구 호출이 여러 스레드에서 동시에 실행되어도 입력 동작(클릭 후 입력 등)은 섞이지 않도록 직렬화.
+# 캡처, OCR, DB 조회는 이 잠금 없이 동시에 실행됩니다.
+INPUT_DEVICE_LOCK = InputDeviceLock()
+
 
 def setup_logging(log_level: str = "INFO") -> logging.Logger:
     """
@@ -254,3 +291,84 @@ def validate_file_access(file_path: str, operation: str = "read") -> tuple[bool,
     except Exception as e:
         return False, str(e)
 
+
+class SingleFlight:
+    """
+    같은 키에 대한 동시 호출을 하나로 합치는 도우미
+    
+    진행 중인 호출이 있으면 새로 실행하지 않고 그 결과를 기다려 함께 사용합니다.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, Future] = {}
+        self._calls = 0
+        self._coalesced = 0
+    
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[..., Any],
+        *args,
+        token: Optional[CancellationToken] = None,
+        **kwargs,
+    ) -> Tuple[Any, bool]:
+        """
+        키에 대해 fn을 한 번만 실행
+        
+        Args:
+            key: 호출을 합칠 기준 키
+            fn: 실행할 함수
+            *args, **kwargs: fn 인자
+            token: 다른 호출의 결과를 기다릴 때 사용할 취소 토큰 (fn에는 전달하지 않음,
+                fn에 토큰이 필요하면 args로 넘김)
+        
+        Returns:
+            (결과, 다른 호출의 결과를 공유했는지 여부) 튜플
+        
+        Raises:
+            OperationCancelled: 다른 호출의 결과를 기다리는 동안 token이 취소되었거나 마감 시간이 지난 경우
+                (진행 중인 호출은 계속 실행됨)
+        """
+        with self._lock:
+            self._calls += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._coalesced += 1
+                leader = False
+            else:
+                flight = Future()
+                self._flights[key] = flight
+                leader = True
+        
+        if not leader:
+            if token is not None:
+                return token.wait_future(flight), True
+            return flight.result(), True
+        
+        try:
+            result = fn(*args, **kwargs)
+            flight.set_result(result)
+            return result, False
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+    
+    def pending(self, key: Hashable) -> Optional[Future]:
+        """
+        키에 대해 진행 중인 호출의 Future 반환 (없으면 None)
+        """
+        with self._lock:
+            return self._flights.get(key)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """호출 수와 합쳐진 호출 수"""
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._flights),
+            }
@@ -5,6 +5,8 @@
 import logging
 from typing import Optional, List, Dict, Any
 
+from .utils import INPUT_DEVICE_LOCK
+
 logger = logging.getLogger("mcp_desktop.window")
 
 try:
@@ -90,10 +92,11 @@ class WindowController:
             return {"success": False, "error": "Windows 환경이 필요합니다."}
         
         try:
-            # 윈도우를 포그라운드로 가져오기
-            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-            win32gui.SetForegroundWindow(hwnd)
-            win32gui.BringWindowToTop(hwnd)
+            # 윈도우를 포그라운드로 가져오기 (화면이 바뀌므로 입력 동작으로 취급)
+            with INPUT_DEVICE_LOCK:
+                win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+                win32gui.SetForegroundWindow(hwnd)
+                win32gui.BringWindowToTop(hwnd)
             
             title = win32gui.GetWindowText(hwnd)
             logger.info(f"윈도우 활성화: {title} (hwnd={hwnd})")
@@ -146,6 +149,25 @@ class WindowController:
             logger.error(f"윈도우 정보 조회 실패: {e}")
             return {"success": False, "error": str(e)}
     
+    def get_foreground_window(self) -> dict:
+        """
+        현재 포그라운드 윈도우 조회
+        
+        Returns:
+            포그라운드 윈도우 핸들과 제목 딕셔너리
+        """
+        if not WIN32_AVAILABLE:
+            return {"success": False, "error": "Windows 환경이 필요합니다."}
+        
+        try:
+            hwnd = win32gui.GetForegroundWindow()
+            if not hwnd:
+                return {"success": False, "error": "포그라운드 윈도우가 없습니다."}
+            return {"success": True, "hwnd": hwnd, "title": win32gui.GetWindowText(hwnd)}
+        except Exception as e:
+            logger.error(f"포그라운드 윈도우 조회 실패: {e}")
+            return {"success": False, "error": str(e)}
+    
     def get_window_rect(self, hwnd: int) -> dict:
         """
         윈도우 영역 좌표 조회 (스크린샷용)
@@ -0,0 +1,15 @@
+"""
+테스트 공통 설정
+실제 화면 없이 실행할 수 있도록 합성 캡처 백엔드를 사용하고,
+인덱스 DB 등 홈 디렉터리에 쓰는 파일은 임시 디렉터리로 보냄
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("MCP_DESKTOP_CAPTURE_BACKEND", "synthetic")
+os.environ["HOME"] = tempfile.mkdtemp(prefix="mcp_desktop_test_home_")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,123 @@
+import asyncio
+
+import numpy as np
+
+from mcp_desktop.background_indexer import BackgroundIndexer
+from mcp_desktop.utils import INPUT_DEVICE_LOCK
+
+AREA = {"left": 0, "top": 0, "width": 64, "height": 64}
+TILES = 3
+
+
+class _Window:
+    def get_foreground_window(self):
+        return {"success": True, "hwnd": 1}
+
+
+class _Indexer:
+    def __init__(self, owner):
+        self.owner = owner
+        self.scans = 0
+    
+    def iter_tile_batches(self, window_id=None, priority=None):
+        self.scans += 1
+        scan = self.owner.screen
+        for done in range(1, TILES + 1):
+            # 타일을 스캔하는 도중에 일어나는 일 (도구 호출, 입력)
+            if self.owner.on_tile is not None:
+                self.owner.on_tile(done)
+            yield {"success": True, "regions": [f"{scan}:{done}"], "done": done, "total": TILES}
+
+
+class _SmartIndexer:
+    def __init__(self):
+        self.screen = "A"
+        self.on_tile = None
+        self.indexer = _Indexer(self)
+        self.committed = []
+    
+    def is_indexing_needed(self, window_id=None):
+        return True
+    
+    def capture_state(self, window_id=None):
+        detail = np.full((8, 8), 0 if self.screen == "A" else 200, dtype=np.uint8)
+        return {"window_class": "Editor", "fingerprint": 0, "detail": detail, "area": AREA, "captured_at": 0.0}
+    
+    def restore_from_library(self, window_id, state):
+        return None
+    
+    def commit_scan(self, window_id, regions, info, state):
+        self.committed.append(list(regions))
+
+
+def _background() -> BackgroundIndexer:
+    return BackgroundIndexer(idle_seconds=0, smart_indexer=_SmartIndexer(), window=_Window())
+
+
+def _interrupt_after_first_tile(background: BackgroundIndexer, during_pause=None):
+    smart = background.smart_indexer
+    
+    def on_tile(done):
+        if done == 1:
+            background._active_calls += 1
+    
+    smart.on_tile = on_tile
+    asyncio.run(background._step())
+    assert background.get_stats()["interrupted"] == 1
+    assert background.get_stats()["in_progress"]["done"] == 1
+    smart.on_tile = None
+    if during_pause is not None:
+        during_pause()
+    background._active_calls -= 1
+    asyncio.run(background._step())
+
+
+def test_unchanged_screen_resumes_interrupted_scan():
+    background = _background()
+    _interrupt_after_first_tile(background)
+    
+    assert background.smart_indexer.indexer.scans == 1
+    assert background.smart_indexer.committed == [["A:1", "A:2", "A:3"]]
+    assert background.get_stats()["completed"] == 1
+
+
+def test_input_during_pause_discards_scanned_tiles():
+    background = _background()
+    
+    def click():
+        with INPUT_DEVICE_LOCK:
+            pass
+    
+    _interrupt_after_first_tile(background, click)
+    
+    stats = background.get_stats()
+    assert stats["restarted"] == 1
+    assert background.smart_indexer.indexer.scans == 2
+    assert background.smart_indexer.committed == [["A:1", "A:2", "A:3"]]
+
+
+def test_content_change_during_pause_discards_scanned_tiles():
+    background = _background()
+    
+    def change_text():
+        background.smart_indexer.screen = "B"
+    
+    _interrupt_after_first_tile(background, change_text)
+    
+    assert background.get_stats()["restarted"] == 1
+    assert background.smart_indexer.committed == [["B:1", "B:2", "B:3"]]
+
+
+def test_input_while_scanning_last_tile_skips_commit():
+    background = _background()
+    
+    def on_tile(done):
+        if done == TILES:
+            with INPUT_DEVICE_LOCK:
+                pass
+    
+    background.smart_indexer.on_tile = on_tile
+    asyncio.run(background._step())
+    
+    assert background.smart_indexer.committed == []
+    assert background.get_stats()["in_progress"] is None
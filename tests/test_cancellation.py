@@ -0,0 +1,37 @@
+from concurrent.futures import Future
+
+import pytest
+
+from mcp_desktop.cancellation import CancellationToken, OperationCancelled, check_token
+
+
+def test_zero_deadline_is_already_expired():
+    token = CancellationToken(0)
+    assert token.reason == "deadline"
+    assert token.remaining() == 0.0
+    with pytest.raises(OperationCancelled):
+        token.check()
+
+
+def test_no_deadline_never_expires():
+    token = CancellationToken()
+    assert not token.is_cancelled()
+    assert token.remaining() is None
+    check_token(token)
+    check_token(None)
+
+
+def test_child_follows_parent_cancel_and_deadline():
+    parent = CancellationToken(60)
+    child = CancellationToken(parent=parent)
+    assert 0 < child.remaining() <= 60
+    parent.cancel("client")
+    assert child.reason == "client"
+
+
+def test_wait_future_stops_at_deadline():
+    with pytest.raises(OperationCancelled):
+        CancellationToken(0.05).wait_future(Future())
+    done = Future()
+    done.set_result(42)
+    assert CancellationToken(1).wait_future(done) == 42
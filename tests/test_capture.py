@@ -0,0 +1,176 @@
+import ctypes
+import os
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from mcp_desktop import capture
+from mcp_desktop.capture import BACKEND_ENV, CaptureBackend, PyAutoGUIBackend, SyntheticBackend, create_backend
+from mcp_desktop.screenshot import ScreenshotController
+
+
+class _BrokenBackend(CaptureBackend):
+    name = "broken"
+    
+    def __init__(self):
+        raise OSError("사용할 수 없음")
+
+
+@pytest.fixture
+def backend_registry(monkeypatch):
+    """백엔드 목록과 기본 순서를 테스트마다 복원하고, 플랫폼 백엔드 자동 등록은 끔"""
+    monkeypatch.setattr(capture, "_BACKENDS", dict(capture._BACKENDS))
+    monkeypatch.setattr(capture, "_DEFAULT_ORDER", list(capture._DEFAULT_ORDER))
+    monkeypatch.setattr(capture, "_register_platform_backends", lambda: None)
+    monkeypatch.delenv(BACKEND_ENV, raising=False)
+
+
+def test_create_backend_by_name(backend_registry):
+    assert isinstance(create_backend("synthetic"), SyntheticBackend)
+
+
+def test_create_backend_from_environment(backend_registry, monkeypatch):
+    monkeypatch.setenv(BACKEND_ENV, "synthetic")
+    assert isinstance(create_backend(), SyntheticBackend)
+
+
+def test_create_backend_rejects_unknown_name(backend_registry):
+    with pytest.raises(ValueError):
+        create_backend("no-such-backend")
+
+
+def test_create_backend_falls_back_to_next_available(backend_registry):
+    capture.register_backend("broken", _BrokenBackend, preferred=True)
+    capture._DEFAULT_ORDER.append("synthetic")
+    assert capture._DEFAULT_ORDER[0] == "broken"
+    assert isinstance(create_backend(), SyntheticBackend)
+
+
+def test_explicit_backend_failure_is_not_hidden(backend_registry):
+    capture.register_backend("broken", _BrokenBackend)
+    with pytest.raises(OSError):
+        create_backend("broken")
+
+
+def _available_backends():
+    backends = [pytest.param(lambda: SyntheticBackend(320, 200), id="synthetic")]
+    if os.environ.get("DISPLAY"):
+        from mcp_desktop.capture_x11 import X11ShmBackend
+        
+        backends.append(pytest.param(X11ShmBackend, id="x11shm"))
+    return backends
+
+
+@pytest.mark.parametrize("factory", _available_backends())
+def test_backend_contract(factory):
+    backend = factory()
+    try:
+        width, height = backend.screen_size()
+        assert isinstance(width, int) and isinstance(height, int) and width > 0 and height > 0
+        
+        full = np.zeros((height, width, 3), dtype=np.uint8)
+        assert backend.grab_into(full) is full
+        
+        region = (5, 7, 33, 17)
+        out = np.zeros((17, 33, 3), dtype=np.uint8)
+        assert backend.grab_into(out, region) is out
+        np.testing.assert_array_equal(out, full[7:24, 5:38])
+    finally:
+        backend.close()
+
+
+def test_synthetic_backend_reflects_frame_changes():
+    backend = SyntheticBackend(64, 48)
+    backend.fill((10, 10, 4, 4), (255, 0, 0))
+    out = np.zeros((4, 4, 3), dtype=np.uint8)
+    backend.grab_into(out, (10, 10, 4, 4))
+    assert (out == (255, 0, 0)).all()
+    assert backend.grabs == 1
+
+
+@pytest.mark.skipif(not os.environ.get("DISPLAY"), reason="X 디스플레이 필요")
+def test_x11_backend_restores_previous_error_handler():
+    from mcp_desktop.capture_x11 import _ERROR_HANDLER, X11ShmBackend
+    
+    calls = []
+    sentinel = _ERROR_HANDLER(lambda display, event: calls.append(event) or 0)
+    backend = X11ShmBackend()
+    x11 = backend._x11
+    x11.XSetErrorHandler(sentinel)
+    sentinel_address = ctypes.cast(sentinel, ctypes.c_void_p).value
+    try:
+        backend.grab_into(np.zeros((8, 8, 3), dtype=np.uint8), (0, 0, 8, 8))
+        assert x11.XSetErrorHandler(sentinel) == sentinel_address
+    finally:
+        x11.XSetErrorHandler(None)
+        backend.close()
+
+
+@pytest.fixture
+def hidpi_pyautogui(monkeypatch):
+    """논리 크기 32x24, 실제 캡처는 2배 픽셀인 HiDPI 화면을 흉내 내는 pyautogui"""
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    frame[:24, :32] = (255, 0, 0)
+    
+    def screenshot(region=None):
+        if region is None:
+            return Image.fromarray(frame)
+        x, y, width, height = region
+        return Image.fromarray(frame[y * 2:(y + height) * 2, x * 2:(x + width) * 2])
+    
+    fake = types.SimpleNamespace(size=lambda: (32, 24), screenshot=screenshot)
+    monkeypatch.setitem(sys.modules, "pyautogui", fake)
+    return fake
+
+
+def test_pyautogui_backend_scales_hidpi_captures_to_logical_size(hidpi_pyautogui):
+    backend = PyAutoGUIBackend()
+    full = backend.grab_into(np.zeros((24, 32, 3), dtype=np.uint8))
+    assert (full[:12, :16] == (255, 0, 0)).all()
+    assert (full[12:, 16:] == 0).all()
+    
+    region = backend.grab_into(np.zeros((4, 4, 3), dtype=np.uint8), (14, 10, 4, 4))
+    assert (region[:2, :2] == (255, 0, 0)).all() and (region[2:, 2:] == 0).all()
+
+
+def test_screenshot_controller_captures_from_hidpi_backend(hidpi_pyautogui):
+    controller = ScreenshotController(frame_ttl=60, backend=PyAutoGUIBackend())
+    assert controller.grab_array().shape == (24, 32, 3)
+    assert controller.grab_array((0, 0, 4, 4)).shape == (4, 4, 3)
+
+
+class _FakeXlib:
+    """루트 윈도우 크기만 돌려주는 Xlib 대역 (해상도 변경 확인용)"""
+    
+    def __init__(self, size):
+        self.size = size
+    
+    def XSetErrorHandler(self, handler):
+        return None
+    
+    def XGetGeometry(self, display, drawable, root, x, y, width, height, border, depth):
+        width._obj.value, height._obj.value = self.size
+        return 1
+
+
+def test_x11_backend_picks_up_resolution_changes():
+    from mcp_desktop.capture_x11 import X11ShmBackend
+    
+    backend = X11ShmBackend.__new__(X11ShmBackend)
+    backend._x11 = _FakeXlib((1920, 1080))
+    backend._display, backend._root = 1, 1
+    backend._size = (1920, 1080)
+    backend._lock = threading.Lock()
+    backend._error = None
+    backend._error_handler = None
+    backend._previous_handler = None
+    assert backend.screen_size() == (1920, 1080)
+    
+    # xrandr로 해상도를 바꾸면 다음 조회부터 새 크기 (영역 잘라내기와 전체 화면 버퍼에 사용)
+    backend._x11.size = (1280, 720)
+    assert backend.screen_size() == (1280, 720)
+    assert backend._size == (1280, 720)
@@ -0,0 +1,46 @@
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from mcp_desktop.capture import SyntheticBackend
+from mcp_desktop.change_watcher import ScreenChangeWatcher
+from mcp_desktop.screenshot import ScreenshotController
+
+
+def _text_frame(text: str) -> np.ndarray:
+    image = Image.new("RGB", (640, 480), (255, 255, 255))
+    ImageDraw.Draw(image).text((300, 200), text, fill=(0, 0, 0))
+    return np.asarray(image)
+
+
+def _watcher(backend: SyntheticBackend) -> ScreenChangeWatcher:
+    watcher = ScreenChangeWatcher()
+    watcher.screenshot = ScreenshotController(frame_ttl=0, backend=backend)
+    return watcher
+
+
+def test_small_glyph_change_marks_tile_dirty():
+    backend = SyntheticBackend(640, 480)
+    backend.set_frame(_text_frame("Total: 1"))
+    watcher = _watcher(backend)
+    watcher._sample()
+    since = time.monotonic()
+    
+    backend.set_frame(_text_frame("Total: 7"))
+    watcher._sample()
+    
+    assert watcher.changed_since((200, 200, 200, 200), since)
+    assert not watcher.changed_since((0, 0, 200, 200), since)
+
+
+def test_unchanged_frame_marks_nothing():
+    backend = SyntheticBackend(640, 480)
+    backend.set_frame(_text_frame("Total: 1"))
+    watcher = _watcher(backend)
+    watcher._sample()
+    since = time.monotonic()
+    
+    watcher._sample()
+    
+    assert not watcher.changed_since((0, 0, 640, 480), since)
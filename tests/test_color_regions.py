@@ -0,0 +1,81 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from mcp_desktop.color_regions import color_mask, find_color_regions, find_regions, parse_color
+
+
+def _bfs_regions(mask: np.ndarray) -> list:
+    """4-이웃 BFS로 구한 기준 결과 (경계 사각형, 면적)"""
+    height, width = mask.shape
+    seen = np.zeros_like(mask)
+    regions = []
+    for y in range(height):
+        for x in range(width):
+            if not mask[y, x] or seen[y, x]:
+                continue
+            seen[y, x] = True
+            queue = deque([(y, x)])
+            ys, xs = [], []
+            while queue:
+                cy, cx = queue.popleft()
+                ys.append(cy)
+                xs.append(cx)
+                for ny, nx in ((cy - 1, cx), (cy + 1, cx), (cy, cx - 1), (cy, cx + 1)):
+                    if 0 <= ny < height and 0 <= nx < width and mask[ny, nx] and not seen[ny, nx]:
+                        seen[ny, nx] = True
+                        queue.append((ny, nx))
+            regions.append((min(xs), min(ys), max(xs) + 1 - min(xs), max(ys) + 1 - min(ys), len(ys)))
+    return sorted(regions)
+
+
+def _boxes(regions: list) -> list:
+    return sorted((r["x"], r["y"], r["width"], r["height"], r["area"]) for r in regions)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("density", [0.3, 0.55, 0.7])
+def test_find_regions_matches_bfs_reference(seed, density):
+    mask = np.random.default_rng(seed).random((23, 31)) < density
+    assert _boxes(find_regions(mask)) == _bfs_regions(mask)
+
+
+def test_find_regions_joins_u_shapes_and_keeps_diagonals_apart():
+    mask = np.zeros((6, 7), dtype=bool)
+    # 아래에서만 이어지는 U자 모양 (위쪽 두 기둥은 나중 행에서야 합쳐짐)
+    mask[0:4, 0] = mask[0:4, 4] = mask[3, 0:5] = True
+    # 대각선으로만 닿는 픽셀은 다른 덩어리
+    mask[4, 5] = mask[5, 6] = True
+    assert _boxes(find_regions(mask)) == [(0, 0, 5, 4, 11), (5, 4, 1, 1, 1), (6, 5, 1, 1, 1)]
+    assert [r["area"] for r in find_regions(mask, min_area=2)] == [11]
+
+
+def test_find_color_regions_respects_tolerance_and_limits():
+    pixels = np.zeros((40, 60, 3), dtype=np.uint8)
+    pixels[5:15, 5:25] = (250, 200, 0)
+    pixels[20:24, 40:44] = (255, 204, 3)
+    pixels[30:35, 10:12] = (200, 200, 0)
+    
+    regions, total = find_color_regions(pixels, "#ffcc00", tolerance=5)
+    assert total == 2
+    assert [(r["x"], r["y"], r["area"]) for r in regions] == [(5, 5, 200), (40, 20, 16)]
+    assert regions[0]["center_x"] == 15 and regions[0]["center_y"] == 10
+    
+    regions, total = find_color_regions(pixels, [255, 204, 3], max_results=1)
+    assert total == 1 and regions[0]["area"] == 16
+    assert find_color_regions(pixels, "#ffcc00", tolerance=5, max_results=1)[1] == 2
+
+
+def test_color_mask_handles_channel_edges():
+    pixels = np.array([[[0, 0, 0], [3, 255, 128], [6, 250, 128]]], dtype=np.uint8)
+    np.testing.assert_array_equal(color_mask(pixels, (0, 255, 128), 4), [[False, True, False]])
+    np.testing.assert_array_equal(color_mask(pixels, (0, 255, 128), 255), [[True, True, True]])
+
+
+def test_parse_color_formats():
+    assert parse_color("#0f8") == (0, 255, 136)
+    assert parse_color([1, 2, 3]) == (1, 2, 3)
+    for bad in ("#12345", [1, 2], [0, 0, 256]):
+        with pytest.raises(ValueError):
+            parse_color(bad)
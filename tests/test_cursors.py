@@ -0,0 +1,30 @@
+from mcp_desktop import screen_indexer
+from mcp_desktop.screen_indexer import _decode_cursor, _encode_cursor
+
+QUERY = {"k": "find", "q": "Save", "e": False, "w": None}
+
+
+def test_cursor_round_trip():
+    cursor = _encode_cursor({**QUERY, "v": "0.3", "t": "2026-01-01T00:00:00", "i": 42})
+    state = _decode_cursor(cursor, QUERY, "0.3")
+    assert state["i"] == 42
+
+
+def test_cursor_from_changed_index_is_stale():
+    cursor = _encode_cursor({**QUERY, "v": "0.3", "o": 10})
+    state = _decode_cursor(cursor, QUERY, "0.4")
+    assert state["success"] is False and state["stale"] is True
+
+
+def test_cursor_from_previous_process_is_rejected(monkeypatch):
+    cursor = _encode_cursor({**QUERY, "v": "0.3", "o": 10})
+    # 재시작 후에는 버전 카운터가 같은 값으로 다시 올라가도 커서를 받지 않음
+    monkeypatch.setattr(screen_indexer, "CURSOR_EPOCH", "restarted")
+    state = _decode_cursor(cursor, QUERY, "0.3")
+    assert state["success"] is False and state["stale"] is True
+
+
+def test_cursor_for_other_query_is_rejected():
+    cursor = _encode_cursor({**QUERY, "v": "0.3", "o": 10})
+    state = _decode_cursor(cursor, {**QUERY, "q": "Open"}, "0.3")
+    assert state["success"] is False and "stale" not in state
@@ -0,0 +1,70 @@
+import numpy as np
+
+from mcp_desktop import delta as delta_module
+from mcp_desktop.capture import SyntheticBackend
+from mcp_desktop.delta import DeltaTracker
+from mcp_desktop.screenshot import ScreenshotController
+
+
+def _frame(value: int = 0) -> np.ndarray:
+    pixels = np.zeros((64, 64, 3), dtype=np.uint8)
+    pixels[:16, :16] = value
+    return pixels
+
+
+def test_missing_since_always_sends_keyframe():
+    tracker = DeltaTracker()
+    first = tracker.compare("key", _frame())
+    assert tracker.compare("key", _frame(), since=first.frame_id).kind == "unchanged"
+    
+    again = tracker.compare("key", _frame())
+    assert again.kind == "keyframe"
+    assert again.base_frame is None
+
+
+def test_concurrent_caller_on_same_base_gets_keyframe(monkeypatch):
+    tracker = DeltaTracker()
+    base = tracker.compare("key", _frame()).frame_id
+    original = delta_module.changed_blocks
+    results = []
+    
+    def racing_changed_blocks(previous, current, block_size):
+        # 첫 호출이 비교하는 사이에 같은 키의 다른 호출이 같은 기준 프레임으로 패치를 저장
+        if not results:
+            results.append(None)
+            results.append(tracker.compare("key", _frame(200), since=base))
+        return original(previous, current, block_size)
+    
+    monkeypatch.setattr(delta_module, "changed_blocks", racing_changed_blocks)
+    first = tracker.compare("key", _frame(100), since=base)
+    second = results[1]
+    
+    assert second.kind == "patches" and second.base_frame == base
+    assert first.kind == "keyframe"
+    # 두 결과 모두 자신의 frame_id에서 이어서 비교할 수 있어야 함 (마지막 저장은 first)
+    assert tracker.compare("key", _frame(100), since=first.frame_id).kind == "unchanged"
+
+
+def _capture(controller: ScreenshotController, since=None, **options) -> dict:
+    return controller.capture_region_delta(0, 0, 64, 64, since=since, **options)
+
+
+def _changed_after_keyframe(**options) -> dict:
+    backend = SyntheticBackend(64, 64, color=(0, 0, 0))
+    controller = ScreenshotController(frame_ttl=0, backend=backend)
+    first = _capture(controller, **options)
+    assert first["delta"] == "keyframe"
+    backend.fill((0, 0, 8, 8), (255, 255, 255))
+    return _capture(controller, since=first["frame_id"], **options)
+
+
+def test_png_sends_full_resolution_patches():
+    result = _changed_after_keyframe()
+    assert result["delta"] == "patches"
+    assert result["patches"][0]["width"] == 16
+
+
+def test_lossy_or_scaled_options_always_send_keyframes():
+    assert _changed_after_keyframe(format="JPEG")["delta"] == "keyframe"
+    assert _changed_after_keyframe(max_dimension=32)["delta"] == "keyframe"
+    assert _changed_after_keyframe(max_bytes=100000)["delta"] == "keyframe"
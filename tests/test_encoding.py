@@ -0,0 +1,65 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from mcp_desktop.encoding import MIN_QUALITY, EncodeOptions, base64_size, encode_image
+
+
+def _noisy(height: int = 480, width: int = 640) -> np.ndarray:
+    """잘 압축되지 않는 화면 (예산을 맞추려면 품질이나 크기를 줄여야 함)"""
+    return np.random.default_rng(3).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def _decoded(encoded) -> Image.Image:
+    image = Image.open(BytesIO(encoded.data))
+    image.load()
+    return image
+
+
+def test_default_png_is_lossless():
+    pixels = _noisy(40, 60)
+    encoded = encode_image(pixels)
+    
+    assert encoded.format == "PNG" and encoded.quality is None and encoded.scale == 1.0
+    np.testing.assert_array_equal(np.asarray(_decoded(encoded)), pixels)
+    assert EncodeOptions().lossless and not EncodeOptions(max_bytes=1000).lossless
+
+
+@pytest.mark.parametrize("format", ["JPEG", "PNG"])
+@pytest.mark.parametrize("max_bytes", [200_000, 40_000])
+def test_encode_image_respects_max_bytes(format, max_bytes):
+    encoded = encode_image(_noisy(), EncodeOptions(format=format, max_bytes=max_bytes))
+    
+    assert encoded.within_budget
+    assert encoded.base64_size == base64_size(len(encoded.data)) <= max_bytes
+    assert len(encoded.to_base64()) == encoded.base64_size
+    image = _decoded(encoded)
+    assert image.size == (encoded.width, encoded.height)
+    assert encoded.scale == pytest.approx(encoded.width / 640)
+    if format == "JPEG":
+        assert MIN_QUALITY <= encoded.quality <= 80
+    # 예산이 작을수록 해상도를 더 줄임
+    if max_bytes == 40_000:
+        assert encoded.width < 640 and "over_budget" not in encoded.metadata()
+
+
+def test_impossible_budget_is_reported():
+    encoded = encode_image(_noisy(), EncodeOptions(format="JPEG", max_bytes=10))
+    assert not encoded.within_budget
+    assert encoded.metadata()["over_budget"] is True
+
+
+def test_max_dimension_and_grayscale():
+    encoded = encode_image(_noisy(), EncodeOptions(format="jpg", grayscale=True, max_dimension=320))
+    
+    image = _decoded(encoded)
+    assert image.mode == "L" and image.size == (320, 240)
+    assert encoded.format == "JPEG" and encoded.scale == 0.5
+    assert encoded.metadata()["image_width"] == 320
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        encode_image(_noisy(8, 8), EncodeOptions(format="BMP"))
@@ -0,0 +1,111 @@
+import base64
+import os
+import subprocess
+import sys
+import uuid
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import pytest
+
+from mcp_desktop import images
+from mcp_desktop.images import SHM_PREFIX, ImageHandleStore, extract_images, read_shared_memory
+
+SRC = str(Path(__file__).resolve().parent.parent / "src")
+
+
+@pytest.fixture
+def segment():
+    created = shared_memory.SharedMemory(name=f"{SHM_PREFIX}test_{uuid.uuid4().hex[:8]}", create=True, size=16)
+    created.buf[:5] = b"hello"
+    yield created
+    created.close()
+    created.unlink()
+
+
+def test_reader_process_does_not_unlink_segment(segment):
+    # 다른 프로세스에서 읽고 종료해도 (리소스 추적기가 지우지 않고) 공유 메모리가 남아 있어야 함
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1]);"
+        "from mcp_desktop.images import read_shared_memory;"
+        "sys.stdout.write(read_shared_memory(sys.argv[2], 5).decode())"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script, SRC, segment.name],
+        capture_output=True, text=True, timeout=60, check=True,
+    )
+    assert result.stdout == "hello"
+    assert "leaked" not in result.stderr
+    
+    reopened = shared_memory.SharedMemory(name=segment.name, track=False) if sys.version_info >= (3, 13) else None
+    if reopened is None:
+        reopened = shared_memory.SharedMemory(name=segment.name)
+        from multiprocessing import resource_tracker
+        
+        resource_tracker.unregister(reopened._name, "shared_memory")
+    assert bytes(reopened.buf[:5]) == b"hello"
+    reopened.close()
+
+
+def test_reads_only_prefixed_names(segment):
+    assert read_shared_memory(segment.name, 5) == b"hello"
+    with pytest.raises(ValueError):
+        read_shared_memory("other_program_segment")
+    with pytest.raises(ValueError):
+        read_shared_memory(f"{SHM_PREFIX}../etc")
+
+
+@pytest.fixture
+def store(monkeypatch):
+    created = ImageHandleStore(max_handles=2)
+    monkeypatch.setattr(images, "_image_store", created)
+    yield created
+    created.close()
+
+
+def _encoded(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+def test_extract_images_moves_base64_into_content(store):
+    result = {
+        "success": True,
+        "format": "jpeg",
+        "image_base64": _encoded(b"full"),
+        "patches": [{"x": 0, "image_base64": _encoded(b"patch")}, {"x": 1}],
+    }
+    shaped, parts = extract_images(result, "content")
+    
+    assert parts == [(_encoded(b"full"), "image/jpeg"), (_encoded(b"patch"), "image/jpeg")]
+    assert shaped["image_content"] == 1 and shaped["patches"][0]["image_content"] == 2
+    assert "image_base64" not in shaped and "image_base64" not in shaped["patches"][0]
+    # 원본 결과는 바뀌지 않음
+    assert "image_base64" in result and "image_base64" in result["patches"][0]
+
+
+def test_extract_images_passes_through_base64_and_plain_results(store):
+    result = {"image_base64": _encoded(b"x")}
+    assert extract_images(result, "base64") == (result, [])
+    assert extract_images({"success": True}, "content") == ({"success": True}, [])
+    with pytest.raises(ValueError):
+        extract_images(result, "inline")
+
+
+def test_file_and_shm_handles_round_trip_and_evict(store):
+    file_result, parts = extract_images({"image_base64": _encoded(b"png-bytes")}, "file")
+    handle = file_result["image_file"]
+    assert parts == []
+    assert handle["size"] == 9 and Path(handle["path"]).read_bytes() == b"png-bytes"
+    
+    shm = extract_images({"image_base64": _encoded(b"shm-bytes")}, "shm")[0]["image_shm"]
+    assert read_shared_memory(shm["shm_name"], shm["size"]) == b"shm-bytes"
+    
+    # 최대 핸들 수를 넘으면 가장 오래된 파일부터 삭제
+    store.write_file(b"third", "png")
+    assert not os.path.exists(handle["path"])
+    assert store.read(handle["path"]) is None
+    assert store.get_stats()["handles"] == 2
+    
+    store.close()
+    with pytest.raises(FileNotFoundError):
+        read_shared_memory(shm["shm_name"])
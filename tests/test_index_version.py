@@ -0,0 +1,34 @@
+import threading
+
+from mcp_desktop.screen_indexer import ScreenIndexer
+
+
+def test_get_version_does_not_wait_for_write_lock():
+    indexer = ScreenIndexer()
+    held = threading.Event()
+    release = threading.Event()
+    
+    def writer():
+        with indexer._write_lock:
+            held.set()
+            release.wait(5)
+    
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    assert held.wait(5)
+    versions = {}
+    reader = threading.Thread(target=lambda: versions.update(value=indexer.get_version(1)), daemon=True)
+    reader.start()
+    reader.join(1)
+    release.set()
+    thread.join(5)
+    assert versions.get("value") == "0.0"
+
+
+def test_mark_changed_bumps_window_and_all_versions():
+    indexer = ScreenIndexer()
+    indexer.mark_changed(1)
+    assert indexer.get_version(1) == "0.1"
+    assert indexer.get_version(2) == "0.0"
+    indexer.mark_changed(all_windows=True)
+    assert indexer.get_version(1) == "1.0"
@@ -0,0 +1,87 @@
+import importlib
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from mcp_desktop.utils import INPUT_DEVICE_LOCK, InputDeviceLock
+
+
+class _Pyautogui(types.SimpleNamespace):
+    """입력 호출이 겹치는지 기록하는 pyautogui 대역"""
+    
+    def __init__(self):
+        super().__init__(FAILSAFE=False, PAUSE=0.0)
+        self.events = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+    
+    def _input(self, name, *args):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.02)
+        self.events.append((name, *args))
+        with self._lock:
+            self.active -= 1
+    
+    def click(self, *args, **kwargs):
+        self._input("click", *args)
+    
+    def write(self, text, interval=0.0):
+        self._input("write", text)
+    
+    def position(self):
+        return (0, 0)
+
+
+@pytest.fixture
+def devices(monkeypatch):
+    fake = _Pyautogui()
+    monkeypatch.setitem(sys.modules, "pyautogui", fake)
+    mouse = importlib.import_module("mcp_desktop.mouse")
+    keyboard = importlib.import_module("mcp_desktop.keyboard")
+    monkeypatch.setattr(mouse, "pyautogui", fake)
+    monkeypatch.setattr(keyboard, "pyautogui", fake)
+    return fake, mouse.MouseController(), keyboard.KeyboardController()
+
+
+def test_lock_is_reentrant_and_counts_input_epochs():
+    lock = InputDeviceLock()
+    with lock:
+        with lock:
+            assert lock.epoch == 0
+        assert lock.epoch == 1
+    assert lock.epoch == 2
+
+
+def test_concurrent_input_is_serialised(devices):
+    fake, mouse, keyboard = devices
+    epoch = INPUT_DEVICE_LOCK.epoch
+    threads = [threading.Thread(target=keyboard.type, args=(f"text{i}",)) for i in range(4)]
+    threads += [threading.Thread(target=mouse.click, args=(i, i)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    
+    assert len(fake.events) == 8
+    assert fake.max_active == 1
+    assert INPUT_DEVICE_LOCK.epoch == epoch + 8
+
+
+def test_held_lock_keeps_click_and_type_together(devices):
+    fake, mouse, keyboard = devices
+    other = threading.Thread(target=keyboard.type, args=("other",))
+    with INPUT_DEVICE_LOCK:
+        assert mouse.click(10, 20)["success"]
+        other.start()
+        time.sleep(0.05)
+        assert keyboard.type("mine")["success"]
+    other.join(5)
+    
+    # 다른 스레드의 입력은 클릭과 입력 사이에 끼어들지 못함
+    assert fake.events == [("click", 10, 20), ("write", "mine"), ("write", "other")]
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from mcp_desktop.capture import SyntheticBackend
+from mcp_desktop.label_priors import MAX_MISSES, SCREEN_WINDOW_CLASS, LabelPriorStore
+from mcp_desktop.screenshot import ScreenshotController
+
+
+class _Scheduler:
+    """작은 영역 OCR 호출을 기록하고 정해 둔 텍스트를 돌려주는 가짜 스케줄러"""
+    
+    def __init__(self):
+        self.text = ""
+        self.calls = []
+    
+    def ocr_region(self, x, y, width, height, priority, window_id=None):
+        self.calls.append((x, y, width, height))
+        return {"success": True, "text": self.text}
+
+
+@pytest.fixture
+def store(tmp_path):
+    created = LabelPriorStore()
+    created._db_path = tmp_path / "priors.db"
+    created._init_table()
+    backend = SyntheticBackend(320, 240, color=(255, 255, 255))
+    backend.set_frame(np.random.default_rng(1).integers(0, 256, (240, 320, 3), dtype=np.uint8))
+    created.screenshot = ScreenshotController(frame_ttl=0, backend=backend)
+    created.scheduler = _Scheduler()
+    return created
+
+
+def _context(left: int = 0, top: int = 0) -> dict:
+    return {"window_class": "Editor", "size_bucket": "300x200", "left": left, "top": top}
+
+
+def _region(x: int = 40, y: int = 30) -> dict:
+    return {"text": "Save", "x": x, "y": y, "width": 30, "height": 12}
+
+
+def test_size_bucket_and_screen_context(store):
+    assert LabelPriorStore.size_bucket(1918, 1083) == "1900x1100"
+    assert store.get_context() == {"window_class": SCREEN_WINDOW_CLASS, "size_bucket": "300x250", "left": 0, "top": 0}
+
+
+def test_unchanged_pixels_verify_without_ocr(store):
+    store.record(_context(), "Save", _region())
+    verified = store.verify("Save", context=_context())
+    
+    assert verified["verified_by"] == "pixel_hash"
+    assert (verified["center_x"], verified["center_y"]) == (55, 36)
+    assert store.scheduler.calls == []
+    assert store.lookup(_context(), "Save")["hits"] == 1
+
+
+def test_prior_follows_moved_window_and_falls_back_to_region_ocr(store):
+    # 윈도우 기준 상대 위치로 저장하므로 윈도우가 옮겨지면 옮긴 위치를 확인
+    store.record(_context(left=10, top=5), "Save", _region(50, 35))
+    store.scheduler.text = "Save As"
+    verified = store.verify("Save", context=_context(left=100, top=50))
+    
+    assert verified["verified_by"] == "region_ocr"
+    assert verified["text"] == "Save As"
+    assert store.scheduler.calls == [(140, 80, 30, 12)]
+    # 영역 OCR로 확인한 위치의 픽셀 해시를 저장하므로 다음 확인은 OCR 없이 끝남
+    assert store.verify("Save", context=_context(left=100, top=50))["verified_by"] == "pixel_hash"
+    assert len(store.scheduler.calls) == 1
+
+
+def test_repeated_misses_drop_the_prior(store):
+    store.record(_context(), "Save", _region())
+    store.screenshot.backend.fill((40, 30, 30, 12), (0, 0, 0))
+    for _ in range(MAX_MISSES - 1):
+        assert store.verify("Save", context=_context()) is None
+    assert store.lookup(_context(), "Save")["misses"] == MAX_MISSES - 1
+    
+    assert store.verify("Save", context=_context()) is None
+    assert store.lookup(_context(), "Save") is None
+    assert len(store.scheduler.calls) == MAX_MISSES
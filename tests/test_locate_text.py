@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+
+from mcp_desktop.cancellation import CancellationToken
+from mcp_desktop.screen_indexer import TextRegion
+from mcp_desktop.smart_indexer import SmartIndexer
+from mcp_desktop.utils import SingleFlight
+
+
+class _Priors:
+    def get_context(self, window_id):
+        return None
+
+
+class _Indexer:
+    """타일 하나에서 바로 찾는 타겟 검색 스트림"""
+    
+    def get_last_known_position(self, search_text, exact_match, window_id):
+        return None
+    
+    async def stream_index(self, **kwargs):
+        region = TextRegion("Save", 10, 10, 40, 12, 30, 16, 90.0)
+        yield {"success": True, "tiles": [(0, 0, 200, 200)], "regions": [region], "done": 1, "total": 4}
+
+
+class _SmartIndexer(SmartIndexer):
+    def __init__(self):
+        self._flights = SingleFlight()
+        self.priors = _Priors()
+        self.indexer = _Indexer()
+    
+    def refresh_dirty_tiles(self, window_id=None):
+        return None
+    
+    def is_indexing_needed(self, window_id=None):
+        return True
+    
+    def capture_state(self, window_id=None):
+        return None
+
+
+def test_locate_text_does_not_wait_for_running_full_index():
+    smart = _SmartIndexer()
+    release = threading.Event()
+    key = smart._index_key(7, False, None)
+    leader = threading.Thread(target=smart._flights.do, args=(key, release.wait, 10), daemon=True)
+    leader.start()
+    while smart._flights.pending(key) is None:
+        time.sleep(0.01)
+    
+    started = time.monotonic()
+    result = asyncio.run(smart.locate_text("Save", window_id=7, token=CancellationToken(deadline_seconds=1)))
+    assert time.monotonic() - started < 1
+    assert result["source"] == "targeted_search"
+    assert result["regions"][0]["text"] == "Save"
+    
+    release.set()
+    leader.join(5)
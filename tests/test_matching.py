@@ -0,0 +1,65 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from mcp_desktop.matching import Template, TemplateCache, match_template
+
+
+def _icon(seed: int = 1) -> np.ndarray:
+    """무늬가 뚜렷한 32x24 아이콘 (블록 단위라 축소해도 특징이 남음)"""
+    blocks = np.random.default_rng(seed).integers(0, 256, (8, 6), dtype=np.uint8)
+    return np.kron(blocks, np.ones((4, 4), dtype=np.uint8))
+
+
+def _screen(height: int, width: int) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    return rng.integers(90, 110, (height, width)).astype(np.uint8)
+
+
+@pytest.mark.parametrize("size", [(120, 160), (600, 900)])
+def test_match_template_finds_planted_icons(size):
+    gray = _screen(*size)
+    icon = _icon()
+    spots = [(13, 21), (size[1] - 50, size[0] - 40)]
+    for x, y in spots:
+        gray[y:y + icon.shape[0], x:x + icon.shape[1]] = icon
+    
+    matches = match_template(gray, Template(icon), threshold=0.9)
+    
+    assert sorted((m["x"], m["y"]) for m in matches) == sorted(spots)
+    assert all(m["score"] > 0.99 for m in matches)
+    assert matches[0]["width"] == 24 and matches[0]["height"] == 32
+    assert matches[0]["center_x"] == matches[0]["x"] + 12
+
+
+def test_match_template_ignores_other_icons_and_respects_limits():
+    gray = _screen(600, 900)
+    gray[100:132, 200:224] = _icon(2)
+    assert match_template(gray, Template(_icon(1)), threshold=0.8) == []
+    
+    for x in (50, 300, 550):
+        gray[400:432, x:x + 24] = _icon(1)
+    assert len(match_template(gray, Template(_icon(1)), threshold=0.8, max_results=2)) == 2
+    assert match_template(gray[:20, :20], Template(_icon(1))) == []
+
+
+def test_flat_template_is_rejected():
+    with pytest.raises(ValueError):
+        Template(np.full((16, 16), 128, dtype=np.uint8))
+
+
+def test_template_cache_reuses_decoded_templates():
+    buffer = BytesIO()
+    Image.fromarray(_icon()).convert("RGB").save(buffer, format="PNG")
+    cache = TemplateCache(max_templates=1)
+    
+    first = cache.get(buffer.getvalue())
+    assert cache.get(buffer.getvalue()) is first
+    assert (first.height, first.width) == (32, 24)
+    
+    other = BytesIO()
+    Image.fromarray(_icon(3)).save(other, format="PNG")
+    cache.get(other.getvalue())
+    assert cache.get_stats() == {"templates": 1, "hits": 1, "misses": 2}
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+from mcp_desktop.memo import QueryMemo
+
+
+class _Spec:
+    name = "screen_find_text"
+    input_schema = {"properties": {"exact_match": {"type": "boolean", "default": False}}}
+
+
+def test_tool_entry_counts_follow_store_evict_and_clear():
+    memo = QueryMemo(max_entries=2)
+    memo.store("a", "1", "v1", {"success": True})
+    memo.store("a", "1", "v1", {"success": True})
+    memo.store("b", "1", "v1", {"success": True})
+    assert memo._has_entries("a") and memo._has_entries("b")
+    
+    # 가장 오래된 a 항목이 밀려남
+    memo.store("b", "2", "v1", {"success": True})
+    assert not memo._has_entries("a")
+    
+    # 세대가 바뀐 항목은 조회할 때 제거됨
+    assert memo.lookup("b", "1", "v2") is None
+    assert memo._has_entries("b")
+    assert memo.lookup("b", "2", "v2") is None
+    assert not memo._has_entries("b")
+    
+    memo.store("c", "1", "v1", {"success": True})
+    memo.clear()
+    assert not memo._has_entries("c")
+
+
+def test_middleware_memoizes_by_version_and_loads_version_off_the_loop():
+    memo = QueryMemo()
+    threads = []
+    calls = []
+    
+    def version_of(arguments):
+        threads.append(threading.current_thread())
+        return "v1"
+    
+    middleware = memo.middleware(version_of)
+    
+    async def handler():
+        calls.append(1)
+        return {"success": True, "regions": []}
+    
+    async def run():
+        first = await middleware(_Spec(), {"search_text": "Save"}, handler)
+        second = await middleware(_Spec(), {"search_text": "Save", "exact_match": False}, handler)
+        return first, second
+    
+    first, second = asyncio.run(run())
+    assert "memoized" not in first
+    assert second["memoized"] is True
+    assert len(calls) == 1
+    # 첫 세대 조회(인덱서 생성 가능)는 워커 스레드, 이후 조회는 이벤트 루프 스레드
+    assert threads[0] is not threading.main_thread()
+    assert threads[-1] is threading.main_thread()
@@ -0,0 +1,100 @@
+import os
+import threading
+
+from mcp_desktop.ocr_scheduler import (
+    COMPACT_MIN_STALE,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    OCRScheduler,
+)
+
+
+class _BlockingOCR:
+    """(0, 0) 타일은 release될 때까지 막히고 나머지 타일은 바로 끝나는 가짜 OCR"""
+    
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.calls = []
+    
+    def extract_text_from_screenshot(self, x, y, width, height, lang):
+        self.calls.append((x, y))
+        if (x, y) == (0, 0):
+            self.started.set()
+            self.release.wait(5)
+        return {"success": True, "text": f"{x},{y}"}
+
+
+def _scheduler(workers: int) -> OCRScheduler:
+    scheduler = OCRScheduler(workers=workers)
+    scheduler.ocr = _BlockingOCR()
+    return scheduler
+
+
+def test_default_workers_follow_cpu_count(monkeypatch):
+    monkeypatch.delenv("MCP_DESKTOP_OCR_WORKERS", raising=False)
+    monkeypatch.setattr("os.cpu_count", lambda: 6)
+    assert OCRScheduler().workers == 6
+    monkeypatch.setattr("os.cpu_count", lambda: 1)
+    assert OCRScheduler().workers == 2
+    monkeypatch.setenv("MCP_DESKTOP_OCR_WORKERS", "3")
+    assert OCRScheduler().workers == 3
+
+
+def test_interactive_job_does_not_wait_behind_running_tile():
+    scheduler = _scheduler(workers=2)
+    background = scheduler.submit(0, 0, 10, 10, PRIORITY_BACKGROUND)
+    assert scheduler.ocr.started.wait(5)
+    try:
+        result = scheduler.submit(10, 0, 10, 10, PRIORITY_INTERACTIVE).result(timeout=5)
+        assert result["text"] == "10,0"
+    finally:
+        scheduler.ocr.release.set()
+    assert background.result(timeout=5)["text"] == "0,0"
+
+
+def test_cancelled_jobs_are_skipped_and_compacted():
+    scheduler = _scheduler(workers=1)
+    blocker = scheduler.submit(0, 0, 10, 10)
+    assert scheduler.ocr.started.wait(5)
+    
+    futures = [scheduler.submit(10 + i, 0, 10, 10, PRIORITY_BACKGROUND) for i in range(COMPACT_MIN_STALE * 2)]
+    for future in futures[:-1]:
+        assert scheduler.cancel(future)
+    assert not scheduler.cancel(futures[0])
+    # 무효 항목이 쌓이면 큐를 다시 만들어 유효 항목만 남김
+    assert len(scheduler._heap) < COMPACT_MIN_STALE * 2
+    
+    scheduler.ocr.release.set()
+    blocker.result(timeout=5)
+    assert futures[-1].result(timeout=5)["text"] == f"{10 + COMPACT_MIN_STALE * 2 - 1},0"
+    assert all(future.cancelled() for future in futures[:-1])
+    assert scheduler.ocr.calls == [(0, 0), (10 + COMPACT_MIN_STALE * 2 - 1, 0)]
+    assert scheduler.get_stats()["cancelled"] == COMPACT_MIN_STALE * 2 - 1
+
+
+def test_shared_job_is_cancelled_only_when_all_waiters_cancel():
+    scheduler = _scheduler(workers=1)
+    blocker = scheduler.submit(0, 0, 10, 10)
+    assert scheduler.ocr.started.wait(5)
+    
+    first = scheduler.submit(10, 0, 10, 10, PRIORITY_BACKGROUND)
+    second = scheduler.submit(10, 0, 10, 10, PRIORITY_INTERACTIVE)
+    assert first is second
+    assert not scheduler.cancel(first)
+    
+    scheduler.ocr.release.set()
+    blocker.result(timeout=5)
+    assert second.result(timeout=5)["text"] == "10,0"
+
+
+def test_thread_limit_only_reaches_tesseract_env(monkeypatch):
+    from mcp_desktop import ocr
+    
+    monkeypatch.delenv("OMP_THREAD_LIMIT", raising=False)
+    monkeypatch.setattr(ocr, "_tesseract_env", {})
+    OCRScheduler(workers=4)
+    assert "OMP_THREAD_LIMIT" not in os.environ
+    assert ocr.tesseract_env()["OMP_THREAD_LIMIT"] == "1"
+    monkeypatch.setenv("OMP_THREAD_LIMIT", "3")
+    assert ocr.tesseract_env()["OMP_THREAD_LIMIT"] == "3"
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import threading
+
+from mcp_desktop.progress import MAX_REGIONS_PER_NOTIFICATION, ProgressReporter
+from mcp_desktop.screen_indexer import TextRegion
+
+
+class _Session:
+    def __init__(self):
+        self.sent = []
+    
+    async def send_progress_notification(self, token, progress, total=None, message=None, related_request_id=None):
+        self.sent.append((token, progress, total, message, related_request_id))
+
+
+def _region(index: int) -> TextRegion:
+    return TextRegion(f"label{index}", index, 0, 10, 10, index + 5, 5, 90.0)
+
+
+def _report(events, **kwargs) -> list:
+    """워커 스레드에서 진행 이벤트를 보내고 이벤트 루프에서 전송된 알림을 모음"""
+    session = _Session()
+    
+    async def run():
+        reporter = ProgressReporter(session, "token", asyncio.get_running_loop(), request_id=7, **kwargs)
+        worker = threading.Thread(target=lambda: [reporter(event) for event in events])
+        worker.start()
+        await asyncio.to_thread(worker.join)
+        await asyncio.sleep(0.05)
+    
+    asyncio.run(run())
+    return session.sent
+
+
+def test_notifications_are_throttled_but_last_tile_is_always_sent():
+    events = [{"done": done, "total": 4, "regions": [_region(done)]} for done in range(1, 5)]
+    sent = _report(events, min_interval=60)
+    
+    assert [(progress, total) for _, progress, total, _, _ in sent] == [(1, 4), (4, 4)]
+    assert sent[-1][0] == "token" and sent[-1][4] == 7
+    assert sent[-1][3] == "4/4개 타일, 텍스트 영역 4개"
+
+
+def test_stream_regions_sends_new_regions_in_batches():
+    count = MAX_REGIONS_PER_NOTIFICATION + 3
+    events = [
+        {"done": 1, "total": 2, "regions": [_region(i) for i in range(count)]},
+        {"done": 2, "total": 2, "regions": []},
+    ]
+    sent = _report(events, stream_regions=True, min_interval=0)
+    
+    first, second = (json.loads(message) for _, _, _, message, _ in sent)
+    assert len(first["regions"]) == MAX_REGIONS_PER_NOTIFICATION
+    assert first["regions"][0] == {"text": "label0", "center_x": 5, "center_y": 5}
+    assert [region["text"] for region in second["regions"]] == [f"label{i}" for i in range(20, count)]
+    assert second["summary"] == f"2/2개 타일, 텍스트 영역 {count}개"
+
+
+def test_from_request_context_without_progress_token():
+    class _Server:
+        @property
+        def request_context(self):
+            raise LookupError
+    
+    assert ProgressReporter.from_request_context(_Server()) is None
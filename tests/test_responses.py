@@ -0,0 +1,62 @@
+import json
+
+from mcp_desktop.responses import ResponseShaper, response_options
+
+
+def _shape(shaper: ResponseShaper, result, **options) -> dict:
+    return json.loads(shaper.shape(result, **options))
+
+
+def test_lists_keep_their_shape_by_default():
+    result = {"success": True, "windows": [{"title": "a", "id": 1}, {"title": "b", "id": 2}]}
+    assert _shape(ResponseShaper(), result, **response_options({})) == result
+
+
+def test_columnar_is_opt_in():
+    result = {"regions": [{"text": "a", "x": 1}, {"text": "b", "x": 2}]}
+    shaped = _shape(ResponseShaper(), result, columnar=True)
+    assert shaped["regions"] == {"columns": ["text", "x"], "rows": [["a", 1], ["b", 2]]}
+
+
+def test_projection_keeps_selected_fields():
+    result = {"regions": [{"text": "a", "x": 1, "y": 2}]}
+    assert _shape(ResponseShaper(), result, fields=["text"]) == {"regions": [{"text": "a"}]}
+
+
+def test_truncation_pages_through_every_row():
+    shaper = ResponseShaper(max_bytes=400)
+    rows = [{"text": f"row {index}", "x": index} for index in range(40)]
+    shaped = _shape(shaper, {"success": True, "regions": rows})
+    assert shaped["truncated"] and shaped["returned"] < len(rows)
+    
+    # 커서를 따라가면 모든 행을 순서대로 한 번씩 받음
+    seen = list(shaped["regions"])
+    while shaped.get("next_cursor"):
+        shaped = _shape(shaper, shaper.resume(shaped["next_cursor"]))
+        seen.extend(shaped["regions"])
+    assert seen == rows
+
+
+def test_oversized_row_still_makes_progress():
+    shaper = ResponseShaper(max_bytes=1000)
+    big = {"text": "x" * 20000}
+    
+    single = _shape(shaper, {"regions": [big]})
+    assert single["regions"] == [big]
+    assert "next_cursor" not in single
+    
+    shaped = _shape(shaper, {"regions": [big, big, {"text": "y"}]})
+    assert shaped["returned"] == 1 and shaped["remaining"] == 2
+    rest = _shape(shaper, shaper.resume(shaped["next_cursor"]))
+    assert rest["returned"] == 1 and rest["remaining"] == 1
+    last = _shape(shaper, shaper.resume(rest["next_cursor"]))
+    assert last["regions"] == [{"text": "y"}]
+
+
+def test_stats_do_not_reserialize_responses():
+    shaper = ResponseShaper()
+    text = shaper.shape({"regions": [{"text": "a"}]})
+    stats = shaper.get_stats()
+    assert stats["responses"] == 1
+    assert stats["bytes_out"] == len(text.encode("utf-8"))
+    assert "bytes_pretty" not in stats
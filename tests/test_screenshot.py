@@ -0,0 +1,148 @@
+import time
+
+import numpy as np
+import pytest
+
+from mcp_desktop.capture import SyntheticBackend
+from mcp_desktop.screenshot import FRAME_BUFFERS, ScreenshotController
+from mcp_desktop.utils import INPUT_DEVICE_LOCK
+
+
+def _controller(frame_ttl: float = 60.0) -> ScreenshotController:
+    backend = SyntheticBackend(64, 48, color=(0, 0, 0))
+    return ScreenshotController(frame_ttl=frame_ttl, backend=backend)
+
+
+def test_cached_frame_serves_full_and_region_requests():
+    controller = _controller()
+    controller.backend.fill((10, 10, 4, 4), (255, 0, 0))
+    full = controller.grab_array()
+    region = controller.grab_array((10, 10, 4, 4))
+    
+    assert controller.backend.grabs == 1
+    assert (region == (255, 0, 0)).all()
+    np.testing.assert_array_equal(region, full[10:14, 10:14])
+    assert controller.get_capture_stats()["frame_cache"]["hits"] == 1
+
+
+def test_region_without_cached_frame_captures_only_the_region():
+    controller = _controller()
+    pixels = controller.grab_array((60, 40, 10, 10))
+    
+    # 화면 밖 부분은 제외하고 영역만 캡처하며 전체 화면 프레임은 만들지 않음
+    assert pixels.shape == (8, 4, 3)
+    assert controller.get_capture_stats()["buffer_allocations"] == 0
+    controller.grab_array((0, 0, 4, 4))
+    assert controller.backend.grabs == 2
+
+
+def test_input_invalidates_cached_frame():
+    controller = _controller()
+    controller.grab_array()
+    with INPUT_DEVICE_LOCK:
+        controller.backend.fill((0, 0, 4, 4), (0, 255, 0))
+    
+    assert (controller.grab_array((0, 0, 4, 4)) == (0, 255, 0)).all()
+    assert controller.backend.grabs == 2
+
+
+def test_returned_views_survive_later_captures():
+    controller = _controller(frame_ttl=0)
+    first = controller.grab_array()
+    first_gray = controller.grab_array(gray=True, fresh=True)
+    for value in range(1, FRAME_BUFFERS * 2 + 1):
+        controller.backend.fill((0, 0, 64, 48), (value, value, value))
+        controller.grab_array(fresh=True)
+    
+    assert (first == 0).all()
+    assert (first_gray == 0).all()
+    with pytest.raises(ValueError):
+        first[0, 0] = 1
+
+
+def test_released_buffers_are_reused():
+    controller = _controller(frame_ttl=0)
+    for _ in range(FRAME_BUFFERS * 3):
+        controller.grab_array(gray=True, fresh=True)
+    assert controller.get_capture_stats()["buffer_allocations"] == FRAME_BUFFERS
+
+
+def test_slices_of_returned_views_keep_the_buffer_pinned():
+    controller = _controller(frame_ttl=0)
+    row = controller.grab_array(fresh=True)[5][10:20]
+    gray_row = controller.grab_array(gray=True, fresh=True)[5].reshape(-1)
+    for value in range(1, FRAME_BUFFERS * 2 + 1):
+        controller.backend.fill((0, 0, 64, 48), (value, value, value))
+        controller.grab_array(fresh=True)
+    
+    assert (row == 0).all()
+    assert (gray_row == 0).all()
+    del row, gray_row
+    allocations = controller.get_capture_stats()["buffer_allocations"]
+    for _ in range(FRAME_BUFFERS * 2):
+        controller.grab_array(fresh=True)
+    assert controller.get_capture_stats()["buffer_allocations"] == allocations
+
+
+def test_cached_frame_expires_after_ttl():
+    controller = _controller(frame_ttl=0.05)
+    controller.grab_array()
+    captured_at = controller.frame_time()
+    controller.backend.fill((0, 0, 4, 4), (0, 0, 255))
+    
+    # 유효 시간 안에는 바뀐 화면 대신 캐시 프레임을 돌려줌
+    assert (controller.grab_array((0, 0, 4, 4)) == 0).all()
+    assert controller.frame_time() == captured_at
+    time.sleep(0.1)
+    assert controller.frame_time() > captured_at
+    assert (controller.grab_array((0, 0, 4, 4)) == (0, 0, 255)).all()
+    stats = controller.get_capture_stats()["frame_cache"]
+    assert (stats["hits"], stats["ttl"]) == (1, 0.05)
+
+
+def test_fresh_and_invalidate_bypass_the_cache():
+    controller = _controller()
+    controller.grab_array()
+    controller.backend.fill((0, 0, 4, 4), (9, 9, 9))
+    assert (controller.grab_array((0, 0, 4, 4), fresh=True) == 9).all()
+    
+    controller.backend.fill((0, 0, 4, 4), (7, 7, 7))
+    controller.invalidate_frame()
+    assert (controller.grab_array((0, 0, 4, 4)) == 7).all()
+    assert controller.backend.grabs == 3
+
+
+def test_zero_ttl_disables_the_cache(monkeypatch):
+    monkeypatch.setenv("MCP_DESKTOP_FRAME_TTL", "0")
+    controller = ScreenshotController(backend=SyntheticBackend(16, 16))
+    assert controller.frame_ttl == 0
+    controller.grab_array()
+    controller.grab_array()
+    assert controller.backend.grabs == 2
+
+
+def test_pixel_colors_are_sampled_from_one_capture():
+    controller = _controller()
+    controller.backend.fill((10, 5, 1, 1), (255, 128, 1))
+    result = controller.get_pixel_colors([[10, 5], [0, 0], [64, 0], [-1, 3]])
+    
+    assert result == {"success": True, "count": 4, "colors": ["#ff8001", "#000000", None, None]}
+    assert controller.get_pixel_color(10, 5)["rgb"] == (255, 128, 1)
+    assert not controller.get_pixel_color(64, 0)["success"]
+    assert controller.backend.grabs == 1
+
+
+def test_sample_grid_matches_per_pixel_reads():
+    controller = _controller()
+    rng = np.random.default_rng(5)
+    controller.backend.set_frame(rng.integers(0, 256, (48, 64, 3), dtype=np.uint8))
+    result = controller.sample_grid(50, 30, 20, 25, step=7)
+    
+    assert result["xs"] == [50, 57, 64] and result["ys"] == [30, 37, 44, 51]
+    expected = [
+        [controller.get_pixel_color(x, y).get("hex") for x in result["xs"]]
+        for y in result["ys"]
+    ]
+    assert result["colors"] == expected
+    assert controller.backend.grabs == 1
+    assert not controller.sample_grid(0, 0, 10000, 10000, step=1)["success"]
@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from mcp_desktop.cancellation import CancellationToken, OperationCancelled
+from mcp_desktop.smart_indexer import SmartIndexer
+from mcp_desktop.utils import SingleFlight
+
+
+def _start_leader(flights: SingleFlight, key, fn, *args):
+    """fn을 실행하는 선행 호출을 다른 스레드에서 시작하고 진행 중이 될 때까지 기다림"""
+    thread = threading.Thread(target=flights.do, args=(key, fn, *args), daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while flights.pending(key) is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    return thread
+
+
+def test_follower_shares_leader_result():
+    flights = SingleFlight()
+    release = threading.Event()
+    thread = _start_leader(flights, "key", lambda: release.wait(5) and "done")
+    
+    follower = {}
+    waiter = threading.Thread(target=lambda: follower.update(result=flights.do("key", lambda: "other")))
+    waiter.start()
+    release.set()
+    waiter.join(5)
+    thread.join(5)
+    assert follower["result"] == ("done", True)
+
+
+def test_follower_stops_waiting_at_its_deadline():
+    flights = SingleFlight()
+    release = threading.Event()
+    thread = _start_leader(flights, "key", release.wait, 5)
+    
+    started = time.monotonic()
+    with pytest.raises(OperationCancelled) as raised:
+        flights.do("key", lambda: None, token=CancellationToken(deadline_seconds=0.2))
+    assert raised.value.reason == "deadline"
+    assert time.monotonic() - started < 2
+    
+    release.set()
+    thread.join(5)
+
+
+class _Indexer(SmartIndexer):
+    """_ensure_indexed만 바꾼 SmartIndexer (DB/화면 없이 호출 합치기만 확인)"""
+    
+    def __init__(self, results):
+        self._flights = SingleFlight()
+        self.results = list(results)
+        self.calls = []
+        self.release = threading.Event()
+    
+    def _ensure_indexed(self, window_id, force, grid_size, token=None, progress=None):
+        self.calls.append((force, grid_size))
+        self.release.wait(5)
+        return self.results.pop(0)
+
+
+def test_ensure_indexed_follower_returns_cancelled_dict_on_deadline():
+    indexer = _Indexer([{"success": True, "indexed": True}])
+    thread = _start_leader(indexer._flights, indexer._index_key(1, False, None), indexer._ensure_indexed, 1, False, None)
+    
+    result = indexer.ensure_indexed(1, token=CancellationToken(deadline_seconds=0.2))
+    assert result["success"] is False and result["cancelled"] is True
+    
+    indexer.release.set()
+    thread.join(5)
+
+
+def test_ensure_indexed_does_not_share_across_force_or_grid_size():
+    indexer = _Indexer([{"success": True, "indexed": False}, {"success": True, "indexed": True}])
+    thread = _start_leader(indexer._flights, indexer._index_key(1, False, None), indexer._ensure_indexed, 1, False, None)
+    
+    forced = {}
+    waiter = threading.Thread(target=lambda: forced.update(result=indexer.ensure_indexed(1, force=True)))
+    waiter.start()
+    # 강제 호출은 진행 중인 일반 호출을 기다리지 않고 따로 실행됨
+    deadline = time.monotonic() + 5
+    while len(indexer.calls) < 2:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    indexer.release.set()
+    waiter.join(5)
+    thread.join(5)
+    assert "coalesced" not in forced["result"]
+    assert sorted(indexer.calls) == [(False, None), (True, None)]
+    assert indexer._index_key(1, False, 100) != indexer._index_key(1, False, None)
+
+
+def test_ensure_indexed_reruns_when_shared_result_is_partial():
+    indexer = _Indexer([{"success": True, "indexed": True, "partial": True}, {"success": True, "indexed": True}])
+    thread = _start_leader(indexer._flights, indexer._index_key(1, False, None), indexer._ensure_indexed, 1, False, None)
+    
+    follower = {}
+    waiter = threading.Thread(target=lambda: follower.update(result=indexer.ensure_indexed(1)))
+    waiter.start()
+    time.sleep(0.05)
+    indexer.release.set()
+    waiter.join(5)
+    thread.join(5)
+    assert follower["result"] == {"success": True, "indexed": True}
+    assert len(indexer.calls) == 2
@@ -0,0 +1,32 @@
+import time
+
+from mcp_desktop.startup import StartupTimer, loaded_heavy_modules, measure_import_times
+
+
+def test_phases_and_marks_keep_the_first_measurement():
+    timer = StartupTimer()
+    with timer.phase("server_init"):
+        time.sleep(0.01)
+    timer.record("server_init", 99.0)
+    timer.mark("ready")
+    first_mark = timer.report()["marks_ms"]["ready"]
+    time.sleep(0.01)
+    timer.mark("ready")
+    
+    report = timer.report()
+    assert 10 <= report["phases_ms"]["server_init"] < 99000
+    assert report["marks_ms"]["ready"] == first_mark
+    assert timer.elapsed() * 1000 > first_mark
+    assert report["heavy_modules_loaded"] == loaded_heavy_modules()
+
+
+def test_light_modules_import_without_heavy_dependencies():
+    report = measure_import_times({"startup": "startup", "progress": "progress", "missing": "no_such_module"})
+    subsystems = report["subsystems"]
+    
+    for name in ("startup", "progress"):
+        assert subsystems[name]["success"]
+        assert subsystems[name]["cumulative_ms"] > 0
+        assert subsystems[name]["heavy_modules"] == []
+    assert not subsystems["missing"]["success"]
+    assert "ModuleNotFoundError" in subsystems["missing"]["error"]
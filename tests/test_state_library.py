@@ -0,0 +1,78 @@
+from PIL import Image, ImageDraw
+
+from mcp_desktop.state_library import (
+    DEFAULT_TOLERANCE,
+    ScreenStateLibrary,
+    compute_detail,
+    compute_fingerprint,
+    hamming_distance,
+)
+from mcp_desktop.smart_indexer import SmartIndexer
+
+AREA = {"left": 0, "top": 0, "width": 1920, "height": 1080}
+REGION = {"text": "Status: ready", "x": 100, "y": 500, "width": 90, "height": 12,
+          "center_x": 145, "center_y": 506, "confidence": 90.0}
+
+
+def _screen(line: str) -> Image.Image:
+    image = Image.new("RGB", (1920, 1080), (255, 255, 255))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, 1919, 40), fill=(40, 60, 120))
+    draw.text((100, 300), "Customer record", fill=(0, 0, 0))
+    draw.text((100, 500), line, fill=(0, 0, 0))
+    return image
+
+
+def _state(image: Image.Image) -> dict:
+    return {
+        "window_class": "Editor",
+        "fingerprint": compute_fingerprint(image),
+        "detail": compute_detail(image),
+        "area": AREA,
+        "captured_at": 0.0,
+    }
+
+
+class _Indexer:
+    def __init__(self):
+        self.stored = []
+    
+    def store_regions(self, window_id, regions, area, grid_size, captured_at):
+        self.stored.append(regions)
+        return "now"
+
+
+class _SmartIndexer(SmartIndexer):
+    def __init__(self):
+        self.library = ScreenStateLibrary()
+        self.indexer = _Indexer()
+    
+    def _update_metadata(self, window_id, updates):
+        pass
+
+
+def _remember(smart: _SmartIndexer, state: dict):
+    smart.library.store(state["window_class"], state["fingerprint"], 1920, 1080, [REGION], detail=state["detail"])
+
+
+def test_same_screen_restores_without_ocr():
+    smart = _SmartIndexer()
+    _remember(smart, _state(_screen("Status: ready")))
+    
+    restored = smart.restore_from_library(None, _state(_screen("Status: ready")))
+    assert restored is not None and restored["text_regions"] == 1
+    assert smart.indexer.stored[0][0].text == "Status: ready"
+
+
+def test_text_only_change_does_not_restore():
+    smart = _SmartIndexer()
+    before = _state(_screen("Status: ready"))
+    after = _state(_screen("Error: disk full, retry in 30 seconds"))
+    _remember(smart, before)
+    
+    # 지각 해시만으로는 같은 화면으로 보임
+    assert hamming_distance(before["fingerprint"], after["fingerprint"]) <= DEFAULT_TOLERANCE
+    assert smart.restore_from_library(None, after) is None
+    assert smart.indexer.stored == []
+    assert smart.library.get_stats()["rejected"] == 1
+
@@ -0,0 +1,114 @@
+import asyncio
+from concurrent.futures import Future
+
+import pytest
+
+from mcp_desktop import screen_indexer
+from mcp_desktop.screen_indexer import ScreenIndexer
+from mcp_desktop.smart_indexer import SmartIndexer
+from mcp_desktop.utils import SingleFlight
+
+
+class _Scheduler:
+    """타일 좌표별로 정해 둔 텍스트를 바로 돌려주는 가짜 OCR 스케줄러"""
+    
+    def __init__(self, texts):
+        self.texts = texts
+        self.submitted = []
+    
+    def submit(self, x, y, width, height, priority, window_id=None):
+        self.submitted.append((x, y))
+        future = Future()
+        future.set_result({"success": True, "text": self.texts.get((x, y), "")})
+        return future
+    
+    def cancel(self, future):
+        return False
+
+
+@pytest.fixture
+def indexer(monkeypatch):
+    monkeypatch.setattr(screen_indexer, "TESSERACT_AVAILABLE", True)
+    created = ScreenIndexer(grid_size=100)
+    created.scheduler = _Scheduler({(200, 100): "Save", (300, 200): "Cancel"})
+    created.get_index_area = lambda window_id=None: {"success": True, "left": 0, "top": 0, "width": 400, "height": 300}
+    return created
+
+
+class _Priors:
+    def get_context(self, window_id):
+        return None
+
+
+class _SmartIndexer(SmartIndexer):
+    def __init__(self, indexer):
+        self._flights = SingleFlight()
+        self.priors = _Priors()
+        self.indexer = indexer
+        self.committed = []
+    
+    def refresh_dirty_tiles(self, window_id=None):
+        return None
+    
+    def is_indexing_needed(self, window_id=None):
+        return True
+    
+    def capture_state(self, window_id=None):
+        return None
+    
+    def commit_scan(self, window_id, regions, scan, state=None):
+        self.committed.append([region.text for region in regions])
+
+
+def test_plan_tiles_orders_by_distance_to_prior(indexer):
+    area = indexer.get_index_area()
+    assert indexer.plan_tiles(area)[:2] == [(0, 0, 100, 100), (100, 0, 100, 100)]
+    assert len(indexer.plan_tiles(area)) == 12
+    assert indexer.plan_tiles(area, prior=(350, 250))[0] == (300, 200, 100, 100)
+    assert indexer.plan_tiles(area, grid_size=150)[-1] == (300, 150, 100, 150)
+
+
+def test_stream_index_stops_ocr_when_consumer_stops(indexer):
+    async def first_match():
+        async for batch in indexer.stream_index(batch_size=2):
+            for region in batch["regions"]:
+                if region.text == "Save":
+                    return batch
+    
+    batch = asyncio.run(first_match())
+    assert (batch["done"], batch["total"]) == (8, 12)
+    assert len(indexer.scheduler.submitted) == 8
+
+
+def test_stream_index_reports_progress_per_tile(indexer):
+    events = []
+    
+    async def consume():
+        return [batch async for batch in indexer.stream_index(progress=events.append)]
+    
+    batches = asyncio.run(consume())
+    assert len(batches) == 12 and all(batch["success"] for batch in batches)
+    assert [event["done"] for event in events] == list(range(1, 13))
+    assert sum(len(event["regions"]) for event in events) == 2
+
+
+def test_locate_text_returns_on_the_first_matching_tile(indexer):
+    smart = _SmartIndexer(indexer)
+    indexer.get_last_known_position = lambda search_text, exact_match, window_id: (250, 150)
+    result = asyncio.run(smart.locate_text("save"))
+    
+    # 마지막 위치에 가장 가까운 타일부터 OCR하므로 첫 타일에서 찾고 끝남
+    assert result["source"] == "targeted_search"
+    assert result["regions"][0]["text"] == "Save"
+    assert (result["regions"][0]["center_x"], result["regions"][0]["center_y"]) == (250, 150)
+    assert result["tiles_scanned"] == 1 and indexer.scheduler.submitted == [(200, 100)]
+    assert smart.committed == []
+
+
+def test_locate_text_without_match_commits_the_full_scan(indexer):
+    smart = _SmartIndexer(indexer)
+    indexer.get_last_known_position = lambda search_text, exact_match, window_id: None
+    result = asyncio.run(smart.locate_text("Open", exact_match=True))
+    
+    assert result["count"] == 0 and result["tiles_scanned"] == 12
+    assert smart.committed == [["Save", "Cancel"]]
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+
+import pytest
+
+from mcp_desktop.startup import get_startup_timer
+
+# 레지스트리는 mcp.types.Tool로 도구 목록을 만들므로 mcp 패키지가 있어야 함
+pytest.importorskip("mcp.types")
+
+from mcp_desktop.tool_registry import ToolRegistry, ToolSpec, lazy_factory, validate_required
+
+
+def _registry() -> ToolRegistry:
+    registry = ToolRegistry()
+    registry.use(validate_required)
+    registry.register_dependency("threads", lambda: threading.get_ident())
+    return registry
+
+
+def test_sync_handlers_run_off_the_event_loop():
+    registry = _registry()
+    registry.register(ToolSpec("sync", lambda arguments, threads: {"success": True, "thread": threads}, ("threads",)))
+    
+    async def handler(arguments, threads, token=None):
+        return {"success": True, "thread": threads, "token": token}
+    
+    registry.register(ToolSpec("async", handler, ("threads",)))
+    
+    async def run():
+        loop_thread = threading.get_ident()
+        sync_result = await registry.call("sync", {})
+        async_result = await registry.call("async", {}, token="t")
+        return loop_thread, sync_result, async_result
+    
+    loop_thread, sync_result, async_result = asyncio.run(run())
+    # 블로킹 핸들러는 의존성 생성까지 워커 스레드에서, 코루틴 핸들러는 이벤트 루프에서 실행
+    assert sync_result["thread"] != loop_thread
+    assert async_result == {"success": True, "thread": loop_thread, "token": "t"}
+
+
+def test_middleware_order_and_required_arguments():
+    registry = _registry()
+    order = []
+    
+    def tracing(label):
+        async def middleware(spec, arguments, call_next):
+            order.append(label)
+            return await call_next()
+        return middleware
+    
+    registry.use(tracing("global"))
+    schema = {"type": "object", "properties": {"x": {"type": "integer"}}, "required": ["x"]}
+    registry.register(ToolSpec(
+        "tool",
+        lambda arguments: order.append("handler") or {"success": True},
+        input_schema=schema,
+        middleware=(tracing("tool"),),
+    ))
+    
+    missing = asyncio.run(registry.call("tool", {}))
+    assert not missing["success"] and "x" in missing["error"]
+    assert order == []
+    assert asyncio.run(registry.call("tool", {"x": 1})) == {"success": True}
+    assert order == ["global", "tool", "handler"]
+    assert asyncio.run(registry.call("unknown", {})) is None
+    assert registry.get_stats()["tool"]["calls"] == 2
+    assert registry.get_stats()["tool"]["errors"] == 1
+
+
+def test_tool_list_is_cached_until_registration():
+    registry = _registry()
+    registry.register(ToolSpec("listed", lambda arguments: {}, description="listed tool"))
+    registry.register(ToolSpec("internal", lambda arguments: {}))
+    
+    tools = registry.list_tools()
+    assert [tool.name for tool in tools] == ["listed"]
+    assert registry.list_tools() is tools
+    registry.register(ToolSpec("another", lambda arguments: {}, description="another tool"))
+    assert [tool.name for tool in registry.list_tools()] == ["listed", "another"]
+
+
+def test_lazy_factory_resolves_getter_once():
+    factory = lazy_factory(".startup", "get_startup_timer")
+    assert not hasattr(factory, "_getter")
+    
+    assert factory() is get_startup_timer()
+    assert factory._getter is get_startup_timer
+    assert factory() is get_startup_timer()
+    assert "import:startup" in get_startup_timer().report()["phases_ms"]